@@ -0,0 +1,218 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module that provides the Clock class.
+
+A Clock is a bool signal that the simulator toggles itself. Instead
+of a generator that is resumed through the future event queue at each
+edge, the clocks of a simulation are kept in a dedicated periodic
+event slot, and toggled by a lightweight waiter. The edges of a clock
+that nobody waits for are skipped when the simulator advances time.
+
+This module provides the following objects:
+Clock -- class to model a free-running clock signal
+_findClocks -- function that returns the clocks of a simulation
+_Clocks -- the periodic event slot of a simulation
+
+"""
+from __future__ import absolute_import
+
+from heapq import heapify, heapreplace
+
+from myhdl._Signal import _Signal
+from myhdl._SignalArray import SignalArray
+from myhdl._Waiter import _Waiter
+from myhdl._instance import _Instantiator
+from myhdl._simulator import _local
+
+
+class Clock(_Signal):
+
+    """ Clock signal.
+
+    The clock is low at the start, and has a rising edge at time
+    phase and every period after it. It is high during period * duty
+    timesteps, rounded to an integer.
+
+    """
+
+    __slots__ = ('period', 'high', 'phase')
+
+    def __init__(self, period, duty=0.5, phase=None):
+        """ Construct a clock.
+
+        period -- clock period, in timesteps
+        duty -- fraction of the period that the clock is high
+                (default: 0.5)
+        phase -- time of the first rising edge (default: the low time,
+                 so that the clock starts with a full low phase)
+
+        """
+        high = int(round(period * duty))
+        if int(period) != period or not 0 < high < period:
+            raise ValueError("Clock: period should be an integer, and the "
+                             "high and low times should be > 0")
+        if phase is None:
+            phase = period - high
+        elif phase < 0:
+            raise ValueError("Clock: phase should be >= 0")
+        _Signal.__init__(self, bool(0))
+        self.period = int(period)
+        self.high = high
+        self.phase = int(phase)
+
+
+def _findClocks(arglist):
+    """ Return the clocks in arglist, and the clocks used by its blocks. """
+    clocks = []
+    ids = set()
+    for arg in arglist:
+        if isinstance(arg, _Instantiator):
+            objs = list(arg.sigdict.values())
+            for sigs in arg.losdict.values():
+                # the elements of signal arrays are never clocks
+                if not isinstance(sigs, SignalArray):
+                    objs.extend(sigs)
+            for s in getattr(arg, 'senslist', ()):
+                objs.append(getattr(s, 'sig', s))
+        else:
+            objs = (arg,)
+        for obj in objs:
+            if isinstance(obj, Clock) and id(obj) not in ids:
+                ids.add(id(obj))
+                clocks.append(obj)
+    return clocks
+
+
+class _ClockWaiter(_Waiter):
+
+    """ Waiter that toggles a clock. """
+
+    __slots__ = ('clk', 'val', 'times')
+
+    def __init__(self, clk):
+        self.clk = clk
+        self.hasRun = 0
+        # the value of the next edge
+        self.val = True
+        # the time to the next edge, after a falling and a rising edge
+        self.times = (clk.period - clk.high, clk.high)
+
+    def next(self, waiters, actives, exc):
+        clk = self.clk
+        clk._next = self.val
+        self.val = not self.val
+        if not clk._pending:
+            clk._pending = True
+            _local.context.siglist.append(clk)
+
+    def idle(self):
+        """ Tell whether the edges of the clock can go unnoticed. """
+        clk = self.clk
+        if clk._eventWaiters or clk._posedgeWaiters or \
+                clk._negedgeWaiters or clk._tracing:
+            return False
+        statics = clk._statics
+        return statics is None or not (statics[0] or statics[1] or
+                                       statics[2])
+
+    def skip(self, t0, t):
+        """ Skip the edges from time t0 up to t, and return the next one.
+
+        t0 is the time of the next edge, which is before t. The clock
+        gets the value of the last edge that is skipped.
+
+        """
+        clk = self.clk
+        period = clk.period
+        val = self.val
+        # the next edges with the value val, and with the other value
+        t1 = t0 + self.times[val]
+        t0 += -(-(t - t0) // period) * period
+        if t1 < t:
+            t1 += -(-(t - t1) // period) * period
+        if t1 < t0:
+            t0 = t1
+            val = not val
+        self.val = val
+        clk._val = clk._next = not val
+        return t0
+
+
+class _Clocks(object):
+
+    """ Periodic event slot for the clocks of a simulation.
+
+    The slot is a heap of (time, seq, waiter) entries, one per clock,
+    that is reordered in place when the clocks toggle.
+
+    """
+
+    __slots__ = ('_heap', 'time')
+
+    def __init__(self, clocks):
+        self._heap = [[clk.phase, seq, _ClockWaiter(clk)]
+                      for seq, clk in enumerate(clocks)]
+        heapify(self._heap)
+        self.time = self._heap[0][0]
+
+    def skip(self, t=None):
+        """ Skip the edges of the idle clocks that nobody can observe.
+
+        Time t is the next time at which an event is due, or None if
+        there is none. The idle clocks skip their edges up to t or up to
+        the next edge of a clock that is waited for, whichever comes
+        first. Return False if all clocks are idle and t is None, as
+        nothing can happen anymore.
+
+        """
+        heap = self._heap
+        if not heap[0][2].idle():
+            return True
+        idle = []
+        for entry in heap:
+            if entry[2].idle():
+                idle.append(entry)
+            elif t is None or entry[0] < t:
+                t = entry[0]
+        if t is None:
+            return False
+        skipped = False
+        for entry in idle:
+            if entry[0] < t:
+                entry[0] = entry[2].skip(entry[0], t)
+                skipped = True
+        if skipped:
+            heapify(heap)
+            self.time = heap[0][0]
+        return True
+
+    def pop(self):
+        """ Return the waiters of the clocks that toggle at self.time. """
+        heap = self._heap
+        t = self.time
+        waiters = []
+        while heap[0][0] == t:
+            entry = heap[0]
+            waiter = entry[2]
+            waiters.append(waiter)
+            heapreplace(heap, [t + waiter.times[waiter.val], entry[1],
+                               waiter])
+        self.time = heap[0][0]
+        return waiters
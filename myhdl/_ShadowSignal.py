@@ -30,7 +30,7 @@ from myhdl._compat import long
 from myhdl._Signal import _Signal
 from myhdl._Waiter import _SignalWaiter, _SignalTupleWaiter
 from myhdl._intbv import intbv
-from myhdl._simulator import _siglist
+from myhdl._simulator import _local
 from myhdl._bin import bin
 
 # shadow signals
@@ -298,7 +298,9 @@ class _TristateSignal(_ShadowSignal):
                     res = None
                     break
             self._next = res
-            _siglist.append(self)
+            if not self._pending:
+                self._pending = True
+                _local.context.siglist.append(self)
 
     def toVerilog(self):
         lines = []
@@ -335,4 +337,6 @@ class _TristateDriver(_Signal):
             # restore original value to cater for intbv handler
             self._next = self._sig._orival
             self._setNextVal(val)
-        _siglist.append(self)
+        if not self._pending:
+            self._pending = True
+            _local.context.siglist.append(self)
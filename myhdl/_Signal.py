@@ -32,17 +32,17 @@ from __future__ import print_function
 from copy import copy, deepcopy
 
 from myhdl._compat import integer_types, long
-from myhdl import _simulator as sim
-from myhdl._simulator import _futureEvents
-from myhdl._simulator import _siglist
-from myhdl._simulator import _signals
+from myhdl._simulator import _local
 from myhdl._intbv import intbv
+from myhdl._modbv import modbv
 from myhdl._fixbv import fixbv
 from myhdl._bin import bin
 
 # from myhdl._enum import EnumItemType
 
-_schedule = _futureEvents.append
+# returned by _update and _apply when the value does not change;
+# shared, and never modified
+_unchanged = []
 
 
 def _isListOfSigs(obj):
@@ -125,7 +125,8 @@ class _Signal(object):
                  '_setNextVal', '_copyVal2Next', '_printVcd',
                  '_driven', '_read', '_name', '_used', '_inList',
                  '_waiter', 'toVHDL', 'toVerilog', '_slicesigs',
-                 '_numeric'
+                 '_numeric', '_pending', '_statics', '_setVal', '_shared',
+                 '_mask'
                  )
 
     def __init__(self, val=None):
@@ -134,17 +135,17 @@ class _Signal(object):
         val -- initial value
 
         """
-        self._init = deepcopy(val)
-        self._val = deepcopy(val)
-        self._next = deepcopy(val)
         self._min = self._max = None
         self._name = self._driven = None
         self._read = self._used = False
         self._inList = False
+        self._pending = False
         self._nrbits = 0
         self._shift = 0
         self._numeric = True
         self._printVcd = self._printVcdStr
+        self._setVal = self._setValNonmutable
+        self._shared = False
         if isinstance(val, bool):
             self._type = bool
             self._setNextVal = self._setNextBool
@@ -164,6 +165,7 @@ class _Signal(object):
             self._nrbits = val._nrbits
             self._shift = val._shift
             self._setNextVal = self._setNextFixbv
+            self._setVal = self._setValBv
             if hasattr(val, '_vcd_asfloat'):
                 self._printVcd = self._printVcdReal
             elif self._nrbits:
@@ -176,75 +178,153 @@ class _Signal(object):
             self._max = val._max
             self._nrbits = val._nrbits
             self._setNextVal = self._setNextIntbv
+            self._setVal = self._setValBv
+            # precomputed bound handling for the common ranges; values of
+            # other types keep their own _handleBounds
+            if type(val) in (intbv, modbv) and self._max is None:
+                if self._min is None:
+                    self._setNextVal = self._setNextUnbounded
+            elif type(val) in (intbv, modbv) and self._min is not None and \
+                    val._hasFullRange():
+                self._mask = (long(1) << self._nrbits) - 1
+                if type(val) is intbv:
+                    if self._min == 0:
+                        self._setNextVal = self._setNextUnsigned
+                elif self._min == 0:
+                    self._setNextVal = self._setNextWrapUnsigned
+                else:
+                    self._setNextVal = self._setNextWrapSigned
             if self._nrbits:
                 self._printVcd = self._printVcdVec
             else:
                 self._printVcd = self._printVcdHex
         else:
             self._type = type(val)
-            if isinstance(val, EnumItemType):
+            if val is None or isinstance(val, EnumItemType):
                 self._setNextVal = self._setNextNonmutable
             else:
                 self._setNextVal = self._setNextMutable
+                self._setVal = self._setValMutable
             if hasattr(val, '_nrbits'):
                 self._nrbits = val._nrbits
+        # values that are never modified in place are shared
+        if self._setVal == self._setValNonmutable:
+            self._init = self._val = self._next = val
+        elif self._setVal == self._setValBv:
+            self._init = copy(val)
+            self._val = copy(val)
+            self._next = copy(val)
+        else:
+            self._init = deepcopy(val)
+            self._val = deepcopy(val)
+            self._next = deepcopy(val)
         self._eventWaiters = _WaiterList()
         self._posedgeWaiters = _PosedgeWaiterList(self)
         self._negedgeWaiters = _NegedgeWaiterList(self)
+        self._statics = None
         self._code = ""
         self._slicesigs = []
         self._tracing = 0
-        _signals.append(self)
+        _local.context.signals.append(self)
 
     def _clear(self):
         del self._eventWaiters[:]
         del self._posedgeWaiters[:]
         del self._negedgeWaiters[:]
-        self._val = deepcopy(self._init)
-        self._next = deepcopy(self._init)
+        self._statics = None
+        init = self._init
+        if self._setVal == self._setValNonmutable:
+            self._val = self._next = init
+        elif self._setVal == self._setValBv:
+            self._val = copy(init)
+            self._next = copy(init)
+        else:
+            self._val = deepcopy(init)
+            self._next = deepcopy(init)
+            self._shared = False
         self._name = self._driven = None
         self._read = False # dont clear self._used
-        self._inList = False 
+        self._inList = False
+        self._pending = False
         self._numeric = True
         for s in self._slicesigs:
             s._clear()
 
     def _update(self):
+        self._pending = False
         val, next = self._val, self._next
         if val != next:
+            statics = self._statics
             waiters = self._eventWaiters[:]
             del self._eventWaiters[:]
+            if statics is not None:
+                waiters.extend(statics[0])
             if not val and next:
                 waiters.extend(self._posedgeWaiters[:])
                 del self._posedgeWaiters[:]
+                if statics is not None:
+                    waiters.extend(statics[1])
             elif not next and val:
                 waiters.extend(self._negedgeWaiters[:])
                 del self._negedgeWaiters[:]
+                if statics is not None:
+                    waiters.extend(statics[2])
             if next is None:
                 self._val = None
-            elif isinstance(val, intbv):
-                self._val._val = next._val
-            elif isinstance(val, (integer_types, EnumItemType)):
-                self._val = next
             else:
-                self._val = deepcopy(next)
+                self._setVal(next)
             if self._tracing:
                 self._printVcd()
             return waiters
         else:
-            return []
+            return _unchanged
+
+    # set val methods, that move the next value to the current value
+    def _setValNonmutable(self, next):
+        self._val = next
+
+    def _setValBv(self, next):
+        val = self._val
+        if val is None:
+            self._val = copy(next)
+        else:
+            val._val = next._val
+
+    def _setValMutable(self, next):
+        # copy on write: the next value is copied when it is modified
+        self._val = next
+        self._shared = True
+
+    def _subscribe(self, waiter, edge=0):
+        """ Subscribe a waiter to the signal until it is cleared.
+
+        Unlike the waiters in the waiter lists, the waiter is not
+        removed when it is triggered. edge selects the events:
+        0 for any change, 1 for positive and 2 for negative edges.
+
+        """
+        if self._statics is None:
+            self._statics = ([], [], [])
+        self._statics[edge].append(waiter)
 
     # support for the 'val' attribute
     @property
     def val(self):
+        if self._shared:
+            # val may be modified in place, so next gets its own copy
+            self._next = deepcopy(self._next)
+            self._shared = False
         return self._val
 
     # support for the 'next' attribute
     @property
     def next(self):
-        #        if self._next is self._val:
-        #            self._next = deepcopy(self._val)
-        _siglist.append(self)
+        if self._shared:
+            self._next = deepcopy(self._next)
+            self._shared = False
+        if not self._pending:
+            self._pending = True
+            _local.context.siglist.append(self)
         return self._next
 
     @next.setter
@@ -252,7 +332,9 @@ class _Signal(object):
         if isinstance(val, _Signal):
             val = val._val
         self._setNextVal(val)
-        _siglist.append(self)
+        if not self._pending:
+            self._pending = True
+            _local.context.siglist.append(self)
 
     # support for the 'posedge' attribute
     @property
@@ -338,6 +420,37 @@ class _Signal(object):
         self._next._val = val
         self._next._handleBounds()
 
+    def _setNextUnbounded(self, val):
+        if isinstance(val, (intbv, fixbv)):
+            val = val._val
+        elif not isinstance(val, integer_types):
+            raise TypeError("Expected int or intbv, got %s" % type(val))
+        self._next._val = val
+
+    def _setNextUnsigned(self, val):
+        if isinstance(val, (intbv, fixbv)):
+            val = val._val
+        elif not isinstance(val, integer_types):
+            raise TypeError("Expected int or intbv, got %s" % type(val))
+        self._next._val = val
+        if val & self._mask != val:
+            self._next._handleBounds()
+
+    def _setNextWrapUnsigned(self, val):
+        if isinstance(val, (intbv, fixbv)):
+            val = val._val
+        elif not isinstance(val, integer_types):
+            raise TypeError("Expected int or intbv, got %s" % type(val))
+        self._next._val = val & self._mask
+
+    def _setNextWrapSigned(self, val):
+        if isinstance(val, (intbv, fixbv)):
+            val = val._val
+        elif not isinstance(val, integer_types):
+            raise TypeError("Expected int or intbv, got %s" % type(val))
+        max = self._max
+        self._next._val = ((val + max) & self._mask) - max
+
     def _setNextNonmutable(self, val):
         if not isinstance(val, self._type):
             raise TypeError("Expected %s, got %s" % (self._type, type(val)))
@@ -347,32 +460,33 @@ class _Signal(object):
         if not isinstance(val, self._type):
             raise TypeError("Expected %s, got %s" % (self._type, type(val)))
         self._next = deepcopy(val)
+        self._shared = False
 
     # vcd print methods
     def _printVcdStr(self):
-        print("s%s %s" % (str(self._val), self._code), file=sim._tf)
+        print("s%s %s" % (str(self._val), self._code), file=_local.context.tf)
 
     def _printVcdReal(self):
         print("r%g %s" % (float(self._val*2**self._shift), self._code),
-              file=sim._tf)
+              file=_local.context.tf)
 
     def _printVcdHex(self):
         if self._val is None:
-            print("sz %s" % self._code, file=sim._tf)
+            print("sz %s" % self._code, file=_local.context.tf)
         else:
-            print("s%s %s" % (hex(self._val), self._code), file=sim._tf)
+            print("s%s %s" % (hex(self._val), self._code), file=_local.context.tf)
 
     def _printVcdBit(self):
         if self._val is None:
-            print("z%s" % self._code, file=sim._tf)
+            print("z%s" % self._code, file=_local.context.tf)
         else:
-            print("%d%s" % (self._val, self._code), file=sim._tf)
+            print("%d%s" % (self._val, self._code), file=_local.context.tf)
 
     def _printVcdVec(self):
         if self._val is None:
-            print("b%s %s" % ('z' * self._nrbits, self._code), file=sim._tf)
+            print("b%s %s" % ('z' * self._nrbits, self._code), file=_local.context.tf)
         else:
-            print("b%s %s" % (bin(self._val, self._nrbits), self._code), file=sim._tf)
+            print("b%s %s" % (bin(self._val, self._nrbits), self._code), file=_local.context.tf)
 
     ### use call interface for shadow signals ###
     def __call__(self, left, right=None):
@@ -632,30 +746,43 @@ class _DelayedSignal(_Signal):
         self._timeStamp = 0
 
     def _update(self):
+        self._pending = False
+        ctx = _local.context
         if self._next != self._nextZ:
-            self._timeStamp = sim._time
+            self._timeStamp = ctx.time
         self._nextZ = self._next
-        t = sim._time + self._delay
-        _schedule((t, _SignalWrap(self, self._next, self._timeStamp)))
-        return []
+        t = ctx.time + self._delay
+        ctx.futureEvents.append(
+            (t, _SignalWrap(self, self._next, self._timeStamp)))
+        return _unchanged
 
     def _apply(self, next, timeStamp):
         val = self._val
         if timeStamp == self._timeStamp and val != next:
+            statics = self._statics
             waiters = self._eventWaiters[:]
             del self._eventWaiters[:]
+            if statics is not None:
+                waiters.extend(statics[0])
             if not val and next:
                 waiters.extend(self._posedgeWaiters[:])
                 del self._posedgeWaiters[:]
+                if statics is not None:
+                    waiters.extend(statics[1])
             elif not next and val:
                 waiters.extend(self._negedgeWaiters[:])
                 del self._negedgeWaiters[:]
-            self._val = copy(next)
+                if statics is not None:
+                    waiters.extend(statics[2])
+            if next is None:
+                self._val = None
+            else:
+                self._setVal(next)
             if self._tracing:
                 self._printVcd()
             return waiters
         else:
-            return []
+            return _unchanged
 
     # support for the 'delay' attribute
     @property
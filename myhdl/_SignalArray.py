@@ -0,0 +1,365 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module that provides the SignalArray class.
+
+A SignalArray models a memory: a list of signals of the same type,
+with the element values kept in a compact array. Element signals are
+only created for the elements that need one: to wait on, to trace or
+to convert. Indexing returns that signal, or a light element object
+that reads and writes the array directly.
+
+"""
+from __future__ import absolute_import
+
+from array import array
+from copy import copy
+from operator import index
+
+from myhdl._compat import (integer_types, signed_typecodes,
+                           unsigned_typecodes)
+from myhdl._intbv import intbv
+from myhdl._Signal import _Signal, _WaiterList, _unchanged
+from myhdl._simulator import _local
+
+# array typecodes, from small to large
+_UNSIGNED = unsigned_typecodes
+_SIGNED = signed_typecodes
+
+
+def _typecode(min, max):
+    """ Return the smallest array typecode for the bounds, or None. """
+    if min is None or max is None:
+        return None
+    for code in (_UNSIGNED if min >= 0 else _SIGNED):
+        nrbits = array(code).itemsize * 8
+        if min >= 0:
+            if max <= 2**nrbits:
+                return code
+        elif -2**(nrbits - 1) <= min and max <= 2**(nrbits - 1):
+            return code
+    return None
+
+
+class SignalArray(object):
+
+    """ Array of signals of the same type.
+
+    Properties:
+    codes -- the current element values, as integers (read-only)
+
+    """
+
+    __slots__ = ('_store', '_init', '_proto', '_scratch', '_views',
+                 '_writes', '_pending', '_eventWaiters', '_statics')
+
+    def __init__(self, val, depth, init=None):
+        """ Construct a signal array.
+
+        val -- the element type and default value: a bool or an intbv
+        depth -- the number of elements
+        init -- optional sequence with the initial element values
+
+        """
+        if isinstance(val, bool):
+            code = 'B'
+        elif isinstance(val, intbv):
+            code = _typecode(val._min, val._max)
+        else:
+            raise TypeError("SignalArray: expected bool or intbv, got %s" %
+                            type(val))
+        self._proto = val
+        self._scratch = copy(val)
+        if init is None:
+            codes = [int(val)] * depth
+        else:
+            if len(init) != depth:
+                raise ValueError("SignalArray: expected %s initial values, "
+                                 "got %s" % (depth, len(init)))
+            codes = [self._check(v) for v in init]
+        if code is None:
+            self._init = codes
+            self._store = list(codes)
+        else:
+            self._init = array(code, codes)
+            self._store = array(code, codes)
+        self._views = {}
+        self._writes = {}
+        self._pending = False
+        self._eventWaiters = _WaiterList()
+        self._statics = None
+        _local.context.signals.append(self)
+
+    def _clear(self):
+        del self._eventWaiters[:]
+        self._statics = None
+        self._store[:] = self._init
+        self._writes.clear()
+        self._pending = False
+
+    def _check(self, val):
+        """ Return val as an element code, with the bounds handled. """
+        if isinstance(val, _Signal):
+            val = val._val
+        if isinstance(self._proto, bool):
+            if isinstance(val, intbv):
+                val = val._val
+            if not val in (0, 1):
+                raise ValueError("Expected boolean value, got %s (%s)" %
+                                 (repr(val), type(val)))
+            return int(val)
+        if isinstance(val, intbv):
+            val = val._val
+        elif not isinstance(val, integer_types):
+            raise TypeError("Expected int or intbv, got %s" % type(val))
+        scratch = self._scratch
+        scratch._val = val
+        scratch._handleBounds()
+        return scratch._val
+
+    def _element(self, code):
+        """ Return the element value for a code. """
+        proto = self._proto
+        if isinstance(proto, bool):
+            return bool(code)
+        val = copy(proto)
+        val._val = code
+        return val
+
+    def _get(self, i):
+        view = self._views.get(i)
+        if view is not None:
+            return view._val
+        return self._element(self._store[i])
+
+    def _write(self, i, val):
+        view = self._views.get(i)
+        if view is None:
+            self._writes[i] = self._check(val)
+        else:
+            if isinstance(val, _Signal):
+                val = val._val
+            view._setNextVal(val)
+            # None: the next value is in the view
+            self._writes[i] = None
+        if not self._pending:
+            self._pending = True
+            _local.context.siglist.append(self)
+
+    def _nextOf(self, i):
+        """ Return the next value of a view, that may be modified. """
+        self._writes[i] = None
+        if not self._pending:
+            self._pending = True
+            _local.context.siglist.append(self)
+        return self._views[i]._next
+
+    def _view(self, i):
+        """ Return the signal for element i, and create it if needed. """
+        view = self._views.get(i)
+        if view is None:
+            view = _SignalArrayView(self._element(self._init[i]))
+            view._array = self
+            view._index = i
+            view._val = self._element(self._store[i])
+            view._next = self._element(self._store[i])
+            code = self._writes.get(i)
+            if code is not None:
+                view._setNextVal(code)
+                self._writes[i] = None
+            self._views[i] = view
+        return view
+
+    def _update(self):
+        self._pending = False
+        store = self._store
+        views = self._views
+        waiters = None
+        for i, code in self._writes.items():
+            if code is None:
+                view = views[i]
+                w = view._update()
+                if w is _unchanged:
+                    continue
+                store[i] = int(view._val)
+            elif store[i] != code:
+                store[i] = code
+                w = ()
+            else:
+                continue
+            if waiters is None:
+                waiters = self._eventWaiters[:]
+                del self._eventWaiters[:]
+                if self._statics is not None:
+                    waiters.extend(self._statics[0])
+            waiters.extend(w)
+        self._writes.clear()
+        if waiters is None:
+            return _unchanged
+        return waiters
+
+    def _subscribe(self, waiter, edge=0):
+        """ Subscribe a waiter to writes of any element. """
+        if self._statics is None:
+            self._statics = ([], [], [])
+        self._statics[edge].append(waiter)
+
+    def _reset(self):
+        """ Set the next values to the initial values. """
+        for i in range(len(self._store)):
+            if i in self._views or self._store[i] != self._init[i]:
+                self._write(i, self._init[i])
+
+    # support for the 'codes' attribute
+    @property
+    def codes(self):
+        return self._store
+
+    def __len__(self):
+        return len(self._store)
+
+    def __getitem__(self, key):
+        i = index(key)
+        if i < 0:
+            i += len(self._store)
+        if not 0 <= i < len(self._store):
+            raise IndexError("SignalArray index out of range")
+        view = self._views.get(i)
+        if view is not None:
+            return view
+        item = _SignalArrayItem.__new__(_SignalArrayItem)
+        item._array = self
+        item._index = i
+        return item
+
+    def __iter__(self):
+        # all elements are created, as for a list of signals
+        view = self._view
+        return (view(i) for i in range(len(self._store)))
+
+    def __hash__(self):
+        raise TypeError("Signal arrays are unhashable")
+
+    def __repr__(self):
+        return "SignalArray(%r, %s)" % (self._proto, len(self._store))
+
+
+class _SignalArrayView(_Signal):
+
+    """ Signal for an element of a SignalArray.
+
+    Its next value is applied by the array, so that writes of the array
+    and of its element signals are updated together.
+
+    """
+
+    __slots__ = ('_array', '_index')
+
+    # support for the 'next' attribute
+    @property
+    def next(self):
+        return self._array._nextOf(self._index)
+
+    @next.setter
+    def next(self, val):
+        self._array._write(self._index, val)
+
+
+class _SignalArrayItem(_Signal):
+
+    """ Element of a SignalArray that has no signal.
+
+    The value is read from the array, and writes go to the array. The
+    element signal is created when the item is waited on, or when its
+    next value is read.
+
+    """
+
+    __slots__ = ('_array', '_index')
+
+    @property
+    def _val(self):
+        return self._array._get(self._index)
+
+    # support for the 'val' attribute
+    @property
+    def val(self):
+        return self._array._get(self._index)
+
+    @property
+    def _init(self):
+        array = self._array
+        return array._element(array._init[self._index])
+
+    @property
+    def _type(self):
+        return self._array._view(self._index)._type
+
+    @property
+    def _nrbits(self):
+        proto = self._array._proto
+        return 1 if isinstance(proto, bool) else proto._nrbits
+
+    @property
+    def _min(self):
+        return getattr(self._array._proto, '_min', None)
+
+    @property
+    def _max(self):
+        return getattr(self._array._proto, '_max', None)
+
+    # support for the 'next' attribute
+    @property
+    def next(self):
+        return self._array._view(self._index).next
+
+    @next.setter
+    def next(self, val):
+        self._array._write(self._index, val)
+
+    # waiting on the item creates the element signal
+    @property
+    def posedge(self):
+        return self._array._view(self._index)._posedgeWaiters
+
+    @property
+    def negedge(self):
+        return self._array._view(self._index)._negedgeWaiters
+
+    @property
+    def _eventWaiters(self):
+        return self._array._view(self._index)._eventWaiters
+
+    @property
+    def _posedgeWaiters(self):
+        return self._array._view(self._index)._posedgeWaiters
+
+    @property
+    def _negedgeWaiters(self):
+        return self._array._view(self._index)._negedgeWaiters
+
+    def _subscribe(self, waiter, edge=0):
+        self._array._view(self._index)._subscribe(waiter, edge)
+
+    def __call__(self, left, right=None):
+        return self._array._view(self._index)(left, right)
+
+    # an item has no name
+    def __str__(self):
+        return str(self._val)
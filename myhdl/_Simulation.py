@@ -22,21 +22,25 @@ from __future__ import absolute_import
 from __future__ import print_function
 
 import os
-from operator import itemgetter
+from timeit import default_timer as _timer
 from types import GeneratorType
 
 from myhdl import StopSimulation, _SuspendSimulation
 from myhdl import _simulator, SimulationError
 from myhdl._Cosimulation import Cosimulation
-from myhdl._simulator import _signals, _siglist, _futureEvents
+from myhdl._Clock import Clock, _findClocks, _Clocks
+from myhdl._scheduler import _queues, _makeQueue
+from myhdl._cyclesim import _CycleEngine
+from myhdl._levelize import _Levelizer
+from myhdl._profiler import _Profiler
+from myhdl._Signal import _unchanged
 from myhdl._Waiter import _Waiter
 from myhdl._Waiter import _inferWaiter
 from myhdl._Waiter import _SignalTupleWaiter
 from myhdl._util import _printExcInfo
 from myhdl._instance import _Instantiator
 from myhdl._block import _Block
-
-schedule = _futureEvents.append
+from myhdl._always_comb import _AlwaysComb
 
 
 class _error:
@@ -46,6 +50,8 @@ class _error:
 _error.ArgType = "Inappriopriate argument type"
 _error.MultipleCosim = "Only a single cosimulator argument allowed"
 _error.DuplicatedArg = "Duplicated argument"
+_error.SchedulerType = "Unknown scheduler"
+_error.ModeType = "Unknown simulation mode"
 
 # flatten Block objects out
 
@@ -66,6 +72,51 @@ def _flatten(*args):
 _error.MultipleSim = "Only a single Simulation instance is allowed"
 
 
+class _Statistics(object):
+
+    """ Kernel statistics of a simulation.
+
+    The counters are updated when a run returns, also when it is
+    suspended after a duration.
+
+    Attributes:
+    timesteps -- number of time steps advanced
+    deltas -- number of delta cycles
+    updates -- number of signal updates that changed a value
+    resumed -- number of waiters resumed
+    scheduled -- number of future events scheduled
+    peakEvents -- peak number of pending future events
+    simTime -- simulated time
+    wallTime -- wall-clock time spent running, in seconds
+    rate -- simulated time per wall-clock second
+
+    """
+
+    __slots__ = ('timesteps', 'deltas', 'updates', 'resumed', 'scheduled',
+                 'peakEvents', 'simTime', 'wallTime')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+        self.wallTime = 0.0
+
+    @property
+    def rate(self):
+        if not self.wallTime:
+            return 0.0
+        return self.simTime / self.wallTime
+
+    def asdict(self):
+        """ Return the statistics as a dict. """
+        d = dict((name, getattr(self, name)) for name in self.__slots__)
+        d['rate'] = self.rate
+        return d
+
+    def __repr__(self):
+        return "<Statistics %s>" % ", ".join(
+            "%s=%s" % item for item in sorted(self.asdict().items()))
+
+
 class Simulation(object):
 
     """ Simulation class.
@@ -73,25 +124,77 @@ class Simulation(object):
     Methods:
     run -- run a simulation for some duration
 
+    Attributes:
+    stats -- kernel statistics, see _Statistics
+
+    A simulation owns the simulator context of the thread in which it
+    is constructed. There can be one simulation per thread at a time.
+
     """
-    _no_of_instances = 0
 
-    def __init__(self, *args):
+    def __init__(self, *args, **kwargs):
         """ Construct a simulation object.
 
         *args -- list of arguments. Each argument is a generator or
                  a nested sequence of generators.
+        scheduler -- future event queue: 'heap' (default) or 'calendar'
+        mode -- 'event' (default) or 'cycle' for cycle-based simulation
+        levelize -- evaluate always_comb blocks in topological order
+                    (default: off)
+        profile -- record activations and time per process in the
+                   profiler attribute (default: off)
 
         """
-        _simulator._time = 0
-        arglist = _flatten(*args)
-        self._waiters, self._cosims = _makeWaiters(arglist)
-        if Simulation._no_of_instances > 0:
+        scheduler = kwargs.pop('scheduler', 'heap')
+        mode = kwargs.pop('mode', 'event')
+        levelize = kwargs.pop('levelize', False)
+        profile = kwargs.pop('profile', False)
+        if kwargs:
+            raise TypeError("Simulation: unexpected keyword arguments %s" %
+                            ", ".join(kwargs))
+        if scheduler not in _queues:
+            raise SimulationError(_error.SchedulerType, str(scheduler))
+        if mode not in ('event', 'cycle'):
+            raise SimulationError(_error.ModeType, str(mode))
+        ctx = self._context = _simulator._current()
+        if ctx.simulation is not None:
             raise SimulationError(_error.MultipleSim)
-        Simulation._no_of_instances += 1
+        ctx.time = 0
+        arglist = _flatten(*args)
+        self.stats = _Statistics()
+        self._engine = None
+        self.levelizer = None
+        if mode == 'cycle':
+            self._engine = _CycleEngine(arglist, ctx, self.stats)
+            self._waiters, self._cosims = [], []
+        elif levelize:
+            combs = [arg for arg in arglist if isinstance(arg, _AlwaysComb)]
+            self.levelizer = _Levelizer(combs)
+            self._waiters, self._cosims = _makeWaiters(
+                arglist, ctx.signals, self.levelizer.levelized)
+        else:
+            self._waiters, self._cosims = _makeWaiters(arglist, ctx.signals)
+        self.profiler = None
+        if profile:
+            self.profiler = profiler = _Profiler(args)
+            for waiter in self._waiters:
+                profiler.instrument(waiter)
+            if self.levelizer is not None:
+                self.levelizer._instrument(profiler.wrap)
+            if self._engine is not None:
+                self._engine._instrument(profiler.wrap)
+        self._clocks = None
+        if self._engine is None:
+            clocks = _findClocks(arglist)
+            if clocks:
+                self._clocks = _Clocks(clocks)
+        ctx.simulation = self
         self._finished = False
-        del _futureEvents[:]
-        del _siglist[:]
+        self._queue = _makeQueue(scheduler)
+        del ctx.futureEvents[:]
+        for s in ctx.siglist:
+            s._pending = False
+        del ctx.siglist[:]
 
     def _finalize(self):
         cosims = self._cosims
@@ -100,13 +203,14 @@ class Simulation(object):
                 os.close(cosim._rt)
                 os.close(cosim._wf)
                 cosim._child.wait()
-        if _simulator._tracing:
-            _simulator._tracing = 0
-            _simulator._tf.close()
+        ctx = self._context
+        if ctx.tracing:
+            ctx.tracing = 0
+            ctx.tf.close()
         # clean up for potential new run with same signals
-        for s in _signals:
+        for s in ctx.signals:
             s._clear()
-        Simulation._no_of_instances = 0
+        ctx.simulation = None
         self._finished = True
 
     def quit(self):
@@ -124,121 +228,239 @@ class Simulation(object):
         # From this point it will propagate to the caller, that can catch it.
         if self._finished:
             raise StopSimulation("Simulation has already finished")
+        # the simulation may run in another thread than the one that
+        # constructed it: make its context current while it runs
+        local = _simulator._local
+        context = local.context
+        ctx = local.context = self._context
+        stats = self.stats
+        time = ctx.time
+        start = _timer()
+        try:
+            if self._engine is not None:
+                return self._runCycle(duration, quiet)
+            return self._runEvent(duration, quiet)
+        finally:
+            stats.wallTime += _timer() - start
+            stats.simTime += ctx.time - time
+            local.context = context
+
+    def _runEvent(self, duration, quiet):
+        ctx = self._context
+        _siglist = ctx.siglist
+        _futureEvents = ctx.futureEvents
         waiters = self._waiters
         maxTime = None
         if duration:
             stop = _Waiter(None)
             stop.hasRun = 1
-            maxTime = _simulator._time + duration
-            schedule((maxTime, stop))
+            maxTime = ctx.time + duration
+            _futureEvents.append((maxTime, stop))
         cosims = self._cosims
-        t = _simulator._time
+        queue = self._queue
+        clocks = self._clocks
+        levelizer = self.levelizer
+        t = ctx.time
         actives = {}
-        tracing = _simulator._tracing
-        tracefile = _simulator._tf
+        tracing = ctx.tracing
+        tracefile = ctx.tf
         exc = []
         _pop = waiters.pop
         _append = waiters.append
         _extend = waiters.extend
+        # the statistics are kept in locals, and stored when the run returns
+        stats = self.stats
+        timesteps = deltas = updates = resumed = scheduled = 0
+        peakEvents = stats.peakEvents
+        if levelizer is not None:
+            # levelized blocks are counted by the levelizer, and are
+            # resumed instead of their triggers
+            levelized = (levelizer.evaluations - levelizer._resumed,
+                         levelizer.deltas, levelizer.updates)
+
+        try:
+            while 1:
+                try:
+
+                    for s in _siglist:
+                        w = s._update()
+                        if w is not _unchanged:
+                            updates += 1
+                            _extend(w)
+                    del _siglist[:]
+
+                    ctx.delta += 1
+                    deltas += 1
+                    while waiters:
+                        waiter = _pop()
+                        resumed += 1
+                        try:
+                            waiter.next(waiters, actives, exc)
+                        except StopIteration:
+                            continue
+
+                    if levelizer is not None and levelizer.ndirty:
+                        levelizer.settle(waiters)
+                        if waiters:
+                            continue
 
-        while 1:
-            try:
-
-                for s in _siglist:
-                    _extend(s._update())
-                del _siglist[:]
-
-                while waiters:
-                    waiter = _pop()
-                    try:
-                        waiter.next(waiters, actives, exc)
-                    except StopIteration:
-                        continue
-
-                if cosims:
-                    any_cosim_changes = False
-                    for cosim in cosims:
-                        any_cosim_changes = \
-                            any_cosim_changes or cosim._hasChange
-                    for cosim in cosims:
-                        cosim._get()
-                    if _siglist or any_cosim_changes:
-                        # It should be safe to _put a cosim with no changes
-                        # because _put with the same values should be
-                        # idempotent. We need to _put them all here because
-                        # otherwise we can desync _get/_put.
-                        for cosim in cosims:
-                            cosim._put(t)
-                        continue
-                elif _siglist:
-                    continue
-
-                if actives:
-                    for wl in actives.values():
-                        wl.purge()
-                    actives = {}
-
-                # at this point it is safe to potentially suspend a simulation
-                if exc:
-                    raise exc[0]
-
-                # future events
-                if _futureEvents:
-                    if t == maxTime:
-                        raise _SuspendSimulation(
-                            "Simulated %s timesteps" % duration)
-                    _futureEvents.sort(key=itemgetter(0))
-                    t = _simulator._time = _futureEvents[0][0]
-                    if tracing:
-                        print("#%s" % t, file=tracefile)
                     if cosims:
+                        any_cosim_changes = False
+                        for cosim in cosims:
+                            any_cosim_changes = \
+                                any_cosim_changes or cosim._hasChange
                         for cosim in cosims:
-                            cosim._put(t)
-                    while _futureEvents:
-                        newt, event = _futureEvents[0]
-                        if newt == t:
+                            cosim._get()
+                        if _siglist or any_cosim_changes:
+                            # It should be safe to _put a cosim with no
+                            # changes because _put with the same values
+                            # should be idempotent. We need to _put them all
+                            # here because otherwise we can desync _get/_put.
+                            for cosim in cosims:
+                                cosim._put(t)
+                            continue
+                    elif _siglist:
+                        continue
+
+                    if actives:
+                        for wl in actives.values():
+                            wl.purge()
+                        actives = {}
+
+                    # at this point it is safe to potentially suspend a
+                    # simulation
+                    if exc:
+                        raise exc[0]
+
+                    # future events
+                    if _futureEvents:
+                        scheduled += len(_futureEvents)
+                        queue.load(_futureEvents)
+                        del _futureEvents[:]
+                        if len(queue) > peakEvents:
+                            peakEvents = len(queue)
+                    if clocks is not None or queue:
+                        if t == maxTime:
+                            raise _SuspendSimulation(
+                                "Simulated %s timesteps" % duration)
+                        if clocks is None:
+                            t, events = queue.pop()
+                        else:
+                            # the clocks have their own periodic event slot
+                            t = clocks.time
+                            events = ()
+                            tq = queue.peek() if queue else None
+                            if not cosims and (tq is None or t < tq):
+                                # skip the edges that nobody waits for
+                                if not clocks.skip(tq):
+                                    raise StopSimulation("No more events")
+                                t = clocks.time
+                            if tq is None:
+                                pass
+                            elif tq < t:
+                                t, events = queue.pop()
+                            elif tq == t:
+                                events = queue.pop()[1]
+                            if t == clocks.time:
+                                toggles = clocks.pop()
+                                scheduled += len(toggles)
+                                _extend(toggles)
+                        ctx.time = t
+                        timesteps += 1
+                        if tracing:
+                            print("#%s" % t, file=tracefile)
+                        if cosims:
+                            for cosim in cosims:
+                                cosim._put(t)
+                        for event in events:
                             if isinstance(event, _Waiter):
                                 _append(event)
                             else:
-                                _extend(event.apply())
-                            del _futureEvents[0]
-                        else:
-                            break
-                else:
-                    raise StopSimulation("No more events")
-
-            except _SuspendSimulation:
-                if not quiet:
-                    _printExcInfo()
-                if tracing:
-                    tracefile.flush()
-                return 1
-
-            except StopSimulation:
-                if not quiet:
-                    _printExcInfo()
-                self._finalize()
-                self._finished = True
-                return 0
-
-            except Exception as e:
-                if tracing:
-                    tracefile.flush()
-                # if the exception came from a yield, make sure we can resume
-                if exc and e is exc[0]:
-                    pass  # don't finalize
-                else:
-                    self._finalize()
-                # now reraise the exepction
-                raise
+                                w = event.apply()
+                                if w is not _unchanged:
+                                    updates += 1
+                                    _extend(w)
+                    else:
+                        raise StopSimulation("No more events")
+
+                except _SuspendSimulation:
+                    if not quiet:
+                        _printExcInfo()
+                    if tracing:
+                        tracefile.flush()
+                    return 1
 
+                except StopSimulation:
+                    if not quiet:
+                        _printExcInfo()
+                    self._finalize()
+                    self._finished = True
+                    return 0
 
-def _makeWaiters(arglist):
+                except Exception as e:
+                    if tracing:
+                        tracefile.flush()
+                    # if the exception came from a yield, make sure we can
+                    # resume
+                    if exc and e is exc[0]:
+                        pass  # don't finalize
+                    else:
+                        self._finalize()
+                    # now reraise the exepction
+                    raise
+        finally:
+            if levelizer is not None:
+                resumed += (levelizer.evaluations - levelizer._resumed -
+                            levelized[0])
+                deltas += levelizer.deltas - levelized[1]
+                updates += levelizer.updates - levelized[2]
+            stats.timesteps += timesteps
+            stats.deltas += deltas
+            stats.updates += updates
+            stats.resumed += resumed
+            stats.scheduled += scheduled
+            stats.peakEvents = peakEvents
+
+    def _runCycle(self, duration, quiet):
+        ctx = self._context
+        maxTime = None
+        if duration:
+            maxTime = ctx.time + duration
+        tracing = ctx.tracing
+        tracefile = ctx.tf
+        try:
+            self._engine.run(maxTime, tracing, tracefile)
+
+        except _SuspendSimulation:
+            if not quiet:
+                _printExcInfo()
+            if tracing:
+                tracefile.flush()
+            return 1
+
+        except StopSimulation:
+            if not quiet:
+                _printExcInfo()
+            self._finalize()
+            self._finished = True
+            return 0
+
+        except Exception:
+            if tracing:
+                tracefile.flush()
+            self._finalize()
+            raise
+
+
+def _makeWaiters(arglist, signals, levelized=()):
     waiters = []
     ids = set()
     cosims = []
+    skip = set(id(arg) for arg in levelized)
     for arg in arglist:
-        if isinstance(arg, GeneratorType):
+        if id(arg) in skip:
+            pass
+        elif isinstance(arg, GeneratorType):
             waiters.append(_inferWaiter(arg))
         elif isinstance(arg, _Instantiator):
             waiters.append(arg.waiter)
@@ -247,6 +469,8 @@ def _makeWaiters(arglist):
             waiters.append(_SignalTupleWaiter(arg._waiter()))
         elif isinstance(arg, _Waiter):
             waiters.append(arg)
+        elif isinstance(arg, Clock):
+            pass
         elif arg == True:
             pass
         else:
@@ -255,7 +479,7 @@ def _makeWaiters(arglist):
             raise SimulationError(_error.DuplicatedArg)
         ids.add(id(arg))
     # add waiters for shadow signals
-    for sig in _signals:
+    for sig in signals:
         if hasattr(sig, '_waiter'):
             waiters.append(sig._waiter)
     return waiters, cosims
@@ -0,0 +1,375 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module that provides the SparseMemory class.
+
+A SparseMemory models a large memory in a testbench. The words are
+kept in pages that are allocated when they are first accessed, so that
+only the pages in use cost memory. Binary files are memory-mapped when
+they are loaded, and their pages are only read when they are accessed.
+
+"""
+from __future__ import absolute_import
+
+import mmap
+import sys
+from array import array
+from binascii import hexlify, unhexlify
+from operator import index
+
+from myhdl._compat import array_frombytes, array_tobytes, unsigned_typecodes
+
+# array typecodes for the word widths that fit an array, the smallest
+# typecode of each width
+_TYPECODES = dict((array(code).itemsize * 8, code)
+                  for code in reversed(unsigned_typecodes))
+
+_BIGENDIAN = sys.byteorder == 'big'
+
+
+def _typecode(width):
+    """ Return the typecode of the smallest words that hold width bits.
+
+    Words that are wider than all typecodes are kept in lists, and None
+    is returned.
+
+    """
+    bits = [b for b in _TYPECODES if b >= width]
+    if not bits:
+        return None
+    return _TYPECODES[min(bits)]
+
+
+def _isHexFile(filename, format):
+    if format is None:
+        return filename.endswith(('.hex', '.mem'))
+    if format not in ('bin', 'hex'):
+        raise ValueError("SparseMemory: format should be 'bin' or 'hex', "
+                         "got %r" % (format,))
+    return format == 'hex'
+
+
+class SparseMemory(object):
+
+    """ Sparse memory of words, with the words kept in pages.
+
+    Properties:
+    size -- the number of words
+    width -- the number of bits of a word
+    pagesize -- the number of words of a page
+    dirty -- the numbers of the pages that were written (read-only)
+
+    """
+
+    __slots__ = ('_size', '_width', '_nrbytes', '_pagesize', '_pagebits',
+                 '_limit', '_default', '_typecode', '_table', '_pages',
+                 '_dirty', '_sources')
+
+    def __init__(self, size, width=8, pagesize=4096, default=0):
+        """ Construct a sparse memory.
+
+        size -- the number of words
+        width -- the number of bits of a word
+        pagesize -- the number of words of a page, a power of 2
+        default -- the value of the words that were never written
+
+        """
+        if pagesize < 1 or pagesize & (pagesize - 1):
+            raise ValueError("SparseMemory: pagesize should be a power of 2")
+        if width < 1:
+            raise ValueError("SparseMemory: width should be > 0")
+        self._size = size
+        self._width = width
+        self._limit = 1 << width
+        self._nrbytes = (width + 7) // 8
+        self._pagesize = pagesize
+        self._pagebits = pagesize.bit_length() - 1
+        self._typecode = _typecode(width)
+        # table that clears the unused bits of the top byte of a word
+        self._table = None
+        if width % 8:
+            mask = 0xff >> (8 - width % 8)
+            self._table = bytes(bytearray(b & mask for b in range(256)))
+        self._pages = {}
+        self._dirty = set()
+        self._sources = []
+        self._default = self._check(default)
+
+    def _check(self, val):
+        val = index(val)
+        if not 0 <= val < self._limit:
+            raise ValueError("SparseMemory: value %s does not fit %s bits" %
+                             (val, self._width))
+        return val
+
+    def _newPage(self, p):
+        """ Return page p, from the loaded files or with default words. """
+        n = self._pagesize
+        code = self._typecode
+        if code is None:
+            page = [self._default] * n
+        else:
+            page = array(code, [self._default]) * n
+        start = p << self._pagebits
+        for first, last, buf in self._sources:
+            lo = max(start, first)
+            hi = min(start + n, last)
+            if lo < hi:
+                nb = self._nrbytes
+                data = buf[(lo - first) * nb:(hi - first) * nb]
+                page[lo - start:hi - start] = self._fromBytes(data)
+        return page
+
+    def _page(self, p):
+        page = self._pages.get(p)
+        if page is None:
+            page = self._pages[p] = self._newPage(p)
+        return page
+
+    def _fromBytes(self, data):
+        """ Return the little-endian words in data. """
+        code = self._typecode
+        nb = self._nrbytes
+        if code is not None:
+            words = array(code)
+            size = words.itemsize
+            if nb != size or self._table is not None:
+                # widen the words to the items of the array
+                buf = bytearray(len(data) // nb * size)
+                for i in range(nb - 1):
+                    buf[i::size] = data[i::nb]
+                top = data[nb - 1::nb]
+                if self._table is not None:
+                    top = top.translate(self._table)
+                buf[nb - 1::size] = top
+                data = buf
+            array_frombytes(words, bytes(data))
+            if _BIGENDIAN:
+                words.byteswap()
+            return words
+        mask = (1 << self._width) - 1
+        return [int(hexlify(data[i:i + nb][::-1]), 16) & mask
+                for i in range(0, len(data), nb)]
+
+    def _toBytes(self, words):
+        """ Return words as little-endian bytes. """
+        nb = self._nrbytes
+        if self._typecode is not None:
+            if _BIGENDIAN:
+                words = array(self._typecode, words)
+                words.byteswap()
+            data = array_tobytes(words)
+            size = words.itemsize
+            if nb != size:
+                # narrow the items of the array to the words
+                buf = bytearray(len(words) * nb)
+                for i in range(nb):
+                    buf[i::nb] = data[i::size]
+                data = bytes(buf)
+            return data
+        return b''.join(unhexlify('%0*x' % (2 * nb, w))[::-1] for w in words)
+
+    def _index(self, addr):
+        addr = index(addr)
+        if not 0 <= addr < self._size:
+            raise IndexError("SparseMemory address %s out of range" % addr)
+        return addr
+
+    # support for the 'size', 'width', 'pagesize' and 'dirty' attributes
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def pagesize(self):
+        return self._pagesize
+
+    @property
+    def dirty(self):
+        return sorted(self._dirty)
+
+    def clean(self):
+        """ Mark all pages as not written. """
+        self._dirty.clear()
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, addr):
+        if isinstance(addr, slice):
+            start, stop, step = addr.indices(self._size)
+            return [self[a] for a in range(start, stop, step)]
+        addr = index(addr)
+        if not 0 <= addr < self._size:
+            self._index(addr)
+        page = self._pages.get(addr >> self._pagebits)
+        if page is None:
+            # reads only allocate the pages of loaded files
+            for first, last, buf in self._sources:
+                if first <= addr < last:
+                    break
+            else:
+                return self._default
+            page = self._page(addr >> self._pagebits)
+        return page[addr & (self._pagesize - 1)]
+
+    def __setitem__(self, addr, val):
+        addr = index(addr)
+        if not 0 <= addr < self._size:
+            self._index(addr)
+        val = index(val)
+        if not 0 <= val < self._limit:
+            self._check(val)
+        p = addr >> self._pagebits
+        page = self._pages.get(p)
+        if page is None:
+            page = self._page(p)
+        page[addr & (self._pagesize - 1)] = val
+        self._dirty.add(p)
+
+    def load(self, filename, addr=0, format=None):
+        """ Load the words of a file, and return the number of words.
+
+        filename -- the name of the file
+        addr -- the address of the first word
+        format -- 'bin' for little-endian binary words, or 'hex' for
+                  hexadecimal words as read by $readmemh, with @addresses
+                  relative to addr. By default, files ending with .hex
+                  or .mem are hexadecimal.
+
+        Binary files are memory-mapped, and pages are only read from them
+        when they are accessed.
+
+        """
+        if _isHexFile(filename, format):
+            return self._loadHex(filename, addr)
+        with open(filename, 'rb') as f:
+            try:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, EnvironmentError):
+                # empty files, and files that cannot be mapped
+                buf = f.read()
+        n = len(buf) // self._nrbytes
+        if n == 0:
+            return 0
+        first = self._index(addr)
+        last = first + n
+        if last > self._size:
+            raise IndexError("SparseMemory: %s words at address %s do not "
+                             "fit" % (n, first))
+        self._sources.append((first, last, buf))
+        # pages in use are updated now
+        shift = self._pagebits
+        for p in range(first >> shift, ((last - 1) >> shift) + 1):
+            page = self._pages.get(p)
+            if page is not None:
+                start = max(first, p << shift)
+                stop = min(last, (p + 1) << shift)
+                nb = self._nrbytes
+                data = buf[(start - first) * nb:(stop - first) * nb]
+                offset = p << shift
+                page[start - offset:stop - offset] = self._fromBytes(data)
+                self._dirty.add(p)
+        return n
+
+    def _loadHex(self, filename, addr):
+        a = addr
+        n = 0
+        with open(filename) as f:
+            for line in f:
+                line = line.split('//', 1)[0]
+                for word in line.split():
+                    if word.startswith('@'):
+                        a = addr + int(word[1:], 16)
+                    else:
+                        self[a] = int(word.replace('_', ''), 16)
+                        a += 1
+                        n += 1
+        return n
+
+    def dump(self, filename, start=0, stop=None, format=None):
+        """ Write the words from start to stop to a file.
+
+        The format is as for load. A hexadecimal file only holds the pages
+        that were accessed or loaded, each preceded by its @address.
+
+        """
+        if stop is None:
+            stop = self._size
+        shift = self._pagebits
+        if _isHexFile(filename, format):
+            pages = set(self._pages)
+            for first, last, buf in self._sources:
+                pages.update(range(first >> shift, ((last - 1) >> shift) + 1))
+            digits = (self._width + 3) // 4
+            with open(filename, 'w') as f:
+                for p in sorted(pages):
+                    lo = max(start, p << shift)
+                    hi = min(stop, (p + 1) << shift)
+                    if lo >= hi:
+                        continue
+                    words = self._words(p)[lo - (p << shift):
+                                            hi - (p << shift)]
+                    f.write('@%x\n' % lo)
+                    f.write(''.join('%0*x\n' % (digits, w) for w in words))
+            return
+        with open(filename, 'wb') as f:
+            for p in range(start >> shift, ((stop - 1) >> shift) + 1):
+                lo = max(start, p << shift)
+                hi = min(stop, (p + 1) << shift)
+                words = self._words(p)[lo - (p << shift):hi - (p << shift)]
+                f.write(self._toBytes(words))
+
+    def close(self):
+        """ Close the memory-mapped files.
+
+        The pages of the files that were not accessed can no longer be
+        read. A memory is also closed at the end of a with statement,
+        and when it is discarded.
+
+        """
+        for first, last, buf in self._sources:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __del__(self):
+        # the construction may have failed
+        if hasattr(self, '_sources'):
+            self.close()
+
+    def _words(self, p):
+        """ Return the words of page p, without allocating it. """
+        page = self._pages.get(p)
+        if page is None:
+            page = self._newPage(p)
+        return page
+
+    def __repr__(self):
+        return "SparseMemory(%s, width=%s, pagesize=%s)" % (
+            self._size, self._width, self._pagesize)
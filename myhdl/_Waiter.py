@@ -25,17 +25,16 @@ from types import GeneratorType
 
 import ast
 import inspect
+import threading
 
 
 from myhdl._util import _dedent
 from myhdl._delay import delay
 from myhdl._join import join
-from myhdl._Signal import _Signal, _WaiterList, posedge, negedge
-from myhdl import _simulator
-from myhdl._simulator import _futureEvents
-
-
-schedule = _futureEvents.append
+from myhdl._Signal import _Signal, _WaiterList, _PosedgeWaiterList, \
+    posedge, negedge
+from myhdl._SignalArray import SignalArray
+from myhdl._simulator import _local
 
 
 class _Waiter(object):
@@ -91,14 +90,14 @@ class _Waiter(object):
                 clause.append(clone)
                 if nr > 1:
                     actives[id(clause)] = clause
-            elif isinstance(clause, _Signal):
+            elif isinstance(clause, (_Signal, SignalArray)):
                 wl = clause._eventWaiters
                 wl.append(clone)
                 if nr > 1:
                     actives[id(wl)] = wl
             elif isinstance(clause, delay):
-                t = _simulator._time
-                schedule((t + clause._time, clone))
+                ctx = _local.context
+                ctx.futureEvents.append((ctx.time + clause._time, clone))
             elif isinstance(clause, GeneratorType):
                 waiters.append(_Waiter(clause, clone))
             elif isinstance(clause, _Instantiator):
@@ -125,7 +124,8 @@ class _DelayWaiter(_Waiter):
 
     def next(self, waiters, actives, exc):
         clause = next(self.generator)
-        schedule((_simulator._time + clause._time, self))
+        ctx = _local.context
+        ctx.futureEvents.append((ctx.time + clause._time, self))
 
 
 class _EdgeWaiter(_Waiter):
@@ -193,6 +193,103 @@ class _SignalTupleWaiter(_Waiter):
             actives[id(wl)] = wl
 
 
+class _StaticWaiter(_Waiter):
+
+    """ Waiter that calls a function on a static sensitivity list.
+
+    The waiter subscribes to a signal or edge once, when it is first
+    resumed, and stays subscribed. Later resumptions call the function
+    directly, without resuming a generator.
+
+    """
+
+    __slots__ = ('func', 'sig', 'edge', 'initial', 'subscribed', 'hasRun')
+
+    def __init__(self, func, senslist, initial=False):
+        self.func = func
+        clause = senslist[0]
+        if isinstance(clause, (_Signal, SignalArray)):
+            self.sig, self.edge = clause, 0
+        elif isinstance(clause, _PosedgeWaiterList):
+            self.sig, self.edge = clause.sig, 1
+        else:
+            self.sig, self.edge = clause.sig, 2
+        self.initial = initial
+        self.subscribed = 0
+        self.hasRun = 0
+
+    def next(self, waiters, actives, exc):
+        if self.subscribed:
+            self.func()
+            return
+        if self.initial:
+            self.func()
+        self.sig._subscribe(self, self.edge)
+        self.subscribed = 1
+
+
+class _StaticTupleWaiter(_Waiter):
+
+    """ Waiter that calls a function on a static tuple of signals or edges.
+
+    The waiter subscribes to all of them. When several of them trigger
+    in the same delta cycle, the function is only called once.
+
+    """
+
+    __slots__ = ('func', 'clauses', 'initial', 'subscribed', 'delta',
+                 'hasRun')
+
+    def __init__(self, func, senslist, initial=False):
+        self.func = func
+        clauses = []
+        for clause in senslist:
+            if isinstance(clause, (_Signal, SignalArray)):
+                clauses.append((clause, 0))
+            elif isinstance(clause, _PosedgeWaiterList):
+                clauses.append((clause.sig, 1))
+            else:
+                clauses.append((clause.sig, 2))
+        self.clauses = clauses
+        self.initial = initial
+        self.subscribed = 0
+        self.delta = -1
+        self.hasRun = 0
+
+    def next(self, waiters, actives, exc):
+        if self.subscribed:
+            delta = _local.context.delta
+            if self.delta != delta:
+                self.delta = delta
+                self.func()
+            return
+        if self.initial:
+            self.func()
+        for sig, edge in self.clauses:
+            sig._subscribe(self, edge)
+        self.subscribed = 1
+
+
+class _StaticDelayWaiter(_Waiter):
+
+    """ Waiter that calls a function periodically. """
+
+    __slots__ = ('func', 'time', 'initial')
+
+    def __init__(self, func, senslist, initial=False):
+        self.func = func
+        self.time = senslist[0]._time
+        self.initial = initial
+
+    def next(self, waiters, actives, exc):
+        if self.initial:
+            self.func()
+        else:
+            self.initial = True
+        ctx = _local.context
+        ctx.futureEvents.append((ctx.time + self.time, self))
+
+
 #_kind = enum("SIGNAL_TUPLE", "EDGE_TUPLE", "SIGNAL", "EDGE", "DELAY", "UNDEFINED")
 class _kind(object):
     SIGNAL_TUPLE = 1
@@ -203,38 +300,92 @@ class _kind(object):
     UNDEFINED = 6
 
 
+# inference per code object: the parsed tree, the names in its yield
+# expressions, and the inferred kind per kinds of the bound objects
+_inferCache = {}
+# the trees are annotated when visited, by one thread at a time
+_inferLock = threading.Lock()
+
+
+def _inferKind(f):
+    """ Return the kind of the yield expressions of a generator frame.
+
+    The source is parsed once per code object. Only the kinds of the
+    objects bound to the names in the yield expressions depend on the
+    generator, and the tree is visited again for new combinations only.
+
+    """
+    entry = _inferCache.get(f.f_code)
+    if entry is None:
+        s = inspect.getsource(f)
+        s = _dedent(s)
+        root = ast.parse(s)
+        # print ast.dump(root)
+        root.symdict = {}
+        v = _YieldVisitor(root)
+        v.visit(root)
+        entry = _inferCache[f.f_code] = (root, sorted(v.names), {})
+    root, names, kinds = entry
+    f_locals = f.f_locals
+    f_globals = f.f_globals
+    symdict = {}
+    for n in names:
+        if n in f_locals:
+            symdict[n] = f_locals[n]
+        elif n in f_globals:
+            symdict[n] = f_globals[n]
+    key = tuple(_objKind(symdict[n]) if n in symdict else _kind.UNDEFINED
+                for n in names)
+    if key not in kinds:
+        with _inferLock:
+            root.symdict = symdict
+            v = _YieldVisitor(root)
+            v.visit(root)
+            root.symdict = {}
+        kinds[key] = v.kind
+    return kinds[key]
+
+
 def _inferWaiter(gen):
-    f = gen.gi_frame
-    s = inspect.getsource(f)
-    s = _dedent(s)
-    root = ast.parse(s)
-    root.symdict = f.f_globals.copy()
-    root.symdict.update(f.f_locals)
-    # print ast.dump(root)
-    v = _YieldVisitor(root)
-    v.visit(root)
-    if v.kind == _kind.EDGE_TUPLE:
+    kind = _inferKind(gen.gi_frame)
+    if kind == _kind.EDGE_TUPLE:
         return _EdgeTupleWaiter(gen)
-    if v.kind == _kind.SIGNAL_TUPLE:
+    if kind == _kind.SIGNAL_TUPLE:
         return _SignalTupleWaiter(gen)
-    if v.kind == _kind.DELAY:
+    if kind == _kind.DELAY:
         return _DelayWaiter(gen)
-    if v.kind == _kind.EDGE:
+    if kind == _kind.EDGE:
         return _EdgeWaiter(gen)
-    if v.kind == _kind.SIGNAL:
+    if kind == _kind.SIGNAL:
         return _SignalWaiter(gen)
     # default
     return _Waiter(gen)
 
 
+def _objKind(obj):
+    """ Return the kind of a name bound to obj in a yield expression. """
+    if isinstance(obj, (_Signal, SignalArray)):
+        return _kind.SIGNAL
+    if obj is delay:
+        return _kind.DELAY
+    if obj is posedge or obj is negedge:
+        return _kind.EDGE
+    return _kind.UNDEFINED
+
+
 class _YieldVisitor(ast.NodeVisitor):
 
     def __init__(self, root):
         self.kind = None
         self.root = root
+        # the names in yield expressions
+        self.names = set()
+        self.inYield = False
 
     def visit_Yield(self, node):
+        self.inYield = True
         self.visit(node.value)
+        self.inYield = False
         if not hasattr(node.value, 'kind'):
             self.kind = _kind.UNDEFINED
         elif not self.kind:
@@ -269,15 +420,11 @@ class _YieldVisitor(ast.NodeVisitor):
 
     def visit_Name(self, node):
         n = node.id
+        if self.inYield:
+            self.names.add(n)
         node.kind = _kind.UNDEFINED
         if n in self.root.symdict:
-            obj = self.root.symdict[n]
-            if isinstance(obj, _Signal):
-                node.kind = _kind.SIGNAL
-            elif obj is delay:
-                node.kind = _kind.DELAY
-            elif obj is posedge or obj is negedge:
-                node.kind = _kind.EDGE
+            node.kind = _objKind(self.root.symdict[n])
 
     def visit_Attribute(self, node):
         node.kind = _kind.UNDEFINED
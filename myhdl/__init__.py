@@ -52,6 +52,9 @@ toVerilog -- function that converts a design to Verilog
 from __future__ import absolute_import
 from __future__ import print_function
 
+import importlib
+import sys
+
 __version__ = "0.11"
 __imec__ = True
 
@@ -150,8 +153,11 @@ from ._concat import concat
 from ._intbv import intbv
 from ._fixbv import fixbv
 from ._modbv import modbv
+from ._bvarray import intbvarray, fixbvarray
 from ._join import join
 from ._Signal import posedge, negedge, Signal, SignalType
+from ._SignalArray import SignalArray
+from ._SparseMemory import SparseMemory
 from ._ShadowSignal import ConcatSignal
 from ._ShadowSignal import TristateSignal
 from ._simulator import now
@@ -161,29 +167,61 @@ from ._Simulation import Simulation
 from ._misc import instances, downrange
 from ._always_comb import always_comb
 from ._always_seq import always_seq, ResetSignal
+from ._Clock import Clock
 from ._always import always
 from ._instance import instance
+from ._drive import drive
+from ._record import record
 from ._block import block
+from ._elabprofiler import profile_elaboration
 from ._enum import enum, EnumType, EnumItemType
-from ._traceSignals import traceSignals
-
-from myhdl import conversion
-from .conversion import toVerilog
-from .conversion import toVHDL
 
 from ._tristate import Tristate
 
+# The tracing and conversion subsystems are imported when they are
+# first used, so that simulations do not pay for their import.
+_lazy = {'traceSignals': ('myhdl._traceSignals', 'traceSignals'),
+         'conversion': ('myhdl.conversion', None),
+         'toVerilog': ('myhdl.conversion', 'toVerilog'),
+         'toVHDL': ('myhdl.conversion', 'toVHDL')}
+
+
+def __getattr__(name):
+    if name not in _lazy:
+        raise AttributeError("module 'myhdl' has no attribute %r" % name)
+    modname, attr = _lazy[name]
+    obj = importlib.import_module(modname)
+    if attr is not None:
+        obj = getattr(obj, attr)
+    globals()[name] = obj
+    return obj
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy))
+
+
+if sys.version_info < (3, 7):
+    # modules have no __getattr__ before Python 3.7
+    for _name in _lazy:
+        __getattr__(_name)
+    del _name
+
 
 __all__ = ["bin",
            "concat",
            "intbv",
            "fixbv",
            "modbv",
+           "intbvarray",
+           "fixbvarray",
            "join",
            "posedge",
            "negedge",
            "Signal",
            "SignalType",
+           "SignalArray",
+           "SparseMemory",
            "ConcatSignal",
            "TristateSignal",
            "now",
@@ -194,10 +232,14 @@ __all__ = ["bin",
            "Simulation",
            "instances",
            "instance",
+           "drive",
+           "record",
            "block",
+           "profile_elaboration",
            "always_comb",
            "always_seq",
            "ResetSignal",
+           "Clock",
            "always",
            "enum",
            "EnumType",
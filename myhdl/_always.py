@@ -28,8 +28,9 @@ from myhdl._util import _isGenFunc
 from myhdl._delay import delay
 from myhdl._Signal import _Signal
 from myhdl._Signal import _WaiterList
-from myhdl._Waiter import _Waiter, _SignalWaiter, _SignalTupleWaiter, \
-    _DelayWaiter, _EdgeWaiter, _EdgeTupleWaiter
+from myhdl._SignalArray import SignalArray
+from myhdl._Waiter import _Waiter, _StaticWaiter, _StaticTupleWaiter, \
+    _StaticDelayWaiter
 from myhdl._instance import _Instantiator, _getCallInfo
 
 
@@ -71,7 +72,7 @@ def always(*args):
             arg.sig._read = True
             arg.sig._used = True
             sigargs.append(arg.sig)
-        elif not isinstance(arg, delay):
+        elif not isinstance(arg, (SignalArray, delay)):
             raise AlwaysError(_error.DecArgType)
     sigdict = _get_sigdict(sigargs, callinfo.symdict)
 
@@ -100,30 +101,38 @@ class _Always(_Instantiator):
     def funcobj(self):
         return self.func
 
+    @property
+    def procfunc(self):
+        """ Function to call when the sensitivity list triggers. """
+        return self.func
+
+    @property
+    def waiter(self):
+        w = self._waiter()
+        if w is _Waiter:
+            return w(self.gen)
+        return w(self.procfunc, self.senslist)
+
     def _waiter(self):
         # infer appropriate waiter class
         # first infer base type of arguments
-        for t in (_Signal, _WaiterList, delay):
+        for t in ((_Signal, SignalArray), _WaiterList, delay):
             if isinstance(self.senslist[0], t):
                 bt = t
         for s in self.senslist[1:]:
             if not isinstance(s, bt):
                 bt = None
                 break
-        # now set waiter class
+        # now set waiter class; static sensitivity lists don't need
+        # a generator, except when they are mixed
         w = _Waiter
         if bt is delay:
-            w = _DelayWaiter
-        elif len(self.senslist) == 1:
-            if bt is _Signal:
-                w = _SignalWaiter
-            elif bt is _WaiterList:
-                w = _EdgeWaiter
-        else:
-            if bt is _Signal:
-                w = _SignalTupleWaiter
-            elif bt is _WaiterList:
-                w = _EdgeTupleWaiter
+            w = _StaticDelayWaiter
+        elif bt is not None:
+            if len(self.senslist) == 1:
+                w = _StaticWaiter
+            else:
+                w = _StaticTupleWaiter
         return w
 
     def genfunc(self):
@@ -24,6 +24,7 @@ from types import FunctionType
 
 from myhdl import AlwaysCombError
 from myhdl._Signal import _Signal, _isListOfSigs
+from myhdl._SignalArray import SignalArray
 from myhdl._util import _isGenFunc
 from myhdl._instance import _getCallInfo
 from myhdl._always import _Always
@@ -66,7 +67,7 @@ class _AlwaysComb(_Always):
 
         for n in self.inputs:
             s = self.symdict[n]
-            if isinstance(s, _Signal):
+            if isinstance(s, (_Signal, SignalArray)):
                 senslist.append(s)
             elif _isListOfSigs(s):
                 senslist.extend(s)
@@ -74,6 +75,11 @@ class _AlwaysComb(_Always):
         if len(self.senslist) == 0:
             raise AlwaysCombError(_error.EmptySensitivityList)
 
+    @property
+    def waiter(self):
+        # the function is called before the inputs are waited for
+        return self._waiter()(self.func, self.senslist, initial=True)
+
     def genfunc(self):
         senslist = self.senslist
         if len(senslist) == 1:
@@ -26,6 +26,7 @@ from types import FunctionType
 from myhdl import AlwaysError, intbv
 from myhdl._util import _isGenFunc
 from myhdl._Signal import _Signal, _WaiterList, _isListOfSigs
+from myhdl._SignalArray import SignalArray
 from myhdl._always import _Always, _get_sigdict
 from myhdl._instance import _getCallInfo
 
@@ -111,12 +112,15 @@ class _AlwaysSeq(_Always):
 
         sigregs = self.sigregs = []
         varregs = self.varregs = []
+        memregs = self.memregs = []
         for n in self.outputs:
             reg = self.symdict[n]
             if isinstance(reg, _Signal):
                 sigregs.append(reg)
             elif isinstance(reg, intbv):
                 varregs.append((n, reg, int(reg)))
+            elif isinstance(reg, SignalArray):
+                memregs.append(reg)
             else:
                 assert _isListOfSigs(reg)
                 for e in reg:
@@ -125,6 +129,8 @@ class _AlwaysSeq(_Always):
     def reset_sigs(self):
         for s in self.sigregs:
             s.next = s._init
+        for m in self.memregs:
+            m._reset()
 
     def reset_vars(self):
         for v in self.varregs:
@@ -132,6 +138,19 @@ class _AlwaysSeq(_Always):
             _, reg, init = v
             reg._val = init
 
+    @property
+    def procfunc(self):
+        if self.reset is not None:
+            return self.func_reset
+        return self.func
+
+    def func_reset(self):
+        if self.reset == self.reset.active:
+            self.reset_sigs()
+            self.reset_vars()
+        else:
+            self.func()
+
     def genfunc_reset(self):
         senslist = self.senslist
         if len(senslist) == 1:
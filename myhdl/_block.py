@@ -21,6 +21,7 @@
 from __future__ import absolute_import, print_function
 
 import inspect
+import sys
 
 #from functools import wraps
 import functools
@@ -28,12 +29,14 @@ import functools
 import myhdl
 from myhdl._compat import PY2
 from myhdl import BlockError, BlockInstanceError, Cosimulation
+from myhdl import _elabprofiler
 from myhdl._instance import _Instantiator
-from myhdl._util import _flatten
+from myhdl._util import _flatten, _frameSymdict
 from myhdl._extractHierarchy import (_makeMemInfo,
                                      _UserVerilogCode, _UserVhdlCode,
                                      _UserVerilogInstance, _UserVhdlInstance)
 from myhdl._Signal import _Signal, _isListOfSigs
+from myhdl._SignalArray import SignalArray
 
 from weakref import WeakValueDictionary
 
@@ -65,27 +68,20 @@ def _getCallInfo():
 
     """
 
-    stack = inspect.stack()
+    frame = sys._getframe(3)
     # caller may be undefined if instantiation from a Python module
-    callerrec = None
-    funcrec = stack[3]
-    name = funcrec[3]
-    if len(stack) > 4:
-        callerrec = stack[4]
+    caller = frame.f_back
     # special case for list comprehension's extra scope in PY3
-    if name == '<listcomp>':
+    if frame.f_code.co_name == '<listcomp>':
         if not PY2:
-            funcrec = stack[4]
-            if len(stack) > 5:
-                callerrec = stack[5]
-
-    name = funcrec[3]
-    frame = funcrec[0]
-    symdict = dict(frame.f_globals)
-    symdict.update(frame.f_locals)
+            frame = caller
+            caller = frame.f_back
+
+    name = frame.f_code.co_name
+    symdict = _frameSymdict(frame)
     modctxt = False
-    if callerrec is not None:
-        f_locals = callerrec[0].f_locals
+    if caller is not None:
+        f_locals = caller.f_locals
         if 'self' in f_locals:
             modctxt = isinstance(f_locals['self'], _Block)
     return _CallInfo(name, modctxt, symdict)
@@ -214,10 +210,15 @@ class _Block(object):
         self.memdict = {}
         self.name = self.__name__ = name
 
-        # flatten, but keep BlockInstance objects
-        self.subs = _flatten(func(*args, **kwargs))
-        self._verifySubs()
-        self._updateNamespaces()
+        profiler = _elabprofiler._profiler
+        if profiler is None:
+            self._elaborate(func, args, kwargs)
+        else:
+            profiler._enter(func)
+            try:
+                self._elaborate(func, args, kwargs)
+            finally:
+                profiler._exit()
         self.verilog_code = self.vhdl_code = None
         self.sim = None
         if hasattr(deco, 'verilog_code'):
@@ -234,6 +235,12 @@ class _Block(object):
                                                func, srcfile, srcline)
         self._config_sim = {'trace': False}
 
+    def _elaborate(self, func, args, kwargs):
+        # flatten, but keep BlockInstance objects
+        self.subs = _flatten(func(*args, **kwargs))
+        self._verifySubs()
+        self._updateNamespaces()
+
     def _verifySubs(self):
         for inst in self.subs:
             if not isinstance(inst, (_Block, _Instantiator, Cosimulation)):
@@ -270,7 +277,7 @@ class _Block(object):
                 self.sigdict[n] = v
                 if n in usedsigdict:
                     v._markUsed()
-            if _isListOfSigs(v):
+            if _isListOfSigs(v) or isinstance(v, SignalArray):
                 m = _makeMemInfo(v)
                 self.memdict[n] = m
                 if n in usedlosdict:
@@ -348,12 +355,12 @@ class _Block(object):
                 setattr(myhdl.traceSignals, k, v)
             myhdl.traceSignals(self)
 
-    def run_sim(self, duration=None, quiet=0):
+    def run_sim(self, duration=None, quiet=0, **kwargs):
         if self.sim is None:
             sim = self
             #if self._config_sim['trace']:
             #    sim = myhdl.traceSignals(self)
-            self.sim = myhdl._Simulation.Simulation(sim)
+            self.sim = myhdl._Simulation.Simulation(sim, **kwargs)
         self.sim.run(duration, quiet)
 
     def quit_sim(self):
@@ -0,0 +1,324 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module with the intbvarray and fixbvarray classes.
+
+The arrays hold intbv or fixbv values of one format, for the stimulus
+and the checking of testbenches. The values are kept as stored
+integers in a compact array, and converted in bulk. numpy arrays are
+converted with vectorized operations; numpy is not needed otherwise.
+
+"""
+from __future__ import absolute_import
+
+from array import array
+from math import floor, ldexp
+
+from myhdl._compat import integer_types, signed_typecodes
+from myhdl._intbv import intbv
+from myhdl._fixbv import (fixbv, _align, _checkModes, _format, _nrbitsOf,
+                          ROUND_HALF_UP, OVERFLOW_ERROR, OVERFLOW_SATURATE,
+                          OVERFLOW_WRAP)
+
+# the range of the stored integers that fit in a 64 bit array
+_LO, _HI = -2**63, 2**63
+
+# the 64 bit array typecode, or None if the interpreter has none
+_INT64 = None
+for _code in signed_typecodes:
+    if array(_code).itemsize == 8:
+        _INT64 = _code
+        break
+
+
+def _numpy(values):
+    """ Return the numpy module if values is a numpy array, else None. """
+    if type(values).__module__ == 'numpy':
+        import numpy
+        return numpy
+    return None
+
+
+def _fits(lo, hi):
+    return lo is not None and hi is not None and _LO <= lo and hi <= _HI
+
+
+def _floatBound(np, bound, direction):
+    """ Return the float nearest to bound, towards direction, or None.
+
+    The float is at or beyond the bound, so that float codes that are
+    clipped to it keep their side of the bound.
+
+    """
+    if bound is None:
+        return None
+    try:
+        f = float(bound)
+    except OverflowError:
+        # all finite floats are within the bound
+        return None
+    if (f - bound) * direction < 0:
+        f = np.nextafter(f, direction * np.inf)
+    return f
+
+
+class intbvarray(object):
+
+    """ Array of intbv values with the same bounds.
+
+    Indexing returns an intbv, slicing an intbvarray. The stored
+    integers are available in bulk through the codes attribute.
+
+    """
+
+    __slots__ = ('_codes', '_min', '_max', '_nrbits')
+
+    def __init__(self, values, min=None, max=None, overflow=OVERFLOW_ERROR):
+        """ Construct an array.
+
+        values -- sequence or numpy array of integers or intbv values
+        min, max -- the bounds of the values, as for intbv
+        overflow -- handling of values out of bounds: 'error',
+                    'saturate' or 'wrap'
+
+        """
+        _checkModes(ROUND_HALF_UP, overflow)
+        np = _numpy(values)
+        if np is not None and values.dtype.kind in 'iu':
+            codes = values
+        else:
+            codes = [v._val if isinstance(v, intbv) else int(v)
+                     for v in values]
+        self._setCodes(codes, min, max, overflow)
+
+    def _setCodes(self, codes, min, max, overflow):
+        self._min = min
+        self._max = max
+        self._nrbits = 0
+        if min is not None and max is not None:
+            self._nrbits = _nrbitsOf(min, max)
+        np = _numpy(codes)
+        if np is not None:
+            codes = self._handleBoundsArray(np, codes, overflow)
+            if _fits(min, max) or (len(codes) and codes.dtype.kind in 'iu'):
+                codes = codes.astype(np.int64)
+            else:
+                codes = codes.astype(object)
+        else:
+            codes = self._handleBoundsList(codes, overflow)
+            if _fits(min, max) and _INT64 is not None:
+                codes = array(_INT64, codes)
+        self._codes = codes
+
+    def _handleBoundsList(self, codes, overflow):
+        lo, hi = self._min, self._max
+        if overflow == OVERFLOW_SATURATE:
+            if hi is not None:
+                codes = [c if c < hi else hi - 1 for c in codes]
+            if lo is not None:
+                codes = [c if c >= lo else lo for c in codes]
+        elif overflow == OVERFLOW_WRAP:
+            if lo is not None and hi is not None:
+                n = hi - lo
+                codes = [c if lo <= c < hi else (c - lo) % n + lo
+                         for c in codes]
+        else:
+            for i, c in enumerate(codes):
+                if (hi is not None and c >= hi) or \
+                        (lo is not None and c < lo):
+                    self._raise(i, c)
+        return codes
+
+    def _handleBoundsArray(self, np, codes, overflow):
+        lo, hi = self._min, self._max
+        if overflow == OVERFLOW_SATURATE:
+            if hi is not None:
+                codes = np.minimum(codes, hi - 1)
+            if lo is not None:
+                codes = np.maximum(codes, lo)
+        elif overflow == OVERFLOW_WRAP:
+            if lo is not None and hi is not None:
+                codes = (codes - lo) % (hi - lo) + lo
+        else:
+            bad = np.zeros(len(codes), dtype=bool)
+            if hi is not None:
+                bad |= codes >= hi
+            if lo is not None:
+                bad |= codes < lo
+            if bad.any():
+                i = int(np.argmax(bad))
+                self._raise(i, codes[i])
+        return codes
+
+    def _raise(self, i, code):
+        if self._max is not None and code >= self._max:
+            raise ValueError("%s value %s at index %s >= maximum %s" %
+                             (type(self).__name__, code, i, self._max))
+        raise ValueError("%s value %s at index %s < minimum %s" %
+                         (type(self).__name__, code, i, self._min))
+
+    def _element(self, code):
+        return intbv(int(code), min=self._min, max=self._max)
+
+    def _copy(self, codes):
+        result = object.__new__(type(self))
+        result._codes = codes
+        result._min = self._min
+        result._max = self._max
+        result._nrbits = self._nrbits
+        return result
+
+    # support for the 'min', 'max' and 'codes' attributes
+    @property
+    def min(self):
+        return self._min
+
+    @property
+    def max(self):
+        return self._max
+
+    @property
+    def codes(self):
+        return self._codes
+
+    def tolist(self):
+        """ Return the stored integers as a list of ints. """
+        return [int(c) for c in self._codes]
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._copy(self._codes[key])
+        return self._element(self._codes[key])
+
+    def __iter__(self):
+        element = self._element
+        return (element(c) for c in self._codes)
+
+    def __repr__(self):
+        return "%s(%r, min=%r, max=%r)" % (type(self).__name__,
+                                           self.tolist(), self._min,
+                                           self._max)
+
+
+class fixbvarray(intbvarray):
+
+    """ Array of fixbv values with the same format.
+
+    Floats are quantized as by the fixbv constructor, and the result is
+    bit-exact with it. Integers are taken as stored integers.
+
+    """
+
+    __slots__ = ('_shift',)
+
+    def __init__(self, values, shift, min=None, max=None,
+                 rounding=ROUND_HALF_UP, overflow=OVERFLOW_ERROR):
+        """ Construct an array.
+
+        values -- sequence or numpy array of floats, integers, or fixbv
+                  values or signals
+        shift, min, max -- the format of the values, as for fixbv
+        rounding -- rounding of the bits that are shifted out: 'round'
+                    or 'floor'
+        overflow -- handling of values out of bounds: 'error',
+                    'saturate' or 'wrap'
+
+        """
+        _checkModes(rounding, overflow)
+        self._shift = shift
+        min, max, nrbits = _format(shift, min, max)
+        half = 0.5 if rounding == ROUND_HALF_UP else 0.0
+        np = _numpy(values)
+        if np is not None and values.dtype.kind == 'f':
+            codes = np.floor(np.ldexp(values, -shift) + half)
+            if not np.isfinite(codes).all():
+                raise ValueError("fixbvarray values should be finite")
+            if overflow == OVERFLOW_SATURATE and \
+                    (min is not None or max is not None):
+                # saturated values only need to stay beyond the bounds
+                codes = np.clip(codes, _floatBound(np, min, -1),
+                                _floatBound(np, max, 1))
+            if np.abs(codes).max(initial=0) < _HI:
+                # the bounds are checked on the integers
+                codes = codes.astype(np.int64)
+            else:
+                codes = np.array([int(c) for c in codes], dtype=object)
+        elif np is not None and values.dtype.kind in 'iu':
+            codes = values
+        else:
+            codes = []
+            for v in values:
+                if isinstance(v, float):
+                    codes.append(int(floor(ldexp(v, -shift) + half)))
+                elif isinstance(v, integer_types):
+                    codes.append(v)
+                else:
+                    val = v
+                    if not isinstance(v, (fixbv, intbv)):
+                        # a signal
+                        val = getattr(v, '_val', v)
+                    if isinstance(val, fixbv):
+                        codes.append(_align(val._val, val._shift, shift,
+                                            rounding))
+                    elif isinstance(val, intbv):
+                        codes.append(_align(val._val, 0, shift, rounding))
+                    else:
+                        codes.append(int(floor(ldexp(float(val), -shift) +
+                                               half)))
+        self._setCodes(codes, min, max, overflow)
+
+    def _element(self, code):
+        result = fixbv(int(code), self._shift)
+        result._min = self._min
+        result._max = self._max
+        result._nrbits = self._nrbits
+        return result
+
+    def _copy(self, codes):
+        result = intbvarray._copy(self, codes)
+        result._shift = self._shift
+        return result
+
+    # support for the 'shift' attribute
+    @property
+    def shift(self):
+        return self._shift
+
+    def tofloat(self):
+        """ Return the values as floats.
+
+        The result is a numpy array if the array holds a numpy array,
+        and a list otherwise.
+
+        """
+        codes = self._codes
+        shift = self._shift
+        np = _numpy(codes)
+        if np is not None:
+            if codes.dtype == object:
+                return np.array([ldexp(c, shift) for c in codes])
+            return np.ldexp(codes.astype(np.float64), shift)
+        return [ldexp(c, shift) for c in codes]
+
+    def __repr__(self):
+        return "fixbvarray(%r, %r, min=%r, max=%r)" % (
+            self.tolist(), self._shift, self._min, self._max)
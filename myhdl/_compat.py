@@ -5,12 +5,26 @@
 
 import sys
 import types
+from array import array as _array
 
 PY2 = sys.version_info[0] == 2
 PYPY = hasattr(sys, 'pypy_translation_info')
 
 _identity = lambda x: x
 
+
+def _accepts(typecode):
+    try:
+        _array(typecode)
+    except ValueError:
+        return False
+    return True
+
+# the array typecodes of the running interpreter, from small to large;
+# 'q' and 'Q' do not exist on Python 2
+signed_typecodes = tuple(c for c in 'bhilq' if _accepts(c))
+unsigned_typecodes = tuple(c for c in 'BHILQ' if _accepts(c))
+
 if not PY2:
     string_types = (str,)
     integer_types = (int,)
@@ -27,6 +41,12 @@ if not PY2:
     def to_str(b):
         return b.decode()
 
+    def array_frombytes(a, data):
+        a.frombytes(data)
+
+    def array_tobytes(a):
+        return a.tobytes()
+
 else:
     string_types = (str, unicode)
     integer_types = (int, long)
@@ -39,6 +59,12 @@ else:
     to_bytes = _identity
     to_str = _identity
 
+    def array_frombytes(a, data):
+        a.fromstring(data)
+
+    def array_tobytes(a):
+        return a.tostring()
+
     def set_inheritable(fd, inheritable):
         # This implementation of set_inheritable is based on a code sample in
         # [PEP 0446](https://www.python.org/dev/peps/pep-0446/) and on the
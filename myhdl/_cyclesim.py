@@ -0,0 +1,286 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module with the cycle-based simulation engine.
+
+The cycle-based engine runs designs that consist of always_seq,
+always_comb and always blocks only. Instead of resuming generators
+through waiter lists, it calls the decorated functions directly:
+timed always blocks (typically clock generators) at their period,
+sequential blocks once per active clock edge, and combinational
+blocks in a fixed, topological order until the design is settled.
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+from heapq import heapify, heappush, heappop
+
+from myhdl import StopSimulation, _SuspendSimulation, SimulationError
+from myhdl._delay import delay
+from myhdl._Clock import Clock, _findClocks
+from myhdl._Signal import _Signal, _WaiterList, _PosedgeWaiterList, \
+    _unchanged
+from myhdl._SignalArray import SignalArray
+from myhdl._always import _Always
+from myhdl._always_comb import _AlwaysComb
+from myhdl._always_seq import _AlwaysSeq
+from myhdl._levelize import _combNode, _shadowNode, _levelize
+
+
+class _error:
+    pass
+_error.ArgType = "cycle-based simulation only supports always, " \
+                 "always_seq and always_comb blocks"
+_error.SensList = "cycle-based simulation does not support mixed " \
+                  "sensitivity lists"
+_error.FutureEvent = "cycle-based simulation does not support delayed signals"
+_error.CombLoop = "combinational loop does not settle"
+
+_MAXITER = 1000
+
+
+class _CycleEngine(object):
+
+    """ Cycle-based simulation engine. """
+
+    def __init__(self, arglist, context, stats):
+        self._context = context
+        self._stats = stats
+        self._timed = []
+        self._seq = 0
+        self._edges = {}
+        nodes = []
+        # the nodes that are evaluated at the start, as in event mode
+        dirty = []
+        for arg in arglist:
+            if isinstance(arg, _AlwaysComb):
+                nodes.append(_combNode(arg))
+                dirty.append(True)
+            elif isinstance(arg, _AlwaysSeq):
+                for edge in arg.senslist:
+                    self._addEdge(edge, arg.procfunc)
+            elif isinstance(arg, _Always):
+                senslist = arg.senslist
+                if all(isinstance(s, delay) for s in senslist):
+                    if len(senslist) > 1:
+                        raise SimulationError(_error.SensList, arg.name)
+                    self._addTimed(senslist[0]._time, arg.func)
+                elif all(isinstance(s, _WaiterList) for s in senslist):
+                    for edge in senslist:
+                        self._addEdge(edge, arg.func)
+                elif all(isinstance(s, (_Signal, SignalArray))
+                         for s in senslist):
+                    nodes.append(_combNode(arg))
+                    dirty.append(False)
+                else:
+                    raise SimulationError(_error.SensList, arg.name)
+            elif arg is True or isinstance(arg, Clock):
+                pass
+            else:
+                name = getattr(arg, 'name', repr(arg))
+                raise SimulationError(_error.ArgType, name)
+        for sig in context.signals:
+            if hasattr(sig, '_waiter'):
+                nodes.append(_shadowNode(sig))
+                dirty.append(True)
+        for clk in _findClocks(arglist):
+            self._addClock(clk)
+        self._nodes = nodes
+        # per level: the acyclic nodes, and the loops
+        schedule = {}
+        for comp, level, loop in _levelize(nodes):
+            idxs, funcs, loops = schedule.setdefault(level, ([], [], []))
+            if loop:
+                loops.append((comp, [nodes[i].func for i in comp]))
+            else:
+                idxs.extend(comp)
+                funcs.extend(nodes[i].func for i in comp)
+        self._schedule = [schedule[level] for level in sorted(schedule)]
+        self._readers = readers = {}
+        for i, node in enumerate(nodes):
+            for s in node.inputs:
+                r = readers.setdefault(id(s), [])
+                if i not in r:
+                    r.append(i)
+        self._dirty = dirty
+        self._ndirty = sum(dirty)
+        self._started = False
+
+    def _instrument(self, wrap):
+        """ Replace the process functions by wrap(func). """
+        self._timed = [(t, seq, period, wrap(func))
+                       for t, seq, period, func in self._timed]
+        heapify(self._timed)
+        for procs in self._edges.values():
+            for funcs in procs:
+                funcs[:] = [wrap(func) for func in funcs]
+        for idxs, funcs, loops in self._schedule:
+            funcs[:] = [wrap(func) for func in funcs]
+            for comp, loopfuncs in loops:
+                loopfuncs[:] = [wrap(func) for func in loopfuncs]
+
+    def _addEdge(self, edge, func):
+        procs = self._edges.setdefault(id(edge.sig), ([], []))
+        if isinstance(edge, _PosedgeWaiterList):
+            procs[0].append(func)
+        else:
+            procs[1].append(func)
+
+    def _addTimed(self, period, func, start=None):
+        if start is None:
+            start = period
+        heappush(self._timed, (start, self._seq, period, func))
+        self._seq += 1
+        self._stats.scheduled += 1
+
+    def _addClock(self, clk):
+        def rise():
+            clk.next = True
+
+        def fall():
+            clk.next = False
+        self._addTimed(clk.period, rise, clk.phase)
+        self._addTimed(clk.period, fall, clk.phase + clk.high)
+
+    def _apply(self, triggered):
+        """ Update the signals, and collect the triggered edge processes. """
+        edges = self._edges
+        readers = self._readers
+        dirty = self._dirty
+        ctx = self._context
+        _siglist = ctx.siglist
+        updates = 0
+        for s in _siglist:
+            if s.__class__ is SignalArray:
+                # element signals of arrays are updated by the array
+                if s._update() is not _unchanged:
+                    updates += 1
+                    for i in readers.get(id(s), ()):
+                        if not dirty[i]:
+                            dirty[i] = True
+                            self._ndirty += 1
+                continue
+            s._pending = False
+            val, next = s._val, s._next
+            if val != next:
+                updates += 1
+                k = id(s)
+                if k in edges:
+                    procs = ()
+                    if not val and next:
+                        procs = edges[k][0]
+                    elif not next and val:
+                        procs = edges[k][1]
+                    for p in procs:
+                        if p not in triggered:
+                            triggered.append(p)
+                s._update()
+                if k in readers:
+                    for i in readers[k]:
+                        if not dirty[i]:
+                            dirty[i] = True
+                            self._ndirty += 1
+        del _siglist[:]
+        stats = self._stats
+        stats.deltas += 1
+        stats.updates += updates
+        if ctx.futureEvents:
+            raise SimulationError(_error.FutureEvent)
+
+    def _settleComb(self, triggered):
+        dirty = self._dirty
+        apply = self._apply
+        stats = self._stats
+        for idxs, funcs, loops in self._schedule:
+            if not self._ndirty:
+                break
+            active = False
+            for i, func in zip(idxs, funcs):
+                if dirty[i]:
+                    dirty[i] = False
+                    self._ndirty -= 1
+                    stats.resumed += 1
+                    active = True
+                    func()
+            if active:
+                apply(triggered)
+            for comp, funcs in loops:
+                n = 0
+                while 1:
+                    active = False
+                    for i, func in zip(comp, funcs):
+                        if dirty[i]:
+                            dirty[i] = False
+                            self._ndirty -= 1
+                            stats.resumed += 1
+                            active = True
+                            func()
+                            apply(triggered)
+                    if not active:
+                        break
+                    n += 1
+                    if n > _MAXITER:
+                        names = ", ".join(self._nodes[i].name for i in comp)
+                        raise SimulationError(_error.CombLoop, names)
+
+    def _settle(self):
+        triggered = []
+        self._apply(triggered)
+        n = 0
+        while triggered or self._ndirty:
+            while triggered:
+                funcs = triggered
+                triggered = []
+                self._stats.resumed += len(funcs)
+                for func in funcs:
+                    func()
+                self._apply(triggered)
+            self._settleComb(triggered)
+            n += 1
+            if n > _MAXITER:
+                raise SimulationError(_error.CombLoop)
+
+    def run(self, maxTime, tracing, tracefile):
+        if not self._started:
+            self._started = True
+            self._settle()
+        timed = self._timed
+        ctx = self._context
+        stats = self._stats
+        stats.peakEvents = max(stats.peakEvents, len(timed))
+        while 1:
+            if not timed:
+                raise StopSimulation("No more events")
+            t = timed[0][0]
+            if maxTime is not None and t > maxTime:
+                ctx.time = maxTime
+                raise _SuspendSimulation(
+                    "Simulated up to timestep %s" % maxTime)
+            ctx.time = t
+            stats.timesteps += 1
+            if tracing:
+                print("#%s" % t, file=tracefile)
+            while timed and timed[0][0] == t:
+                t, seq, period, func = heappop(timed)
+                heappush(timed, (t + period, seq, period, func))
+                stats.scheduled += 1
+                stats.resumed += 1
+                func()
+            self._settle()
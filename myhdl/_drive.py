@@ -0,0 +1,211 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module with the drive function.
+
+A driver assigns the values of a sequence to a signal, one value per
+trigger. The simulator applies the values itself, without resuming a
+generator, and the values are taken from the sequence as they are
+needed, so that a sequence can be streamed from a file.
+
+"""
+from __future__ import absolute_import
+
+from myhdl._delay import delay
+from myhdl._Signal import _Signal, _WaiterList, _PosedgeWaiterList
+from myhdl._Waiter import _Waiter
+from myhdl._instance import _Instantiator, _getCallInfo
+from myhdl._always import _get_sigdict
+from myhdl._bvarray import intbvarray, _numpy
+from myhdl._simulator import _local
+
+# the number of values that are converted at once from numpy arrays
+_CHUNK = 4096
+
+# returned by next when the values are exhausted
+_end = object()
+
+
+class _error:
+    pass
+_error.SigType = "drive: the driven object should be a Signal"
+_error.OnType = "drive: on should be a Signal, edge, or delay"
+
+
+def _stream(values):
+    """ Return an iterator over values, with numpy values as Python values.
+
+    Arrays of intbv and fixbv values yield their stored integers. numpy
+    arrays, including memory-mapped ones, are converted in chunks.
+
+    """
+    if isinstance(values, intbvarray):
+        values = values.codes
+    if _numpy(values) is None:
+        return iter(values)
+    return _chunks(values)
+
+
+def _chunks(values):
+    for i in range(0, len(values), _CHUNK):
+        for val in values[i:i + _CHUNK].tolist():
+            yield val
+
+
+def drive(sig, values, on):
+    """ Return a driver that assigns values to sig, one per trigger of on.
+
+    sig -- the driven signal
+    values -- a sequence or iterator of values
+    on -- the trigger: a signal, an edge, or a delay
+
+    The driver behaves as the generator:
+
+        for val in values:
+            sig.next = val
+            yield on
+
+    """
+    callinfo = _getCallInfo()
+    if not isinstance(sig, _Signal):
+        raise TypeError(_error.SigType)
+    if _trigger(on) is None:
+        raise TypeError(_error.OnType)
+    driver = _Driver(on, callinfo, outputs=[sig])
+    driver.sig = sig
+    driver.values = values
+    return driver
+
+
+def _trigger(on):
+    """ Return the signal and edge of a trigger, as subscribed to.
+
+    The edge is 0 for any change, 1 for a positive edge and 2 for a
+    negative edge. The signal is None for a delay. None is returned if
+    on is not a trigger.
+
+    """
+    if isinstance(on, _Signal):
+        return on, 0
+    if isinstance(on, _PosedgeWaiterList):
+        return on.sig, 1
+    if isinstance(on, _WaiterList):
+        return on.sig, 2
+    if isinstance(on, delay):
+        return None, 0
+    return None
+
+
+class _KernelInstance(_Instantiator):
+
+    """ Instance that is run by the simulator without a generator.
+
+    There is no source code to analyze: the signals that the instance
+    reads and writes are given.
+
+    """
+
+    def __init__(self, on, callinfo, inputs=(), outputs=()):
+        self.callinfo = callinfo
+        self.callername = callinfo.name
+        self.modctxt = callinfo.modctxt
+        self.senslist = (on,)
+        self.symdict = {}
+        sigargs = list(inputs) + list(outputs)
+        trigger = _trigger(on)[0]
+        if trigger is not None:
+            sigargs.append(trigger)
+        self.sigdict = _get_sigdict(sigargs, callinfo.symdict)
+        self.inputs = self._names(inputs)
+        self.outputs = self._names(outputs)
+        self.inouts = set()
+        self.embedded_func = None
+        self.losdict = {}
+
+    def _names(self, sigs):
+        # signals compare by value, so they are looked up by identity
+        return set(n for n, s in self.sigdict.items()
+                   if any(s is t for t in sigs))
+
+
+class _Driver(_KernelInstance):
+
+    """ Instance that drives a signal from a sequence. """
+
+    @property
+    def name(self):
+        return 'drive'
+
+    @property
+    def waiter(self):
+        on = self.senslist[0]
+        if isinstance(on, delay):
+            return _DriveDelayWaiter(self.sig, self.values, on)
+        return _DriveWaiter(self.sig, self.values, on)
+
+
+class _DriveWaiter(_Waiter):
+
+    """ Waiter that assigns the next value on a signal or edge.
+
+    The first value is assigned when the simulation starts. The waiter
+    then subscribes to the trigger, until the values are exhausted.
+
+    """
+
+    __slots__ = ('sig', 'values', 'trigger', 'edge', 'subscribed', 'hasRun')
+
+    def __init__(self, sig, values, on):
+        self.sig = sig
+        self.values = _stream(values)
+        self.trigger, self.edge = _trigger(on)
+        self.subscribed = 0
+        self.hasRun = 0
+
+    def next(self, waiters, actives, exc):
+        val = next(self.values, _end)
+        if val is _end:
+            if self.subscribed:
+                self.trigger._statics[self.edge].remove(self)
+                self.subscribed = 0
+            return
+        self.sig.next = val
+        if not self.subscribed:
+            self.trigger._subscribe(self, self.edge)
+            self.subscribed = 1
+
+
+class _DriveDelayWaiter(_Waiter):
+
+    """ Waiter that assigns the next value periodically. """
+
+    __slots__ = ('sig', 'values', 'time')
+
+    def __init__(self, sig, values, on):
+        self.sig = sig
+        self.values = _stream(values)
+        self.time = on._time
+
+    def next(self, waiters, actives, exc):
+        val = next(self.values, _end)
+        if val is _end:
+            return
+        self.sig.next = val
+        ctx = _local.context
+        ctx.futureEvents.append((ctx.time + self.time, self))
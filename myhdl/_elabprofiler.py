@@ -0,0 +1,243 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module with the elaboration profiler.
+
+The profiler records, per block function and per hierarchy path, the
+number of block instances and the wall-clock time spent in the user
+code of the block functions and in the bookkeeping of the block
+instances. The bookkeeping functions are wrapped while a profiler is
+active, so that elaboration without profiler runs unchanged.
+
+Setting the environment variable MYHDL_PROFILE_ELABORATION profiles the
+elaboration of the whole program, and prints the profile at exit.
+
+"""
+from __future__ import absolute_import, print_function
+
+import atexit
+import functools
+import json
+import os
+import sys
+from contextlib import contextmanager
+from timeit import default_timer as _timer
+
+# the time categories of a block, in report order
+_CATEGORIES = ('user', 'instances', 'verify', 'namespaces', 'meminfo')
+
+# the active profiler
+_profiler = None
+
+# the wrapped bookkeeping functions: (owner, name, original)
+_patches = []
+
+
+class _BlockStats(object):
+
+    """ Profile of a block function or of a hierarchy path. """
+
+    __slots__ = ('name', 'count') + _CATEGORIES
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        for c in _CATEGORIES:
+            setattr(self, c, 0.0)
+
+    @property
+    def time(self):
+        return sum(getattr(self, c) for c in _CATEGORIES)
+
+
+def _stats(table, name):
+    stats = table.get(name)
+    if stats is None:
+        stats = table[name] = _BlockStats(name)
+    return stats
+
+
+def _timed(func, category):
+    """ Return func, timed in category when a block is elaborated. """
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        profiler = _profiler
+        if profiler is None or not profiler._stack:
+            return func(*args, **kwargs)
+        profiler._begin(category)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler._end()
+    return timed
+
+
+def _patch():
+    from myhdl import _block
+    from myhdl._instance import _Instantiator
+    for owner, name, category in ((_block._Block, '_verifySubs', 'verify'),
+                                  (_block._Block, '_updateNamespaces',
+                                   'namespaces'),
+                                  (_block, '_makeMemInfo', 'meminfo'),
+                                  (_Instantiator, '__init__', 'instances')):
+        func = owner.__dict__[name]
+        _patches.append((owner, name, func))
+        setattr(owner, name, _timed(func, category))
+
+
+def _unpatch():
+    while _patches:
+        owner, name, func = _patches.pop()
+        setattr(owner, name, func)
+
+
+class _ElabProfiler(object):
+
+    """ Per-block profiler of an elaboration.
+
+    Blocks are named after their function, and hierarchy paths join the
+    names of the enclosing blocks with '/'. The time of a block excludes
+    the time of its subblocks:
+    user -- the time in the block function
+    instances -- the analysis of the instances, by _Instantiator
+    verify -- the verification of the subs, by _verifySubs
+    namespaces -- the namespaces of the block, by _updateNamespaces
+    meminfo -- the memories of the block, by _makeMemInfo
+
+    """
+
+    def __init__(self):
+        self._funcs = {}
+        self._paths = {}
+        # per elaboration in progress: [stats, start, time of children]
+        self._stack = []
+
+    def _enter(self, func):
+        """ Start the elaboration of a block of func. """
+        if not _patches:
+            _patch()
+        name = getattr(func, '__qualname__', func.__name__)
+        parent = self._block()
+        path = name if parent is None else parent[1].name + '/' + name
+        stats = (_stats(self._funcs, name), _stats(self._paths, path))
+        for s in stats:
+            s.count += 1
+        self._stack.append([stats, _timer(), 0.0])
+
+    def _block(self):
+        """ Return the stats of the block in elaboration, or None. """
+        for frame in reversed(self._stack):
+            if not isinstance(frame[0], str):
+                return frame[0]
+        return None
+
+    def _exit(self):
+        """ End the elaboration of the current block. """
+        self._end('user')
+
+    def _begin(self, category):
+        self._stack.append([category, _timer(), 0.0])
+
+    def _end(self, category=None):
+        stack = self._stack
+        target, start, children = stack.pop()
+        elapsed = _timer() - start
+        if category is None:
+            category = target
+            target = self._block()
+        for s in target:
+            setattr(s, category, getattr(s, category) + elapsed - children)
+        if stack:
+            stack[-1][2] += elapsed
+
+    def results(self, by='func'):
+        """ Return the profile as a list of dicts, slowest first.
+
+        by -- 'func' to aggregate by block function, or 'path' to
+              aggregate by hierarchy path
+
+        """
+        if by == 'func':
+            table = self._funcs
+        elif by == 'path':
+            table = self._paths
+        else:
+            raise ValueError("profile_elaboration: by should be 'func' or 'path'")
+        stats = sorted(table.values(), key=lambda s: (-s.time, s.name))
+        results = []
+        for s in stats:
+            r = {'name': s.name, 'count': s.count, 'time': s.time}
+            for c in _CATEGORIES:
+                r[c] = getattr(s, c)
+            results.append(r)
+        return results
+
+    def table(self, by='func'):
+        """ Return the profile as a text table. """
+        results = self.results(by)
+        width = max([len(r['name']) for r in results] + [len(by)])
+        fmt = "%%-%ds  %%8s" % width + "  %10s" * (len(_CATEGORIES) + 1)
+        lines = [fmt % ((by, 'count', 'time [s]') + _CATEGORIES)]
+        for r in results:
+            lines.append(fmt % ((r['name'], r['count'], "%.6f" % r['time']) +
+                                tuple("%.6f" % r[c] for c in _CATEGORIES)))
+        return "\n".join(lines)
+
+    def json(self, by='func', **kwargs):
+        """ Return the profile as a JSON string.
+
+        Keyword arguments are passed to json.dumps.
+
+        """
+        return json.dumps(self.results(by), **kwargs)
+
+
+@contextmanager
+def profile_elaboration():
+    """ Profile the elaboration of the blocks in a with statement.
+
+    The context manager returns the profiler:
+
+        with profile_elaboration() as profiler:
+            inst = top()
+        print(profiler.table())
+
+    """
+    global _profiler
+    profiler = _ElabProfiler()
+    previous = _profiler
+    _profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _profiler = previous
+        if previous is None:
+            _unpatch()
+
+
+def _report(profiler):
+    if profiler._funcs:
+        for by in ('func', 'path'):
+            print(profiler.table(by), file=sys.stderr)
+            print(file=sys.stderr)
+
+
+if os.environ.get('MYHDL_PROFILE_ELABORATION', '0') not in ('', '0'):
+    _profiler = _ElabProfiler()
+    atexit.register(_report, _profiler)
@@ -29,6 +29,7 @@ import string
 
 from myhdl import ExtractHierarchyError, ToVerilogError, ToVHDLError
 from myhdl._Signal import _Signal, _isListOfSigs
+from myhdl._SignalArray import SignalArray
 from myhdl._util import _flatten
 from myhdl._util import _genfunc
 from myhdl._misc import _isGenSeq
@@ -61,17 +62,27 @@ _memInfoMap = {}
 
 
 class _MemInfo(object):
-    __slots__ = ['mem', 'name', 'elObj', 'depth', '_used', '_driven', '_read']
+    __slots__ = ['_mem', 'name', 'elObj', 'depth', '_used', '_driven', '_read']
 
     def __init__(self, mem):
-        self.mem = mem
+        self._mem = mem
         self.name = None
         self.depth = len(mem)
-        self.elObj = mem[0]
+        if isinstance(mem, SignalArray):
+            self.elObj = mem._view(0)
+        else:
+            self.elObj = mem[0]
         self._used = False
         self._driven = None
         self._read = None
 
+    @property
+    def mem(self):
+        # the signals of a SignalArray are only created when needed
+        if isinstance(self._mem, SignalArray):
+            self._mem = list(self._mem)
+        return self._mem
+
 
 def _getMemInfo(mem):
     return _memInfoMap[id(mem)]
@@ -354,7 +365,7 @@ class _HierExtr(object):
                             sigdict[n] = v
                             if n in cellvars:
                                 v._markUsed()
-                        if _isListOfSigs(v):
+                        if _isListOfSigs(v) or isinstance(v, SignalArray):
                             m = _makeMemInfo(v)
                             memdict[n] = m
                             if n in cellvars:
@@ -17,67 +17,164 @@
 #  License along with this library; if not, write to the Free Software
 #  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
 
-""" Module with the intbv class """
+""" Module with the fixbv class """
 from __future__ import absolute_import, division
-from math import floor
+from math import floor, ldexp
 import operator
 
 from myhdl._compat import long, integer_types, string_types, builtins
 from myhdl._bin import bin
 from myhdl._intbv import intbv
 
+# rounding modes, for the bits that are shifted out
+ROUND_FLOOR = 'floor'   # towards minus infinity: drop the bits
+ROUND_HALF_UP = 'round' # to the nearest grid point, halves upwards
+_roundings = (ROUND_FLOOR, ROUND_HALF_UP)
+
+# overflow modes, for values outside [min, max)
+OVERFLOW_ERROR = 'error'
+OVERFLOW_SATURATE = 'saturate'
+OVERFLOW_WRAP = 'wrap'
+_overflows = (OVERFLOW_ERROR, OVERFLOW_SATURATE, OVERFLOW_WRAP)
+
+
+def _checkModes(rounding, overflow):
+    if rounding not in _roundings:
+        raise ValueError("fixbv rounding should be one of %s" %
+                         (_roundings,))
+    if overflow not in _overflows:
+        raise ValueError("fixbv overflow should be one of %s" %
+                         (_overflows,))
+
+
+def _round(x):
+    """ Return the float x rounded to the nearest integer, halves upwards. """
+    return int(floor(x + 0.5))
+
+
+def _align(val, shift, to, rounding=ROUND_HALF_UP):
+    """ Return the stored integer val at shift, moved to shift to. """
+    if shift >= to:
+        return val << (shift - to)
+    n = to - shift
+    if rounding == ROUND_HALF_UP:
+        return (val + (long(1) << (n - 1))) >> n
+    return val >> n
+
+
+def _nrbitsOf(min, max):
+    if min >= 0:
+        return len(bin(max - 1))
+    elif max <= 1:
+        return len(bin(min))
+    else:
+        # make sure there is a leading zero bit in positive numbers
+        return builtins.max(len(bin(max - 1)) + 1, len(bin(min)))
+
+
+# the stored integer bounds and the bit width per (shift, min, max) format
+_formats = {}
+
+
+def _format(shift, min, max):
+    """ Return the stored integer bounds and width of a format. """
+    key = (shift, min, max)
+    try:
+        return _formats[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # unhashable bounds, such as intbv objects
+        key = None
+    if isinstance(min, float):
+        min = _round(ldexp(min, -shift))
+    if isinstance(max, float):
+        max = _round(ldexp(max, -shift))
+    nrbits = 0
+    if max is not None and min is not None:
+        nrbits = _nrbitsOf(min, max)
+    fmt = (min, max, nrbits)
+    if key is not None:
+        _formats[key] = fmt
+    return fmt
+
+
+def _parts(other):
+    """ Return the stored integer and shift of other, or None.
+
+    other can be a fixbv, an intbv, an integer, or a signal with such a
+    value. Floats have no exact stored integer.
+
+    """
+    if isinstance(other, fixbv):
+        return other._val, other._shift
+    if isinstance(other, intbv):
+        return other._val, 0
+    if isinstance(other, integer_types):
+        return other, 0
+    val = getattr(other, '_val', None)
+    if isinstance(val, fixbv):
+        return val._val, val._shift
+    if isinstance(val, intbv):
+        return val._val, 0
+    return None
+
+
+def _new(val, shift):
+    """ Return an unbounded fixbv, without the checks of the constructor. """
+    result = object.__new__(fixbv)
+    result._val = val
+    result._shift = shift
+    result._min = result._max = None
+    result._nrbits = 0
+    return result
+
+
 class fixbv(object):
-    #__slots__ = ('_val', '_min', '_max', '_nrbits', '_handleBounds')
-    
+    __slots__ = ('_val', '_min', '_max', '_nrbits', '_shift')
+
     def __init__(self, val, shift, min=None, max=None, _nrbits=0):
         if _nrbits:
             self._min = 0
-            self._max = 2**_nrbits
+            self._max = long(1) << _nrbits
+        elif min is None and max is None:
+            self._min = self._max = None
         else:
-            if isinstance(min, float):
-                self._min = int(floor(min*2**(-shift) + 0.5))
-            else:
-                self._min = min
-            if isinstance(max, float):
-                self._max = int(floor(max*2**(-shift) + 0.5))
-            else:
-                self._max = max
-            if self._max is not None and self._min is not None:
-                if self._min >= 0:
-                    _nrbits = len(bin(self._max-1))
-                elif self._max <= 1:
-                    _nrbits = len(bin(self._min))
-                else:
-                    # make sure there is a leading zero bit in positive numbers
-                    _nrbits = builtins.max(len(bin(self._max-1))+1, len(bin(self._min)))
+            self._min, self._max, _nrbits = _format(shift, min, max)
         if isinstance(val, float):
-            self._val = int(floor(val*2**(-shift) + 0.5))
-            self._shift = shift
+            self._val = _round(ldexp(val, -shift))
         elif isinstance(val, integer_types):
             self._val = val
-            self._shift = shift
         elif isinstance(val, string_types):
             mval = val.replace('_', '')
             self._val = long(mval, 2)
             _nrbits = len(mval)
-            self._shift = shift
         elif isinstance(val, fixbv):
-            self._val = val._val*2**(val._shift-shift)
-            self._min = val._min
-            self._max = val._max
-            self._shift = val._shift
-            _nrbits = val._nrbits
+            self._val = _align(val._val, val._shift, shift)
+            if val._shift == shift:
+                self._min = val._min
+                self._max = val._max
+                _nrbits = val._nrbits
+            else:
+                self._min = self._max = None
+                _nrbits = 0
+                if val._min is not None:
+                    self._min = _align(val._min, val._shift, shift)
+                if val._max is not None:
+                    self._max = _align(val._max, val._shift, shift)
+                if val._min is not None and val._max is not None:
+                    _nrbits = _nrbitsOf(self._min, self._max)
         elif isinstance(val, intbv):
             self._val = val._val
             self._min = val._min
             self._max = val._max
-            self._shift = shift
             _nrbits = val._nrbits
         else:
             raise TypeError("fixbv constructor arg should be inbv, int or string")
+        self._shift = shift
         self._nrbits = _nrbits
         self._handleBounds()
-        
+
     # support for the 'min' and 'max' attribute
     @property
     def max(self):
@@ -103,40 +200,86 @@ class fixbv(object):
             if isinstance(other._val, fixbv):
                 return True
         return False
-        
+
     #
     # function : align
-    # brief    : Align the input variable "val" to the fixbv object. This
-    #            function supports different input types:
+    # brief    : Align the input variable "val" to the fixbv object, and
+    #            return its stored integer. This function supports
+    #            different input types:
     #            o fixbv
     #            o intbv
     #            o integer
     #            o float
+    #            Bits that are shifted out are rounded as specified by
+    #            the rounding argument.
     #
-    def align(self, other):
+    def align(self, other, rounding=ROUND_HALF_UP):
         if isinstance(other, float):
-            val = int(floor(other*2**-self.shift + 0.5))
-        elif isinstance (other, integer_types):
-            val = int(other*2**-self.shift)
-        elif isinstance (other, intbv):
-            val = other._val
-        elif isinstance (other, fixbv):
-            val = other._val*2**(other._shift-self.shift)
-        else:
-            TypeError("fixbv align arg should be float, int, intbv or fixbv")
-        return val
-            
+            return _round(ldexp(other, -self._shift))
+        parts = _parts(other)
+        if parts is None:
+            raise TypeError("fixbv align arg should be float, int, intbv or fixbv")
+        return _align(parts[0], parts[1], self._shift, rounding)
+
+    #
+    # function : fixto
+    # brief    : Return the value as a fixbv with the shift, min and max
+    #            of the fixbv (or fixbv signal) 'other'. Bits that are
+    #            shifted out are rounded, and values outside [min, max)
+    #            handled, as specified by the rounding and overflow
+    #            arguments.
+    #
+    def fixto(self, other, rounding=ROUND_FLOOR, overflow=OVERFLOW_ERROR):
+        if not self._isfixbv(other):
+            raise TypeError("fixbv fixto arg should be a fixbv")
+        if not isinstance(other, fixbv):
+            other = other._val
+        _checkModes(rounding, overflow)
+        shift, lo, hi = other._shift, other._min, other._max
+        val = _align(self._val, self._shift, shift, rounding)
+        if overflow == OVERFLOW_SATURATE:
+            if hi is not None and val >= hi:
+                val = hi - 1
+            if lo is not None and val < lo:
+                val = lo
+        elif overflow == OVERFLOW_WRAP and lo is not None and \
+                hi is not None:
+            if val < lo or val >= hi:
+                val = (val - lo) % (hi - lo) + lo
+        result = type(self)(val, shift)
+        result._min = lo
+        result._max = hi
+        result._nrbits = other._nrbits
+        result._handleBounds()
+        return result
+
+    #
+    # function : quantize_array
+    # brief    : Return a fixbvarray with the values of a sequence or a
+    #            numpy array, quantized in one call to the format given
+    #            by shift, min and max.
+    #
+    @staticmethod
+    def quantize_array(values, shift, min=None, max=None,
+                       rounding=ROUND_HALF_UP, overflow=OVERFLOW_ERROR):
+        from myhdl._bvarray import fixbvarray
+        return fixbvarray(values, shift, min=min, max=max,
+                          rounding=rounding, overflow=overflow)
+
     def _handleBounds(self):
+        # the bounds hold for the stored integer
+        val = self._val
         if self._max is not None:
-            val = self._val*2**self._shift
             if val >= self._max:
                 raise ValueError("fixbv value {} ({}) >= maximum {} ({})".format(
-                    val, val*2**self._shift, self._max, self._max*2**self._shift))
+                    val, ldexp(val, self._shift), self._max,
+                    ldexp(self._max, self._shift)))
         if self._min is not None:
             if val < self._min:
-                raise ValueError("fixbv value %s < minimum %s" %
-                                 (val, self._min))
-                
+                raise ValueError("fixbv value {} ({}) < minimum {} ({})".format(
+                    val, ldexp(val, self._shift), self._min,
+                    ldexp(self._min, self._shift)))
+
     def _hasFullRange(self):
         min, max = self._min, self._max
         if max <= 0:
@@ -250,174 +393,97 @@ class fixbv(object):
 
         
     # integer-like methods
-    
+
     def __add__(self, other):
-        if self._isfixbv(other):
-            if self._shift >= other._shift:
-                val = self._val*2**(self._shift-other._shift) + other._val
-                shift = other._shift
-            else:
-                val = self._val + other._val*2**(other._shift-self._shift) 
-                shift = self._shift
-            return fixbv(val, shift)
-        elif isinstance(other, intbv):
-            val = self._val + other._val*2**(-self._shift)
-        else:
-            val = int(self._val + other*2**(-self._shift))
-        return fixbv(val, self._shift)
-            
-    __radd__=__add__
-    
+        parts = _parts(other)
+        if parts is None:
+            return _new(self._val + self.align(other), self._shift)
+        val, shift = parts
+        if self._shift >= shift:
+            return _new((self._val << (self._shift - shift)) + val, shift)
+        return _new(self._val + (val << (shift - self._shift)), self._shift)
+
+    __radd__ = __add__
+
     def __sub__(self, other):
-        if self._isfixbv(other):
-            val = float(int(self._val)*2**self._shift - int(other._val)*2**other._shift)
-            if self._shift >= other._shift:
-                shift = other._shift
-            else:
-                shift = self._shift
-            return fixbv(val, shift)
-        elif isinstance(other, intbv):
-            val = self._val - other._val*2**(-self._shift)
-        else:
-            val = self._val - other*2**(-self._shift)
-            return fixbv(val, self._shift)
+        parts = _parts(other)
+        if parts is None:
+            return _new(self._val - self.align(other), self._shift)
+        val, shift = parts
+        if self._shift >= shift:
+            return _new((self._val << (self._shift - shift)) - val, shift)
+        return _new(self._val - (val << (shift - self._shift)), self._shift)
 
     def __rsub__(self, other):
-        if isinstance(other, intbv):
-            val = -self._val + other._val*2**(-self._shift)
-        else:
-            val = -self._val + other*2**(-self._shift)
-        return fixbv(val, self._shift)
+        result = self.__sub__(other)
+        result._val = -result._val
+        return result
 
     def __mul__(self, other):
-        if self._isfixbv(other):
-            val = self._val * int(other._val)
-            shift = self._shift + other._shift
-        elif isinstance(other, intbv):
-            val = self._val * other._val
-            shift = self._shift
-        else:
-            val = self._val * 2**self._shift * other
-            shift = self._shift
-        return fixbv(val, shift)
-            
-    __rmul__=__mul__
-    
+        if isinstance(other, float):
+            # the product of the stored integer and a float, on the grid
+            # of self
+            return _new(_round(self._val * other), self._shift)
+        parts = _parts(other)
+        if parts is None:
+            raise TypeError("fixbv multiplication arg should be float, int, "
+                            "intbv or fixbv")
+        val, shift = parts
+        return _new(self._val * val, self._shift + shift)
+
+    __rmul__ = __mul__
+
     def __truediv__(self, other):
-        if self._isfixbv(other):
-            return float(self._val*2**self._shift) / float(other._val*2**other._shift)
-        elif isinstance(other, intbv):
-            return float(self._val*2**self._shift) / float(other._val)
-        else:
-            return float(self._val*2**self._shift) / float(other)
-    
+        return float(self) / float(other)
+
     def __rtruediv__(self, other):
-        if isinstance(other, intbv):
-            return float(other._val) / float(self._val*2**self._shift)
-        else:
-            return float(other) / float(self._val*2**self._shift)
-    
+        return float(other) / float(self)
+
     def __floordiv__(self, other):
-        if self._isfixbv(other):
-            return int(float(self._val*2**self._shift) // float(other._val*2**other._shift))
-        elif isinstance(other, intbv):
-            return int(float(self._val*2**self._shift) // float(other._val))
-        else:
-            return int(float(self._val*2**self._shift) // float(other))
+        return int(float(self) // float(other))
 
     def __rfloordiv__(self, other):
-        if isinstance(other, intbv):
-            return int(float(other._val) // float(self._val*2**self._shift))
-        else:
-            return int(float(other) // float(self._val*2**self._shift))
-        
+        return int(float(other) // float(self))
+
     def __mod__(self, other):
-        if self._isfixbv(other):
-            return float(self._val*2**self._shift) % float(other._val*2**other._shift)
-        if isinstance(other, intbv):
-            return float(self._val*2**self._shift) % float(other._val)
-        else:
-            return float(self._val*2**self._shift) % float(other)
+        return float(self) % float(other)
 
     def __rmod__(self, other):
-        if isinstance(other, intbv):
-            return float(other._val) % float(self._val*2**self._shift)
-        else:
-            return float(other) % float(self._val*2**self._shift)
+        return float(other) % float(self)
 
     # divmod
-    
+
     def __pow__(self, other):
-        if self._isfixbv(other):
-            return float(self._val*2**self._shift)**float(other._val*2**self._shift)
-        elif isinstance(other, intbv):
-            return float(self._val*2**self._shift)**float(other._val)
-        else:
-            return float(self._val*2**self._shift)**float(other)
+        return float(self)**float(other)
 
     def __rpow__(self, other):
         if isinstance(other, intbv):
-            return float(other._val)**float(self._val*2**self._shift)
+            return float(other._val)**float(self)
         else:
-            return other**float(self._val*2**self._shift)
+            return other**float(self)
+
+    def _shiftAmount(self, other):
+        """ Return the integer value of a shift amount. """
+        shift = float(other)
+        if (shift % 1.0) != 0:
+            raise TypeError("Cannot shift value by an None-integer type")
+        return int(shift)
 
     def __lshift__(self, other):
-        if self._isfixbv(other):
-            shift = float(other._val*2**self._shift)
-            if (shift % 1.0) != 0:
-                raise TypeError("Cannot shift value by an None-integer type")
-            return fixbv(self._val, self._shift+int(shift))
-        elif isinstance(other, intbv):
-            shift = float(other._val)
-            if (shift % 1.0) != 0:
-                raise TypeError("Cannot shift value by an None-integer type")
-            return fixbv(self._val, self._shift+int(other._val))
-        else:
-            shift = float(other)
-            if (shift % 1.0) != 0:
-                raise TypeError("Cannot shift value by an None-integer type")
-            return fixbv(self._val, self._shift+int(other))
-            
+        return _new(self._val, self._shift + self._shiftAmount(other))
+
     def __rlshift__(self, other):
         if isinstance(other, intbv):
-            shift = float(self._val*2**self._shift)
-            if (shift % 1.0) != 0:
-                raise TypeError("Cannot shift value by an None-integer type")
-            return other._val << int(shift)
-        else:
-            shift = float(self._val*2**self._shift)
-            if (shift % 1.0) != 0:
-                raise TypeError("Cannot shift value by an None-integer type")
-            return other << int(shift)
-            
+            other = other._val
+        return other << self._shiftAmount(self)
+
     def __rshift__(self, other):
-        if self._isfixbv(other):
-            shift = float(other._val*2**self._shift)
-            if (shift % 1.0) != 0:
-                raise TypeError("Cannot shift value by an None-integer type")
-            return fixbv(self._val, self._shift-int(shift))
-        elif isinstance(other, intbv):
-            shift = float(other._val)
-            if (shift % 1.0) != 0:
-                raise TypeError("Cannot shift value by an None-integer type")
-            return fixbv(self._val, self._shift-int(other._val))
-        else:
-            shift = float(other)
-            if (shift % 1.0) != 0:
-                raise TypeError("Cannot shift value by an None-integer type")
-            return fixbv(self._val, self._shift-int(other))
+        return _new(self._val, self._shift - self._shiftAmount(other))
 
     def __rrshift__(self, other):
         if isinstance(other, intbv):
-            shift = float(self._val*2**self._shift)
-            if (shift % 1.0) != 0:
-                raise TypeError("Cannot shift value by an None-integer type")
-            return other._val >> int(shift)
-        else:
-            shift = float(self._val*2**self._shift)
-            if (shift % 1.0) != 0:
-                raise TypeError("Cannot shift value by an None-integer type")
-            return other >> int(shift)
+            other = other._val
+        return other >> self._shiftAmount(self)
 
 #------------------------------------------------------------------------------            
 #                          BITWISE OPERATIONS
@@ -527,12 +593,6 @@ class fixbv(object):
     def __abs__(self):
         return abs(self._val)
 
-    def __invert__(self):
-        if self._nrbits and self._min >= 0:
-            return type(self)(~self._val & (long(1) << self._nrbits)-1)
-        else:
-            return type(self)(~self._val)
-    
     def __int__(self):
         return int(self._val)
         
@@ -554,53 +614,39 @@ class fixbv(object):
         return int(self._val)
         
     # comparisons
+    def _cmpvals(self, other):
+        """ Return the values to compare, as integers on a common grid. """
+        parts = _parts(other)
+        if parts is None:
+            return float(self), other
+        val, shift = parts
+        if self._shift >= shift:
+            return self._val << (self._shift - shift), val
+        return self._val, val << (shift - self._shift)
+
     def __eq__(self, other):
-        if self._isfixbv(other):
-            return self._val*2**self._shift == other._val*2**self._shift
-        elif isinstance(other, intbv):
-            return self._val*2**self._shift == other._val
-        else:
-            return self._val*2**self._shift == other
+        a, b = self._cmpvals(other)
+        return a == b
 
     def __ne__(self, other):
-        if self._isfixbv(other):
-            return self._val*2**self._shift != other._val*2**self._shift
-        elif isinstance(other, intbv):
-            return self._val*2**self._shift != other._val
-        else:
-            return self._val*2**self._shift != other
+        a, b = self._cmpvals(other)
+        return a != b
 
     def __lt__(self, other):
-        if self._isfixbv(other):
-            return self._val*2**self._shift < other._val*2**self._shift
-        elif isinstance(other, intbv):
-            return self._val*2**self._shift < other._val
-        else:
-            return self._val*2**self._shift < other
+        a, b = self._cmpvals(other)
+        return a < b
 
     def __le__(self, other):
-        if self._isfixbv(other):
-            return self._val*2**self._shift <= other._val*2**self._shift
-        elif isinstance(other, intbv):
-            return self._val*2**self._shift <= other._val
-        else:
-            return self._val*2**self._shift <= other
+        a, b = self._cmpvals(other)
+        return a <= b
 
     def __gt__(self, other):
-        if self._isfixbv(other):
-            return self._val*2**self._shift > other._val*2**self._shift
-        elif isinstance(other, intbv):
-            return self._val*2**self._shift > other._val
-        else:
-            return self._val*2**self._shift > other
+        a, b = self._cmpvals(other)
+        return a > b
 
     def __ge__(self, other):
-        if self._isfixbv(other):
-            return self._val*2**self._shift >= other._val*2**self._shift
-        elif isinstance(other, intbv):
-            return self._val*2**self._shift >= other._val
-        else:
-            return self._val*2**self._shift >= other
+        a, b = self._cmpvals(other)
+        return a >= b
 
 #---------------------------------------------------------------------------------------------------
 #                                       representation
@@ -609,13 +655,13 @@ class fixbv(object):
     # function : __float__
     # brief    : convert the 
     def __float__(self):
-        return float(self._val*2.0**self._shift)
+        return ldexp(self._val, self._shift)
 
     def __int__(self):
         return int(self._val)
 
     def __str__(self):
-        return str(self._val*2.0**self._shift)
+        return str(ldexp(self._val, self._shift))
 
     def __repr__(self):
         return "fixbv({} , {}, min={}, max={}, nrbits={})".format(
@@ -21,14 +21,14 @@
 from __future__ import absolute_import
 
 
-import inspect
+import sys
 from types import FunctionType
 
 from myhdl import InstanceError
-from myhdl._util import _isGenFunc, _makeAST
+from myhdl._util import _isGenFunc, _makeAST, _frameSymdict, _SymDict
 from myhdl._Waiter import _inferWaiter
-from myhdl._resolverefs import _AttrRefTransformer
-from myhdl._visitors import _SigNameVisitor
+from myhdl._resolverefs import _AttrChainVisitor, _resolveAttrChains
+from myhdl._visitors import _SigNameVisitor, _SigNameRecorder
 
 
 class _error:
@@ -37,6 +37,33 @@ _error.NrOfArgs = "decorated generator function should not have arguments"
 _error.ArgType = "decorated object should be a generator function"
 
 
+# usage analysis per code object, see _getUsage
+_usages = {}
+
+
+def _getUsage(f):
+    """ Return the analysis of the names used in function f.
+
+    The analysis is done once per function code, on its syntax tree:
+    chains -- the attribute references that _AttrRefTransformer resolves
+    uses -- the names that _SigNameVisitor adds, with their context
+    embedded_func -- the name of an embedded function, or None
+
+    Only the binding of the names to objects is left for each instance.
+
+    """
+    code = f.__code__
+    usage = _usages.get(code)
+    if usage is None:
+        tree = _makeAST(f)
+        c = _AttrChainVisitor()
+        c.visit(tree)
+        v = _SigNameRecorder(c.index)
+        v.visit(tree)
+        usage = _usages[code] = (c.chains, v.uses, v.embedded_func)
+    return usage
+
+
 class _CallInfo(object):
 
     def __init__(self, name, modctxt, symdict):
@@ -57,16 +84,15 @@ def _getCallInfo():
     3: the caller of the block function, e.g. the BlockInstance.
     """
     from myhdl import _block
-    funcrec = inspect.stack()[2]
-    name = funcrec[3]
-    frame = funcrec[0]
-    symdict = dict(frame.f_globals)
-    symdict.update(frame.f_locals)
+    frame = sys._getframe(2)
+    name = frame.f_code.co_name
+    symdict = _frameSymdict(frame)
     modctxt = False
-    callerrec = inspect.stack()[3]
-    f_locals = callerrec[0].f_locals
-    if 'self' in f_locals:
-        modctxt = isinstance(f_locals['self'], _block._Block)
+    caller = frame.f_back
+    if caller is not None:
+        f_locals = caller.f_locals
+        if 'self' in f_locals:
+            modctxt = isinstance(f_locals['self'], _block._Block)
     return _CallInfo(name, modctxt, symdict)
 
 
@@ -92,23 +118,24 @@ class _Instantiator(object):
         # infer symdict
         f = self.funcobj
         varnames = f.__code__.co_varnames
-        symdict = {}
-        for n, v in callinfo.symdict.items():
-            if n not in varnames:
-                symdict[n] = v
+        if isinstance(callinfo.symdict, _SymDict):
+            symdict = callinfo.symdict.without(varnames)
+        else:
+            symdict = {}
+            for n, v in callinfo.symdict.items():
+                if n not in varnames:
+                    symdict[n] = v
         self.symdict = symdict
 
         # print modname, genfunc.__name__
-        tree = self.ast
-        # print ast.dump(tree)
-        v = _AttrRefTransformer(self)
-        v.visit(tree)
+        chains, uses, embedded_func = _getUsage(f)
+        names = _resolveAttrChains(self, chains)
         v = _SigNameVisitor(self.symdict)
-        v.visit(tree)
+        v.bindUses(uses, names)
         self.inputs = v.inputs
         self.outputs = v.outputs
         self.inouts = v.inouts
-        self.embedded_func = v.embedded_func
+        self.embedded_func = embedded_func
         self.sigdict = v.sigdict
         self.losdict = v.losdict
 
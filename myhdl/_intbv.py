@@ -24,9 +24,46 @@ from __future__ import absolute_import, division
 from myhdl._compat import long, integer_types, string_types, builtins
 from myhdl._bin import bin
 
+# slice descriptors (mask, shift, nrbits), keyed by (i, j)
+_slices = {}
+_MAXSLICES = 4096
+
+
+def _slice(start, stop, name):
+    """ Return the descriptor of slice [start:stop], with the checks done once.
+
+    The descriptor of an open slice [:j] has no mask.
+
+    """
+    i, j = start, stop
+    if j is None:  # default
+        j = 0
+    j = int(j)
+    if j < 0:
+        raise ValueError("%s[i:j] requires j >= 0\n"
+                         "            j == %s" % (name, j))
+    if i is not None:
+        i = int(i)
+        if i <= j:
+            raise ValueError("%s[i:j] requires i > j\n"
+                             "            i, j == %s, %s" % (name, i, j))
+    desc = _slices.get((i, j))
+    if desc is None:
+        if i is None:
+            desc = (None, j, 0)
+        else:
+            desc = ((long(1) << i) - 1, j, i - j)
+        if len(_slices) < _MAXSLICES:
+            _slices[i, j] = desc
+    if stop is None and (start is None or start.__class__ is int) and \
+            len(_slices) < _MAXSLICES:
+        # declarations such as intbv(0)[8:]
+        _slices[start, stop] = desc
+    return desc
+
 
 class intbv(object):
-    #__slots__ = ('_val', '_min', '_max', '_nrbits', '_handleBounds')
+    __slots__ = ('_val', '_min', '_max', '_nrbits')
 
     def __init__(self, val=0, min=None, max=None, _nrbits=0):
         if _nrbits:
@@ -124,21 +161,23 @@ class intbv(object):
     # indexing and slicing methods
 
     def __getitem__(self, key):
+        if key.__class__ is int:
+            return bool((self._val >> key) & 0x1)
         if isinstance(key, slice):
-            i, j = key.start, key.stop
-            if j is None:  # default
-                j = 0
-            j = int(j)
-            if j < 0:
-                raise ValueError("intbv[i:j] requires j >= 0\n"
-                                 "            j == %s" % j)
-            if i is None:  # default
-                return intbv(self._val >> j)
-            i = int(i)
-            if i <= j:
-                raise ValueError("intbv[i:j] requires i > j\n"
-                                 "            i, j == %s, %s" % (i, j))
-            res = intbv((self._val & (long(1) << i) - 1) >> j, _nrbits=i - j)
+            cls = self._sliceType
+            try:
+                mask, j, nrbits = _slices[key.start, key.stop]
+            except (KeyError, TypeError):
+                # new slices, and bounds that are not hashable ints
+                mask, j, nrbits = _slice(key.start, key.stop, cls.__name__)
+            if mask is None:
+                return cls(self._val >> j)
+            # the result is in range: the constructor checks are skipped
+            res = object.__new__(cls)
+            res._val = (self._val & mask) >> j
+            res._min = 0
+            res._max = long(1) << nrbits
+            res._nrbits = nrbits
             return res
         else:
             i = int(key)
@@ -564,3 +603,7 @@ class intbv(object):
             return intbv(retVal)[self._nrbits:]
         else:
             return intbv(retVal)        
+
+
+# slices of an intbv are intbv objects
+intbv._sliceType = intbv
@@ -0,0 +1,290 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module with the levelization of combinational logic.
+
+Combinational processes are ordered topologically on the signals that
+connect them, so that each of them has to be evaluated only once when
+the design settles.
+
+This module provides the following objects:
+_levelize -- function that orders combinational processes
+_Levelizer -- levelized always_comb evaluation for the event-driven kernel
+
+"""
+from __future__ import absolute_import
+
+from myhdl._simulator import _local
+from myhdl._Signal import _Signal, _WaiterList, _isListOfSigs, _unchanged
+from myhdl._SignalArray import SignalArray
+from myhdl._Waiter import _Waiter
+
+
+def _sigs(obj):
+    """ Return the signals in a signal, list of signals or clause. """
+    if isinstance(obj, (_Signal, SignalArray)):
+        return [obj]
+    if isinstance(obj, _WaiterList):
+        return [obj.sig]
+    if _isListOfSigs(obj):
+        return list(obj)
+    if isinstance(obj, (tuple, list)):
+        sigs = []
+        for o in obj:
+            sigs.extend(_sigs(o))
+        return sigs
+    return []
+
+
+class _CombNode(object):
+
+    """ A combinational process with its input and output signals. """
+
+    __slots__ = ('func', 'inputs', 'outputs', 'name')
+
+    def __init__(self, func, inputs, outputs, name):
+        self.func = func
+        self.inputs = inputs
+        self.outputs = outputs
+        self.name = name
+
+
+def _combNode(inst):
+    outputs = []
+    for n in inst.outputs:
+        outputs.extend(_sigs(inst.symdict.get(n)))
+    return _CombNode(inst.func, _sigs(inst.senslist), outputs, inst.name)
+
+
+def _shadowNode(sig):
+    # the shadow signal generators compute their value once per resume;
+    # the first resume yields the sensitivity list
+    gen = sig._waiter.generator
+    clause = next(gen)
+
+    def func():
+        next(gen)
+    return _CombNode(func, _sigs(clause), [sig], repr(sig))
+
+
+def _levelize(nodes):
+    """ Return the strongly connected components of the comb graph.
+
+    Nodes are connected when an output of a node is an input of
+    another node. The components are returned as lists of node
+    indices, in topological order, together with their level (the
+    length of the longest path that leads to them) and a flag that
+    tells whether they are a combinational loop: a component with
+    more than one node, or a node that reads its own output.
+
+    """
+    drivers = {}
+    for i, node in enumerate(nodes):
+        for s in node.outputs:
+            drivers.setdefault(id(s), []).append(i)
+    succ = [set() for node in nodes]
+    for j, node in enumerate(nodes):
+        for s in node.inputs:
+            for i in drivers.get(id(s), ()):
+                succ[i].add(j)
+    # iterative version of Tarjan's algorithm
+    index = {}
+    low = {}
+    stack = []
+    onstack = set()
+    comps = []
+    counter = 0
+    for root in range(len(nodes)):
+        if root in index:
+            continue
+        work = [(root, iter(sorted(succ[root])))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        onstack.add(root)
+        while work:
+            v, it = work[-1]
+            for w in it:
+                if w not in index:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    onstack.add(w)
+                    work.append((w, iter(sorted(succ[w]))))
+                    break
+                elif w in onstack:
+                    low[v] = min(low[v], index[w])
+            else:
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    low[u] = min(low[u], low[v])
+                if low[v] == index[v]:
+                    comp = []
+                    while 1:
+                        w = stack.pop()
+                        onstack.discard(w)
+                        comp.append(w)
+                        if w == v:
+                            break
+                    comp.sort()
+                    comps.append(comp)
+    comps.reverse()
+    compof = {}
+    for c, comp in enumerate(comps):
+        for v in comp:
+            compof[v] = c
+    levels = [0] * len(comps)
+    for c, comp in enumerate(comps):
+        for v in comp:
+            for w in succ[v]:
+                d = compof[w]
+                if d != c and levels[d] <= levels[c]:
+                    levels[d] = levels[c] + 1
+    loops = [len(c) > 1 or c[0] in succ[c[0]] for c in comps]
+    return list(zip(comps, levels, loops))
+
+
+class _CombTrigger(_Waiter):
+
+    """ Waiter that marks a levelized process when a signal changes. """
+
+    __slots__ = ('levelizer', 'index', 'sig')
+
+    def __init__(self, levelizer, index, sig):
+        self.levelizer = levelizer
+        self.index = index
+        self.sig = sig
+        self.hasRun = 0
+        sig._subscribe(self)
+
+    def next(self, waiters, actives, exc):
+        # resumed by the kernel, that counts it as a resume
+        self.levelizer._resumed += 1
+        self.fire()
+
+    def fire(self):
+        lev = self.levelizer
+        i = self.index
+        if lev._stamps[i] != lev._batch:
+            lev._stamps[i] = lev._batch
+            lev.wakeups += 1
+        if not lev._dirty[i]:
+            lev._dirty[i] = True
+            lev.ndirty += 1
+
+
+class _Levelizer(object):
+
+    """ Levelized evaluation of always_comb blocks.
+
+    Acyclic always_comb blocks are not resumed as generators. Their
+    input signals mark them when they change, and the Simulation
+    evaluates the marked blocks in topological order once per settle.
+    Blocks that are part of a combinational loop are left to the
+    event-driven kernel.
+
+    Attributes:
+    evaluations -- number of levelized block evaluations
+    deltas -- number of levels after which signals were updated
+    updates -- number of signal updates that changed a value
+    wakeups -- number of times a block would have been woken up
+    saved -- number of evaluations saved by levelization
+
+    """
+
+    def __init__(self, combs):
+        self._nodes = nodes = [_combNode(c) for c in combs]
+        schedule = {}
+        self.levelized = []
+        self.fallback = []
+        n = len(nodes)
+        # all levelized blocks are evaluated at the start
+        self._dirty = [False] * n
+        self._stamps = [0] * n
+        self._batch = 0
+        self._started = False
+        for comp, level, loop in _levelize(nodes):
+            if loop:
+                self.fallback.extend(combs[i] for i in comp)
+                continue
+            i = comp[0]
+            idxs, funcs = schedule.setdefault(level, ([], []))
+            idxs.append(i)
+            funcs.append(nodes[i].func)
+            self.levelized.append(combs[i])
+            self._dirty[i] = True
+        self._schedule = [schedule[level] for level in sorted(schedule)]
+        self.ndirty = self.wakeups = len(self.levelized)
+        self.evaluations = self.deltas = self.updates = 0
+        self._resumed = 0
+
+    @property
+    def saved(self):
+        return self.wakeups - self.evaluations
+
+    def _instrument(self, wrap):
+        """ Replace the block functions by wrap(func). """
+        for idxs, funcs in self._schedule:
+            funcs[:] = [wrap(func) for func in funcs]
+
+    def _apply(self, waiters):
+        _siglist = _local.context.siglist
+        for s in _siglist:
+            ws = s._update()
+            if ws is not _unchanged:
+                self.updates += 1
+            for w in ws:
+                if w.__class__ is _CombTrigger:
+                    w.fire()
+                else:
+                    waiters.append(w)
+        del _siglist[:]
+        self.deltas += 1
+        self._batch += 1
+
+    def settle(self, waiters):
+        """ Evaluate the marked blocks in topological order.
+
+        Signal updates are applied after each level. Waiters that
+        are not levelized are appended to waiters.
+
+        """
+        dirty = self._dirty
+        if not self._started:
+            self._started = True
+            for idxs, funcs in self._schedule:
+                for i in idxs:
+                    for sig in self._nodes[i].inputs:
+                        _CombTrigger(self, i, sig)
+        while self.ndirty:
+            for idxs, funcs in self._schedule:
+                if not self.ndirty:
+                    break
+                active = False
+                for i, func in zip(idxs, funcs):
+                    if dirty[i]:
+                        dirty[i] = False
+                        self.ndirty -= 1
+                        self.evaluations += 1
+                        active = True
+                        func()
+                if active:
+                    self._apply(waiters)
+        self._batch += 1
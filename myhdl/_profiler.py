@@ -0,0 +1,183 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module with the simulation profiler.
+
+The profiler records the number of activations and the cumulative
+wall-clock time of each process of a simulation. It wraps the process
+functions and generators when the simulation is constructed with
+profile=True, so that a simulation without profiler runs unchanged.
+
+"""
+from __future__ import absolute_import
+
+import json
+from timeit import default_timer as _timer
+
+from myhdl._block import _Block
+from myhdl._instance import _Instantiator
+from myhdl._drive import _KernelInstance
+from myhdl._getHierarchy import _getHierarchy
+from myhdl._util import _flatten
+
+
+class _ProcStats(object):
+
+    """ Profile of a process. """
+
+    __slots__ = ('name', 'count', 'time')
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.time = 0.0
+
+
+class _ProfiledGenerator(object):
+
+    """ Iterator that times the resumptions of a generator. """
+
+    __slots__ = ('generator', 'stats')
+
+    def __init__(self, generator, stats):
+        self.generator = generator
+        self.stats = stats
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        t = _timer()
+        try:
+            return next(self.generator)
+        finally:
+            stats = self.stats
+            stats.count += 1
+            stats.time += _timer() - t
+
+    next = __next__
+
+
+def _profiledFunc(func, stats):
+    def profiled():
+        t = _timer()
+        try:
+            func()
+        finally:
+            stats.count += 1
+            stats.time += _timer() - t
+    return profiled
+
+
+class _Profiler(object):
+
+    """ Per-process profiler of a simulation.
+
+    Processes are named after their hierarchical name, as in the
+    absnames mapping of the design hierarchy, when they are part of a
+    block, and after their function otherwise. Drivers and recorders
+    are run by the kernel itself, and are not profiled.
+
+    """
+
+    def __init__(self, args):
+        self._names = {}
+        self._stats = []
+        self._wrapped = {}
+        # blocks and instances can be nested in lists and tuples
+        for arg in _flatten(*args):
+            if isinstance(arg, _Block):
+                self._addNames(arg)
+            elif isinstance(arg, _Instantiator):
+                self._addName(arg, arg.name)
+
+    def _addName(self, so, name):
+        if isinstance(so, _KernelInstance):
+            # run by the kernel, without a process to time
+            return
+        names = self._names
+        names[so.gen] = names[so.funcobj] = name
+        procfunc = getattr(so, 'procfunc', None)
+        if procfunc is not None:
+            names[procfunc] = name
+
+    def _addNames(self, top):
+        names = self._names
+        h = _getHierarchy(top.func.__name__, top)
+        for inst in h.hierarchy:
+            for sn, so in inst.subs:
+                if isinstance(so, _Instantiator):
+                    self._addName(so, h.absnames[id(so)])
+            prefix = h.absnames[id(inst.obj)]
+            for n, s in inst.sigdict.items():
+                waiter = getattr(s, '_waiter', None)
+                if waiter is not None:
+                    names[waiter.generator] = "%s_%s" % (prefix, n)
+
+    def _newStats(self, obj):
+        name = self._names.get(obj)
+        if name is None:
+            name = getattr(obj, '__name__', type(obj).__name__)
+        stats = _ProcStats(name)
+        self._stats.append(stats)
+        return stats
+
+    def wrap(self, func):
+        """ Return the profiled version of a process function. """
+        wrapped = self._wrapped.get(func)
+        if wrapped is None:
+            wrapped = _profiledFunc(func, self._newStats(func))
+            self._wrapped[func] = wrapped
+        return wrapped
+
+    def instrument(self, waiter):
+        """ Profile the process of a waiter. """
+        if getattr(waiter, 'func', None) is not None:
+            waiter.func = self.wrap(waiter.func)
+        elif getattr(waiter, 'generator', None) is not None:
+            gen = waiter.generator
+            waiter.generator = _ProfiledGenerator(gen, self._newStats(gen))
+
+    def results(self):
+        """ Return the profile as a list of dicts, hottest process first. """
+        stats = sorted(self._stats, key=lambda s: (-s.time, s.name))
+        return [{'name': s.name, 'count': s.count, 'time': s.time}
+                for s in stats]
+
+    def table(self):
+        """ Return the profile as a text table. """
+        results = self.results()
+        total = sum(r['time'] for r in results) or 1.0
+        width = max([len(r['name']) for r in results] + [len('process')])
+        fmt = "%%-%ds  %%10s  %%10s  %%6s  %%10s" % width
+        lines = [fmt % ('process', 'count', 'time [s]', '%', 'per call')]
+        for r in results:
+            percall = r['time'] / r['count'] if r['count'] else 0.0
+            lines.append(fmt % (r['name'], r['count'], "%.6f" % r['time'],
+                                "%.1f" % (100 * r['time'] / total),
+                                "%.3g" % percall))
+        return "\n".join(lines)
+
+    def json(self, **kwargs):
+        """ Return the profile as a JSON string.
+
+        Keyword arguments are passed to json.dumps.
+
+        """
+        return json.dumps(self.results(), **kwargs)
@@ -0,0 +1,256 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module with the record function.
+
+A recorder samples the values of signals on each trigger, and writes
+them in preallocated buffers, one column per signal. Signal values are
+recorded as integers: intbv and fixbv values as their stored integers.
+
+"""
+from __future__ import absolute_import
+
+from array import array
+
+from myhdl._compat import integer_types
+from myhdl._delay import delay
+from myhdl._Signal import _Signal
+from myhdl._Waiter import _Waiter
+from myhdl._instance import _getCallInfo
+from myhdl._bvarray import _numpy
+from myhdl._drive import _KernelInstance, _trigger
+from myhdl._SignalArray import _typecode
+from myhdl._simulator import _local
+
+
+class _error:
+    pass
+_error.SigType = "record: the recorded objects should be Signals"
+_error.OnType = "record: on should be a Signal, edge, or delay"
+_error.Depth = "record: depth or into should be given"
+_error.IntoLen = "record: into should have a buffer per signal"
+_error.Decimate = "record: decimate should be > 0"
+
+# the typecode of the sample times, or None to keep them in a list
+_TIMECODE = _typecode(-2**63, 2**63)
+
+
+def record(sigs, on, depth=None, into=None, decimate=1, ring=False):
+    """ Return a recorder that samples sigs on each trigger of on.
+
+    sigs -- a signal, or a sequence of signals
+    on -- the trigger: a signal, an edge, or a delay
+    depth -- the number of samples that are kept
+    into -- optional sequence of buffers, one per signal: arrays, lists
+            or numpy arrays of at least depth items
+    decimate -- record one sample every decimate triggers
+    ring -- when True, the oldest samples are overwritten when the
+            buffers are full. Otherwise recording stops.
+
+    By default, the buffers are arrays of the smallest type that holds
+    the values of the signal.
+
+    """
+    callinfo = _getCallInfo()
+    if isinstance(sigs, _Signal):
+        sigs = [sigs]
+    sigs = list(sigs)
+    for sig in sigs:
+        if not isinstance(sig, _Signal):
+            raise TypeError(_error.SigType)
+    if _trigger(on) is None:
+        raise TypeError(_error.OnType)
+    if decimate < 1:
+        raise ValueError(_error.Decimate)
+    if into is None:
+        if depth is None:
+            raise TypeError(_error.Depth)
+        into = [_buffer(sig, depth) for sig in sigs]
+    else:
+        into = list(into)
+        if len(into) != len(sigs):
+            raise ValueError(_error.IntoLen)
+        if depth is None:
+            depth = min(len(buf) for buf in into)
+    recorder = _Recorder(on, callinfo, inputs=sigs)
+    recorder.sigs = sigs
+    recorder.buffers = into
+    recorder.depth = depth
+    recorder.decimate = decimate
+    recorder.ring = ring
+    recorder._times = _zeros(_TIMECODE, depth)
+    recorder._start()
+    return recorder
+
+
+def _buffer(sig, depth):
+    """ Return a buffer for depth samples of sig. """
+    val = sig._val
+    if isinstance(val, bool):
+        code = 'B'
+    else:
+        code = _typecode(getattr(val, '_min', None),
+                         getattr(val, '_max', None))
+    return _zeros(code, depth)
+
+
+def _zeros(code, depth):
+    if code is None:
+        return [0] * depth
+    return array(code, [0]) * depth
+
+
+def _column(buf, n, depth):
+    """ Return the n samples in a buffer, the oldest first. """
+    if n <= depth:
+        return buf[:n]
+    i = n % depth
+    np = _numpy(buf)
+    if np is not None:
+        return np.concatenate((buf[i:depth], buf[:i]))
+    return buf[i:depth] + buf[:i]
+
+
+class _Recorder(_KernelInstance):
+
+    """ Instance that records the values of signals.
+
+    Properties:
+    count -- the number of samples recorded since the start
+    times -- the times of the samples that are kept
+
+    Indexing with a signal, or with its position in sigs, returns the
+    samples of the signal that are kept, the oldest first. The samples
+    can be read during and after a simulation.
+
+    """
+
+    def _start(self):
+        self._count = 0
+        self._index = 0
+        self._phase = self.decimate
+        self._columns = [(sig, buf, not isinstance(sig._val, integer_types))
+                         for sig, buf in zip(self.sigs, self.buffers)]
+
+    def _sample(self):
+        """ Record the current values, and return False when done. """
+        self._phase -= 1
+        if self._phase:
+            return True
+        self._phase = self.decimate
+        i = self._index
+        self._times[i] = _local.context.time
+        for sig, buf, code in self._columns:
+            val = sig._val
+            buf[i] = val._val if code else val
+        self._count += 1
+        i += 1
+        if i == self.depth:
+            if not self.ring:
+                self._index = i
+                return False
+            i = 0
+        self._index = i
+        return True
+
+    @property
+    def name(self):
+        return 'record'
+
+    @property
+    def waiter(self):
+        # a new simulation records from the start of the buffers
+        self._start()
+        on = self.senslist[0]
+        if isinstance(on, delay):
+            return _RecordDelayWaiter(self, on)
+        return _RecordWaiter(self, on)
+
+    # support for the 'count' and 'times' attributes
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def times(self):
+        return _column(self._times, self._count, self.depth)
+
+    def __len__(self):
+        return min(self._count, self.depth)
+
+    def __getitem__(self, key):
+        if isinstance(key, _Signal):
+            for i, sig in enumerate(self.sigs):
+                if sig is key:
+                    break
+            else:
+                raise KeyError("record: signal is not recorded")
+        else:
+            i = key
+        return _column(self.buffers[i], self._count, self.depth)
+
+    @property
+    def columns(self):
+        return [self[i] for i in range(len(self.sigs))]
+
+
+class _RecordWaiter(_Waiter):
+
+    """ Waiter that samples on a signal or edge.
+
+    The waiter subscribes to the trigger when the simulation starts, and
+    unsubscribes when the recorder is done.
+
+    """
+
+    __slots__ = ('recorder', 'trigger', 'edge', 'subscribed', 'hasRun')
+
+    def __init__(self, recorder, on):
+        self.recorder = recorder
+        self.trigger, self.edge = _trigger(on)
+        self.subscribed = 0
+        self.hasRun = 0
+
+    def next(self, waiters, actives, exc):
+        if not self.subscribed:
+            self.trigger._subscribe(self, self.edge)
+            self.subscribed = 1
+        elif not self.recorder._sample():
+            self.trigger._statics[self.edge].remove(self)
+            self.subscribed = 0
+
+
+class _RecordDelayWaiter(_Waiter):
+
+    """ Waiter that samples periodically. """
+
+    __slots__ = ('recorder', 'time', 'started')
+
+    def __init__(self, recorder, on):
+        self.recorder = recorder
+        self.time = on._time
+        self.started = 0
+
+    def next(self, waiters, actives, exc):
+        if self.started:
+            if not self.recorder._sample():
+                return
+        self.started = 1
+        ctx = _local.context
+        ctx.futureEvents.append((ctx.time + self.time, self))
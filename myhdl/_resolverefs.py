@@ -31,6 +31,80 @@ def _suffixer(name, used_names):
     return next(s for s in new_names if s not in used_names)
 
 
+_reserved = ('next', 'posedge', 'negedge', 'max', 'min', 'val', 'signed',
+             'verilog_code', 'vhdl_code')
+
+
+def _attrRef(data, name_map, name, attr):
+    """ Return the name that replaces the reference name.attr, or None.
+
+    The name is bound to the attribute object in data.symdict, and added
+    to data.objlist.
+
+    """
+    if attr in _reserved:
+        return None
+
+    # Don't handle locals
+    if name not in data.symdict:
+        return None
+
+    obj = data.symdict[name]
+    # Don't handle enums and functions, handle signals as long as it is a new attribute
+    if isinstance(obj, (EnumType, FunctionType)):
+        return None
+    elif isinstance(obj, SignalType):
+        if hasattr(SignalType, attr):
+            return None
+
+    attrobj = getattr(obj, attr)
+
+    orig_name = name + '.' + attr
+    if orig_name not in name_map:
+        base_name = name + '_' + attr
+        name_map[orig_name] = _suffixer(base_name, data.symdict)
+    new_name = name_map[orig_name]
+    data.symdict[new_name] = attrobj
+    data.objlist.append(new_name)
+    return new_name
+
+
+def _resolveAttrChains(data, chains):
+    """ Resolve attribute references as _AttrRefTransformer does.
+
+    chains -- (name, attrs) tuples of references name.attr1.attr2...,
+              in the order of _AttrChainVisitor
+
+    Returns the name that replaces each reference. It is the name of the
+    reference itself if it is not replaced.
+
+    """
+    data.objlist = []
+    name_map = {}
+    names = []
+    for name, attrs in chains:
+        for attr in attrs:
+            new_name = _attrRef(data, name_map, name, attr)
+            if new_name is None:
+                # outer attributes no longer have a name as value
+                break
+            name = new_name
+        names.append(name)
+    return names
+
+
+def _attrChain(node):
+    """ Return the name and attributes of a reference name.attr..., or None. """
+    attrs = []
+    while isinstance(node, ast.Attribute):
+        attrs.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    attrs.reverse()
+    return node.id, tuple(attrs)
+
+
 class _AttrRefTransformer(ast.NodeTransformer):
 
     def __init__(self, data):
@@ -42,36 +116,14 @@ class _AttrRefTransformer(ast.NodeTransformer):
     def visit_Attribute(self, node):
         self.generic_visit(node)
 
-        reserved = ('next', 'posedge', 'negedge', 'max', 'min', 'val', 'signed',
-                    'verilog_code', 'vhdl_code')
-        if node.attr in reserved:
-            return node
-
         # Don't handle subscripts for now.
         if not isinstance(node.value, ast.Name):
             return node
 
-        # Don't handle locals
-        if node.value.id not in self.data.symdict:
-            return node
-
-        obj = self.data.symdict[node.value.id]
-        # Don't handle enums and functions, handle signals as long as it is a new attribute
-        if isinstance(obj, (EnumType, FunctionType)):
+        new_name = _attrRef(self.data, self.name_map, node.value.id,
+                            node.attr)
+        if new_name is None:
             return node
-        elif isinstance(obj, SignalType):
-            if hasattr(SignalType, node.attr):
-                return node
-
-        attrobj = getattr(obj, node.attr)
-
-        orig_name = node.value.id + '.' + node.attr
-        if orig_name not in self.name_map:
-            base_name = node.value.id + '_' + node.attr
-            self.name_map[orig_name] = _suffixer(base_name, self.data.symdict)
-        new_name = self.name_map[orig_name]
-        self.data.symdict[new_name] = attrobj
-        self.data.objlist.append(new_name)
 
         new_node = ast.Name(id=new_name, ctx=node.value.ctx)
         return ast.copy_location(new_node, node)
@@ -81,3 +133,31 @@ class _AttrRefTransformer(ast.NodeTransformer):
         for n in nodes:
             self.visit(n)
         return node
+
+
+class _AttrChainVisitor(ast.NodeVisitor):
+
+    """ Collect the attribute references that _AttrRefTransformer resolves.
+
+    The references name.attr1.attr2... are collected in the order in
+    which the transformer resolves them, and numbered in chains by the
+    id of their outer node.
+
+    """
+
+    def __init__(self):
+        self.chains = []
+        self.index = {}
+
+    def visit_Attribute(self, node):
+        chain = _attrChain(node)
+        if chain is None:
+            self.generic_visit(node)
+        else:
+            self.index[id(node)] = len(self.chains)
+            self.chains.append(chain)
+
+    def visit_FunctionDef(self, node):
+        nodes = _flatten(node.body, node.args)
+        for n in nodes:
+            self.visit(n)
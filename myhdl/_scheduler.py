@@ -0,0 +1,160 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module with the future event queues of the simulator.
+
+Events are scheduled by appending (time, event) tuples to the
+futureEvents list of the simulator context. At each time step, the
+Simulation moves these pending events into one of the queues below,
+and pops all events of the earliest time from it. Events with the
+same time are returned in the order in which they were scheduled.
+
+This module provides the following objects:
+_HeapQueue -- binary heap queue
+_CalendarQueue -- time wheel queue with a heap for far future events
+_makeQueue -- factory function that returns a queue by name
+
+"""
+from __future__ import absolute_import
+
+from heapq import heappush, heappop
+
+
+class _HeapQueue(object):
+
+    """ Future event queue implemented as a binary heap. """
+
+    __slots__ = ('_heap', '_seq')
+
+    def __init__(self):
+        self._heap = []
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def peek(self):
+        """ Return the earliest time. """
+        return self._heap[0][0]
+
+    def load(self, events):
+        heap = self._heap
+        seq = self._seq
+        for t, event in events:
+            heappush(heap, (t, seq, event))
+            seq += 1
+        self._seq = seq
+
+    def pop(self):
+        """ Return the earliest time and the list of its events. """
+        heap = self._heap
+        t = heap[0][0]
+        events = []
+        while heap and heap[0][0] == t:
+            events.append(heappop(heap)[2])
+        return t, events
+
+
+class _CalendarQueue(object):
+
+    """ Future event queue implemented as a time wheel.
+
+    Events that fall within size timesteps of the current time are
+    stored in the bucket of their time slot, at O(1) cost. Events
+    further in the future go to an overflow heap.
+
+    """
+
+    __slots__ = ('_size', '_wheel', '_count', '_now', '_overflow', '_seq')
+
+    def __init__(self, size=1024):
+        self._size = size
+        self._wheel = [[] for i in range(size)]
+        self._count = 0
+        self._now = 0
+        self._overflow = []
+        self._seq = 0
+
+    def __len__(self):
+        return self._count + len(self._overflow)
+
+    def peek(self):
+        """ Return the earliest time. """
+        overflow = self._overflow
+        if self._count:
+            size = self._size
+            wheel = self._wheel
+            t = self._now
+            while not wheel[t % size]:
+                t += 1
+            if overflow and overflow[0][0] < t:
+                t = overflow[0][0]
+            return t
+        return overflow[0][0]
+
+    def load(self, events):
+        size = self._size
+        wheel = self._wheel
+        overflow = self._overflow
+        now = self._now
+        count = self._count
+        seq = self._seq
+        for t, event in events:
+            if t - now < size:
+                wheel[t % size].append(event)
+                count += 1
+            else:
+                heappush(overflow, (t, seq, event))
+                seq += 1
+        self._count = count
+        self._seq = seq
+
+    def pop(self):
+        """ Return the earliest time and the list of its events. """
+        size = self._size
+        wheel = self._wheel
+        overflow = self._overflow
+        t = None
+        if self._count:
+            t = self._now
+            while not wheel[t % size]:
+                t += 1
+        events = []
+        # far future events with the same time were scheduled earlier
+        if overflow and (t is None or overflow[0][0] <= t):
+            t = overflow[0][0]
+            while overflow and overflow[0][0] == t:
+                events.append(heappop(overflow)[2])
+        bucket = wheel[t % size]
+        if bucket:
+            events.extend(bucket)
+            self._count -= len(bucket)
+            wheel[t % size] = []
+        self._now = t
+        return t, events
+
+
+_queues = {'heap': _HeapQueue,
+           'calendar': _CalendarQueue,
+           }
+
+
+def _makeQueue(kind):
+    """ Return a new future event queue of the given kind. """
+    return _queues[kind]()
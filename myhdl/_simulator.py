@@ -19,21 +19,75 @@
 
 """ Simulator internals and the now function
 
+The state of the simulator is kept in a _Context object. Each thread
+has a current context, so that independent simulations can run in
+several threads of one process. The Simulation that is constructed in
+a thread owns the current context of that thread.
+
+The fields of the context of the calling thread are accessed through
+_current(), or _local.context on the hot paths of the kernel.
+
+Block functions are decorated when their module is imported, and are
+registered for the whole process in _blocks, so that their instance
+counters can be reset from any thread. Elaboration and conversion
+should therefore be done in one thread at a time.
+
 This module provides the following objects:
 now -- function that returns the current simulation time
 
 """
+from __future__ import absolute_import
+
+import threading
+
+
+class _Context(object):
+
+    """ Simulator state.
+
+    Attributes:
+    signals -- signals that were constructed in the context
+    siglist -- signals with a pending update
+    futureEvents -- inbox of (time, event) tuples to schedule
+    time -- current simulation time
+    delta -- delta cycle counter
+    tracing -- flag that tells whether signals are traced
+    tf -- vcd trace file
+    simulation -- the Simulation that owns the context, if any
+
+    """
 
+    __slots__ = ('signals', 'siglist', 'futureEvents', 'time', 'delta',
+                 'tracing', 'tf', 'simulation')
 
-_signals = []
+    def __init__(self):
+        self.signals = []
+        self.siglist = []
+        self.futureEvents = []
+        self.time = 0
+        self.delta = 0
+        self.tracing = 0
+        self.tf = None
+        self.simulation = None
+
+
+# the decorated block functions of the process
 _blocks = []
-_siglist = []
-_futureEvents = []
-_time = 0
-_tracing = 0
-_tf = None
+
+
+class _Local(threading.local):
+
+    def __init__(self):
+        self.context = _Context()
+
+_local = _Local()
+
+
+def _current():
+    """ Return the current context of the calling thread. """
+    return _local.context
 
 
 def now():
     """ Return the current simulation time """
-    return _time
+    return _local.context.time
@@ -74,9 +74,10 @@ class _TraceSignalsClass(object):
         if isinstance(dut, _Block):
             # now we go bottom-up: so clean up and start over
             # TODO: consider a warning for the overruled block
-            if _simulator._tracing:
-                _simulator._tracing = 0
-                _simulator._tf.close()
+            ctx = _simulator._current()
+            if ctx.tracing:
+                ctx.tracing = 0
+                ctx.tf.close()
                 os.remove(vcdpath)
         else:  # deprecated
             if _tracing:
@@ -91,7 +92,7 @@ class _TraceSignalsClass(object):
         if not isinstance(dut, _Block):
             if not callable(dut):
                 raise TraceSignalsError(_error.ArgType, "got %s" % type(dut))
-        if _simulator._tracing:
+        if _simulator._current().tracing:
             raise TraceSignalsError(_error.MultipleTraces)
 
         _tracing = 1
@@ -130,8 +131,9 @@ class _TraceSignalsClass(object):
                     shutil.copyfile(vcdpath, backup)
                 os.remove(vcdpath)
             vcdfile = open(vcdpath, 'w')
-            _simulator._tracing = 1
-            _simulator._tf = vcdfile
+            ctx = _simulator._current()
+            ctx.tracing = 1
+            ctx.tf = vcdfile
             _writeVcdHeader(vcdfile, self.timescale)
             _writeVcdSigs(vcdfile, h.hierarchy, self.tracelists)
         finally:
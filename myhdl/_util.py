@@ -74,29 +74,119 @@ def _dedent(s):
     return untokenize(result)
 
 
+# the source of functions per code object, as used by _makeAST
+_sources = {}
+
+
+def _getSource(f):
+    """ Return the dedented source of f, its compile flags, file and offset.
+
+    The source is looked up and dedented once per function code.
+
+    """
+    code = f.__code__
+    src = _sources.get(code)
+    if src is None:
+        # Need to look at the flags used to compile the original function f and
+        # pass these same flags to the compile() function. This ensures that
+        # syntax-changing __future__ imports like print_function work correctly.
+        orig_f_co_flags = code.co_flags
+        # co_flags can contain various internal flags that we can't pass to
+        # compile(), so strip them out here
+        valid_flags = 0
+        for future_feature in __future__.all_feature_names:
+            feature = getattr(__future__, future_feature)
+            valid_flags |= feature.compiler_flag
+        s = inspect.getsource(f)
+        s = _dedent(s)
+        flags = ast.PyCF_ONLY_AST | (orig_f_co_flags & valid_flags)
+        sourcefile = inspect.getsourcefile(f)
+        lineoffset = inspect.getsourcelines(f)[1] - 1
+        src = _sources[code] = (s, flags, sourcefile, lineoffset)
+    return src
+
+
 def _makeAST(f):
-    # Need to look at the flags used to compile the original function f and
-    # pass these same flags to the compile() function. This ensures that
-    # syntax-changing __future__ imports like print_function work correctly.
-    orig_f_co_flags = f.__code__.co_flags
-    # co_flags can contain various internal flags that we can't pass to
-    # compile(), so strip them out here
-    valid_flags = 0
-    for future_feature in __future__.all_feature_names:
-        feature = getattr(__future__, future_feature)
-        valid_flags |= feature.compiler_flag
-    s = inspect.getsource(f)
-    s = _dedent(s)
+    s, flags, sourcefile, lineoffset = _getSource(f)
     # use compile instead of ast.parse so that additional flags can be passed
-    flags = ast.PyCF_ONLY_AST | (orig_f_co_flags & valid_flags)
     tree = compile(s, filename='<unknown>', mode='exec',
         flags=flags, dont_inherit=True)
     # tree = ast.parse(s)
-    tree.sourcefile = inspect.getsourcefile(f)
-    tree.lineoffset = inspect.getsourcelines(f)[1] - 1
+    tree.sourcefile = sourcefile
+    tree.lineoffset = lineoffset
     return tree
 
 
+class _SymDict(dict):
+
+    """ Symbol table of a frame: its locals, with its globals as fallback.
+
+    The locals are copied, and the globals are looked up in the module
+    namespace instead. Names in hidden are not looked up in the globals.
+    Iteration returns a list of the names at the time of the call.
+
+    """
+
+    __slots__ = ('_globals', '_hidden')
+
+    def __init__(self, f_locals, f_globals, hidden=()):
+        dict.__init__(self, f_locals)
+        self._globals = f_globals
+        self._hidden = hidden
+
+    def __missing__(self, key):
+        if key in self._hidden:
+            raise KeyError(key)
+        return self._globals[key]
+
+    def __contains__(self, key):
+        if dict.__contains__(self, key):
+            return True
+        return key in self._globals and key not in self._hidden
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def keys(self):
+        names = list(dict.keys(self))
+        hidden = self._hidden
+        names.extend(n for n in self._globals
+                     if n not in hidden and not dict.__contains__(self, n))
+        return names
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def items(self):
+        return [(n, self[n]) for n in self.keys()]
+
+    def values(self):
+        return [self[n] for n in self.keys()]
+
+    def copy(self):
+        return dict(self.items())
+
+    def without(self, names):
+        """ Return a symbol table without names. """
+        hidden = frozenset(names).union(self._hidden)
+        f_locals = [(n, v) for n, v in dict.items(self) if n not in hidden]
+        return _SymDict(f_locals, self._globals, hidden)
+
+
+def _frameSymdict(frame):
+    """ Return the symbol table of a frame, without copying its globals. """
+    f_locals = frame.f_locals
+    if f_locals is frame.f_globals:
+        # module level: the globals are the locals
+        return dict(f_locals)
+    return _SymDict(f_locals, frame.f_globals)
+
+
 def _genfunc(gen):
     from myhdl._always_comb import _AlwaysComb
     from myhdl._always_seq import _AlwaysSeq
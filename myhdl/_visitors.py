@@ -4,6 +4,7 @@ import ast
 
 from myhdl._intbv import intbv
 from myhdl._Signal import _Signal, _isListOfSigs
+from myhdl._SignalArray import SignalArray
 
 
 class _SigNameVisitor(ast.NodeVisitor):
@@ -39,11 +40,14 @@ class _SigNameVisitor(ast.NodeVisitor):
         self.generic_visit(node)
 
     def visit_Name(self, node):
-        n = node.id
+        self.addName(node.id)
+
+    def addName(self, n):
+        """ Add name n, used in the current context. """
         if n not in self.symdict:
             return
         s = self.symdict[n]
-        if isinstance(s, (_Signal, intbv)) or _isListOfSigs(s):
+        if isinstance(s, (_Signal, intbv, SignalArray)) or _isListOfSigs(s):
             if self.context == 'input':
                 self.inputs.add(n)
             elif self.context == 'output':
@@ -57,7 +61,7 @@ class _SigNameVisitor(ast.NodeVisitor):
                 raise AssertionError("bug in _SigNameVisitor")
         if isinstance(s, _Signal):
             self.sigdict[n] = s
-        elif _isListOfSigs(s):
+        elif _isListOfSigs(s) or isinstance(s, SignalArray):
             self.losdict[n] = s
 
     def visit_Assign(self, node):
@@ -100,3 +104,44 @@ class _SigNameVisitor(ast.NodeVisitor):
         self.context = 'pass'
         self.generic_visit(node)
         self.context == 'input'
+
+    def bindUses(self, uses, names):
+        """ Add the names of uses recorded by _SigNameRecorder.
+
+        names -- the names of the attribute references, as resolved by
+                 _resolveAttrChains
+
+        """
+        for context, n, chain in uses:
+            if chain is not None:
+                n = names[chain]
+            self.context = context
+            self.addName(n)
+        self.context = 'input'
+
+
+class _SigNameRecorder(_SigNameVisitor):
+
+    """ Record the names that _SigNameVisitor adds, with their context.
+
+    The recording does not depend on the objects bound to the names, so
+    that it can be shared by all instances of a function. Attribute
+    references are recorded by their index in chains, as the name that
+    replaces them depends on the objects.
+
+    """
+
+    def __init__(self, index):
+        super(_SigNameRecorder, self).__init__({})
+        self.index = index
+        self.uses = []
+
+    def visit_Name(self, node):
+        self.uses.append((self.context, node.id, None))
+
+    def visit_Attribute(self, node):
+        chain = self.index.get(id(node))
+        if chain is None:
+            self.visit(node.value)
+        else:
+            self.uses.append((self.context, None, chain))
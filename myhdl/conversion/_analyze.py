@@ -32,8 +32,8 @@ import ast
 from itertools import chain
 
 import myhdl
-import myhdl
-from myhdl import *
+from myhdl import (EnumItemType, EnumType, concat, delay, downrange, intbv,
+                   modbv)
 from myhdl import ConversionError
 from myhdl._always_comb import _AlwaysComb
 from myhdl._always_seq import _AlwaysSeq
@@ -43,6 +43,7 @@ from myhdl.conversion._misc import (_error, _access, _kind,
                                     _get_argnames)
 from myhdl._extractHierarchy import _isMem, _getMemInfo, _UserCode
 from myhdl._Signal import _Signal, _WaiterList
+from myhdl._SignalArray import SignalArray
 from myhdl._ShadowSignal import _ShadowSignal, _SliceSignal, _TristateDriver
 from myhdl._util import _flatten
 from myhdl._util import _isTupleOfInts
@@ -137,6 +138,17 @@ def _analyzeSigs(hierarchy, hdl='Verilog'):
     return siglist, memlist
 
 
+def _memSigs(objs):
+    """ Return the objects, with signal arrays replaced by their signals. """
+    sigs = []
+    for obj in objs:
+        if isinstance(obj, SignalArray):
+            sigs.extend(obj)
+        else:
+            sigs.append(obj)
+    return sigs
+
+
 def _analyzeGens(top, absnames):
     genlist = []
     for g in top:
@@ -162,11 +174,12 @@ def _analyzeGens(top, absnames):
             v = _FirstPassVisitor(tree)
             v.visit(tree)
             if isinstance(g, _AlwaysComb):
-                v = _AnalyzeAlwaysCombVisitor(tree, g.senslist)
+                v = _AnalyzeAlwaysCombVisitor(tree, _memSigs(g.senslist))
             elif isinstance(g, _AlwaysSeq):
-                v = _AnalyzeAlwaysSeqVisitor(tree, g.senslist, g.reset, g.sigregs, g.varregs)
+                sigregs = g.sigregs + _memSigs(g.memregs)
+                v = _AnalyzeAlwaysSeqVisitor(tree, g.senslist, g.reset, sigregs, g.varregs)
             else:
-                v = _AnalyzeAlwaysDecoVisitor(tree, g.senslist)
+                v = _AnalyzeAlwaysDecoVisitor(tree, _memSigs(g.senslist))
             v.visit(tree)
         else:  # @instance
             f = g.gen.gi_frame
@@ -990,7 +1003,7 @@ class _AnalyzeVisitor(ast.NodeVisitor, _ConversionMixin):
             else:
                 node.obj = node.value.obj.elObj
         elif _isMem(node.value.obj):
-            node.obj = node.value.obj[0]
+            node.obj = _getMemInfo(node.value.obj).elObj
         elif isinstance(node.value.obj, _Rom):
             node.obj = int(-1)
         elif isinstance(node.value.obj, intbv):
@@ -1037,7 +1050,7 @@ class _AnalyzeVisitor(ast.NodeVisitor, _ConversionMixin):
         elif isinstance(n.obj, (_Signal, _WaiterList, delay)):
             senslist = [n.obj]
         elif _isMem(n.obj):
-            senslist = n.obj
+            senslist = list(n.obj)
         else:
             self.raiseError(node, _error.UnsupportedYield)
         node.senslist = senslist
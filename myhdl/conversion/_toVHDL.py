@@ -56,6 +56,7 @@ from myhdl._misc import downrange
 from myhdl._util import _flatten
 from myhdl._compat import integer_types, class_types, StringIO
 from myhdl._ShadowSignal import _TristateSignal, _TristateDriver
+from myhdl._SignalArray import SignalArray
 from myhdl._block import _Block
 from myhdl._getHierarchy import _getHierarchy
 from myhdl.conversion._misc import (_error, _kind, _context,
@@ -2399,6 +2400,8 @@ class _AnnotateTypesVisitor(ast.NodeVisitor, _ConversionMixin):
         if isinstance(obj, list):
             assert len(obj)
             node.vhd = inferVhdlObj(obj[0])
+        elif isinstance(obj, SignalArray):
+            node.vhd = inferVhdlObj(_getMemInfo(obj).elObj)
         elif isinstance(obj, _Ram):
             node.vhd = inferVhdlObj(obj.elObj)
         elif isinstance(obj, _Rom):
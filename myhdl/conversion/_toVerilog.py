@@ -39,7 +39,8 @@ from myhdl._compat import StringIO
 import warnings
 
 import myhdl
-from myhdl import *
+from myhdl import (EnumItemType, EnumType, concat, delay, intbv, modbv,
+                   negedge, now, posedge)
 from myhdl._compat import integer_types, class_types, PY2
 from myhdl import ToVerilogError, ToVerilogWarning
 from myhdl._extractHierarchy import (_HierExtr, _isMem, _getMemInfo,
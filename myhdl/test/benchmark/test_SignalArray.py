@@ -0,0 +1,81 @@
+""" Benchmark a RAM model on a SignalArray and on a list of signals """
+from __future__ import absolute_import, division
+
+import pytest
+
+from myhdl import (Signal, SignalArray, Simulation, StopSimulation, always,
+                   delay, instance, intbv)
+
+from .util import SCALE, timed, report
+
+tracemalloc = pytest.importorskip('tracemalloc')
+
+DEPTH = 16384
+ACCESSES = 2000
+
+
+def allocate(factory):
+    """ Return the object made by factory, and its size in bytes. """
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        obj = factory()
+        size = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    return obj, size
+
+
+def bench(mem, result, n):
+    clk = Signal(bool(0))
+    we = Signal(bool(0))
+    addr = Signal(intbv(0, min=0, max=len(mem)))
+    din = Signal(intbv(0)[32:])
+    dout = Signal(intbv(0)[32:])
+
+    @always(delay(5))
+    def clkgen():
+        clk.next = not clk
+
+    @always(clk.posedge)
+    def ram():
+        if we:
+            mem[addr].next = din
+        dout.next = mem[addr]
+
+    @instance
+    def stimulus():
+        for i in range(n):
+            we.next = i % 2
+            addr.next = (i * 4099) % len(mem)
+            din.next = i
+            yield clk.negedge
+            result.append(int(dout))
+        raise StopSimulation
+
+    return clkgen, ram, stimulus
+
+
+def simulate(mem, n):
+    result = []
+    t, r = timed(Simulation(bench(mem, result, n)).run, quiet=1)
+    return t, result
+
+
+def test_ram():
+    depth = DEPTH * SCALE
+    n = ACCESSES * SCALE
+    make = lambda: SignalArray(intbv(0)[32:], depth)
+    makeref = lambda: [Signal(intbv(0)[32:]) for i in range(depth)]
+    tm, mem = timed(make)
+    tref, ref = timed(makeref)
+    size = allocate(make)[1]
+    refsize = allocate(makeref)[1]
+    assert size * 10 < refsize
+    t, res = simulate(mem, n)
+    trefsim, refres = simulate(ref, n)
+    assert res == refres
+    report("RAM of %s words, %s accesses" % (depth, n),
+           ['memory', 'bytes', 'create [s]', 'simulate [s]'],
+           [['list of signals', refsize, tref, trefsim],
+            ['SignalArray', size, tm, t]])
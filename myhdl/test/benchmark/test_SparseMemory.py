@@ -0,0 +1,83 @@
+""" Benchmark a sparse memory against a dictionary of words """
+from __future__ import absolute_import, division
+
+import random
+from array import array
+
+import pytest
+
+from myhdl import SparseMemory
+
+from .util import SCALE, timed, report
+
+tracemalloc = pytest.importorskip('tracemalloc')
+
+BURSTS = 1000
+BURST = 64
+WORDS = 2**20
+
+
+def allocate(func, *args):
+    """ Return the result of func, and the bytes it allocated. """
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        result = func(*args)
+        size = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def bursts(mem, bases):
+    """ Write and read back bursts of words, as a DDR model does. """
+    total = 0
+    for base in bases:
+        for i in range(BURST):
+            mem[base + i] = (base + i) & 0xffffffff
+        for i in range(BURST):
+            total += mem[base + i]
+    return mem, total
+
+
+def test_bursts():
+    random.seed(1)
+    bases = [random.randrange(0, 2**32 - BURST, BURST)
+             for i in range(BURSTS * SCALE)]
+    make = lambda: SparseMemory(2**32, width=32, pagesize=64)
+    t, res = timed(bursts, make(), bases)
+    tref, ref = timed(bursts, {}, bases)
+    assert res[1] == ref[1]
+    size = allocate(bursts, make(), bases)[1]
+    refsize = allocate(bursts, {}, bases)[1]
+    assert size < refsize
+    report("%s bursts of %s words in 4 GB" % (len(bases), BURST),
+           ['memory', 'bytes', 'time [s]'],
+           [['dict', refsize, tref], ['SparseMemory', size, t]])
+
+
+def load(mem, filename, addrs):
+    mem.load(filename)
+    return [mem[a] for a in addrs]
+
+
+def loadall(filename, addrs):
+    words = array('I')
+    with open(filename, 'rb') as f:
+        words.frombytes(f.read())
+    return [words[a] for a in addrs]
+
+
+def test_load(tmpdir):
+    n = WORDS * SCALE
+    filename = str(tmpdir.join('mem.bin'))
+    with open(filename, 'wb') as f:
+        array('I', range(n)).tofile(f)
+    random.seed(2)
+    addrs = [random.randrange(n) for i in range(1000)]
+    t, res = timed(load, SparseMemory(2**32, width=32), filename, addrs)
+    tref, ref = timed(loadall, filename, addrs)
+    assert res == ref == addrs
+    report("Load %s words, read 1000 of them" % n,
+           ['memory', 'time [s]'],
+           [['array of all words', tref], ['SparseMemory', t]])
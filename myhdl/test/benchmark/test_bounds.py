@@ -0,0 +1,43 @@
+""" Benchmark the bound handling of counters and accumulators """
+from __future__ import absolute_import
+
+from myhdl import Signal, intbv, modbv
+
+from .util import SCALE, timed, report
+
+N = 100000
+
+
+def counter(sig, n):
+    for i in range(n):
+        sig.next = sig.next + 1
+    return int(sig.next)
+
+
+def accumulator(sig, n):
+    for i in range(n):
+        sig.next = sig.next + 3 * i
+    return int(sig.next)
+
+
+def test_bounds():
+    rows = []
+    n = N * SCALE
+    for name, func, make in [
+            ('counter, intbv[32:]', counter, lambda: intbv(0)[32:]),
+            ('counter, modbv[8:]', counter, lambda: modbv(0)[8:]),
+            ('counter, signed modbv', counter,
+             lambda: modbv(0, min=-128, max=128)),
+            ('accumulator, modbv[16:]', accumulator, lambda: modbv(0)[16:]),
+            ('accumulator, intbv()', accumulator, lambda: intbv(0))]:
+        sig = Signal(make())
+        t, res = timed(func, sig, n)
+        sig = Signal(make())
+        # reference: the generic setter, that calls _handleBounds
+        sig._setNextVal = sig._setNextIntbv
+        tref, ref = timed(func, sig, n)
+        assert res == ref
+        rows.append([name, tref, t, tref / t])
+    report("Bound handling, %s assignments" % n,
+           ['signal', '_handleBounds [s]', 'precomputed [s]', 'speedup'],
+           rows)
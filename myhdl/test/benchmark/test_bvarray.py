@@ -0,0 +1,45 @@
+""" Benchmark bulk fixbv quantization against per-sample conversion """
+from __future__ import absolute_import
+
+from math import sin
+
+from myhdl import fixbv
+
+from .util import SCALE, timed, report
+
+N = 20000
+
+
+def scalar(samples):
+    fmt = fixbv(0, -15, min=-1.0, max=1.0)
+    codes = [fixbv(v, -15).fixto(fmt, overflow='saturate')._val
+             for v in samples]
+    back = [float(fixbv(c, -15)) for c in codes]
+    return codes, back
+
+
+def bulk(samples):
+    a = fixbv.quantize_array(samples, -15, min=-1.0, max=1.0,
+                             overflow='saturate')
+    return a.tolist(), list(a.tofloat())
+
+
+def test_quantize():
+    n = N * SCALE
+    samples = [1.1 * sin(0.01 * i) for i in range(n)]
+    rows = []
+    tref, ref = timed(scalar, samples)
+    t, res = timed(bulk, samples)
+    assert res == ref
+    rows.append(['list', tref, t, tref / t])
+    try:
+        import numpy
+    except ImportError:
+        pass
+    else:
+        t, res = timed(bulk, numpy.array(samples))
+        assert res == ref
+        rows.append(['numpy', tref, t, tref / t])
+    report("Quantization of %s samples" % n,
+           ['input', 'fixbv [s]', 'quantize_array [s]', 'speedup'],
+           rows)
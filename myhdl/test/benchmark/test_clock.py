@@ -0,0 +1,78 @@
+""" Benchmark the Clock signal against clock generators """
+from __future__ import absolute_import
+
+from myhdl import (Clock, Signal, Simulation, always, block, delay, instance,
+                   modbv)
+
+from .util import SCALE, timed, report
+
+CYCLES = 2000
+
+
+@block
+def generator(clk, period):
+
+    @instance
+    def clkgen():
+        while 1:
+            yield delay(period // 2)
+            clk.next = not clk
+
+    return clkgen
+
+
+@block
+def static(clk, period):
+
+    @always(delay(period // 2))
+    def clkgen():
+        clk.next = not clk
+
+    return clkgen
+
+
+@block
+def domains(kind, n, counts):
+    insts = []
+    for i, count in enumerate(counts):
+        period = 10 + 2 * i
+        if kind is None:
+            clk = Clock(period)
+        else:
+            clk = Signal(bool(0))
+            insts.append(kind(clk, period))
+        insts.append(counter(clk, count))
+    return insts
+
+
+@block
+def counter(clk, count):
+
+    @always(clk.posedge)
+    def logic():
+        count.next = count + 1
+
+    return logic
+
+
+def simulate(kind, n):
+    counts = [Signal(modbv(0)[32:]) for i in range(n)]
+    sim = Simulation(domains(kind, n, counts))
+    t, r = timed(sim.run, 10 * CYCLES * SCALE, quiet=1)
+    result = [int(count) for count in counts]
+    sim.quit()
+    return t, result
+
+
+def test_clock():
+    rows = []
+    for n in (1, 4):
+        tg, ref = simulate(generator, n)
+        ts, res = simulate(static, n)
+        assert res == ref
+        tn, res = simulate(None, n)
+        assert res == ref
+        rows.append([n, tg, ts, tn, tg / tn])
+    report("Clock signals, %s time steps" % (10 * CYCLES * SCALE),
+           ['clocks', 'generator [s]', 'always [s]', 'Clock [s]', 'speedup'],
+           rows)
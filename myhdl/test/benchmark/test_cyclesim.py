@@ -0,0 +1,74 @@
+""" Benchmark cycle-based against event-driven simulation """
+from __future__ import absolute_import
+
+from myhdl import (Signal, ResetSignal, Simulation, StopSimulation, always,
+                   always_comb, always_seq, block, delay, modbv)
+
+from .util import SCALE, timed, report
+
+CYCLES = 500
+
+
+@block
+def stage(clk, reset, din, dout):
+    acc = Signal(modbv(0)[16:])
+    mix = Signal(modbv(0)[16:])
+
+    @always_seq(clk.posedge, reset=reset)
+    def seq():
+        acc.next = acc + din
+
+    @always_comb
+    def comb():
+        mix.next = acc ^ (acc >> 3)
+
+    @always_comb
+    def out():
+        dout.next = mix + acc
+
+    return seq, comb, out
+
+
+@block
+def pipeline(n, result):
+    clk = Signal(bool(0))
+    reset = ResetSignal(0, active=1, isasync=False)
+    sigs = [Signal(modbv(i)[16:]) for i in range(n + 1)]
+    stages = [stage(clk, reset, sigs[i], sigs[i + 1]) for i in range(n)]
+    cycles = [0]
+
+    @always_seq(clk.posedge, reset=reset)
+    def stimulus():
+        sigs[0].next = sigs[0] + 3
+
+    @always(delay(5))
+    def clkgen():
+        clk.next = not clk
+
+    @always(clk.posedge)
+    def monitor():
+        cycles[0] += 1
+        result.append(int(sigs[n]))
+        if cycles[0] == CYCLES:
+            raise StopSimulation
+
+    return stages, stimulus, clkgen, monitor
+
+
+def simulate(n, mode):
+    result = []
+    sim = Simulation(pipeline(n, result), mode=mode)
+    t, r = timed(sim.run, quiet=1)
+    return t, result
+
+
+def test_pipeline():
+    rows = []
+    for n in (10 * SCALE, 50 * SCALE):
+        te, ref = simulate(n, 'event')
+        tc, res = simulate(n, 'cycle')
+        assert res == ref
+        rows.append([n, te, tc, te / tc])
+    report("Cycle-based simulation, %s clock cycles" % CYCLES,
+           ['stages', 'event [s]', 'cycle [s]', 'speedup'],
+           rows)
@@ -0,0 +1,48 @@
+""" Benchmark stimulus from a generator and from drive """
+from __future__ import absolute_import
+
+from myhdl import Signal, Simulation, delay, drive, instance, intbv
+
+from .util import SCALE, timed, report
+
+SAMPLES = 200000
+
+
+def generator(sig, values):
+    @instance
+    def stimulus():
+        for val in values:
+            sig.next = val
+            yield delay(1)
+    return stimulus
+
+
+def driver(sig, values):
+    return drive(sig, values, on=delay(1))
+
+
+def simulate(stimulus, values):
+    sig = Signal(intbv(0)[16:])
+    result = []
+
+    def monitor():
+        while 1:
+            yield sig
+            result.append(sig._val._val)
+
+    sim = Simulation(stimulus(sig, values), monitor())
+    t = timed(sim.run, len(values), quiet=1)[0]
+    sim.quit()
+    return t, result
+
+
+def test_drive():
+    n = SAMPLES * SCALE
+    values = [(i * 7919) % 65536 for i in range(n)]
+    tgen, ref = simulate(generator, values)
+    t, res = simulate(driver, values)
+    assert res == ref
+    report("Stimulus of %s samples" % n,
+           ['stimulus', 'simulate [s]'],
+           [['generator', tgen],
+            ['drive', t]])
@@ -0,0 +1,110 @@
+""" Benchmark the elaboration of a deep and wide block hierarchy """
+from __future__ import absolute_import
+
+import inspect
+
+from myhdl import Signal, always, always_comb, block, intbv
+from myhdl import (_always, _always_comb, _always_seq, _block, _instance)
+
+from .util import SCALE, timed, report
+
+DEPTH = 3
+WIDTH = 4
+
+_MODULES = (_always, _always_comb, _always_seq, _instance)
+
+
+def _instanceCallInfo():
+    # reference: call info from inspect.stack, with copied globals
+    funcrec = inspect.stack()[2]
+    frame = funcrec[0]
+    symdict = dict(frame.f_globals)
+    symdict.update(frame.f_locals)
+    modctxt = False
+    f_locals = inspect.stack()[3][0].f_locals
+    if 'self' in f_locals:
+        modctxt = isinstance(f_locals['self'], _block._Block)
+    return _instance._CallInfo(funcrec[3], modctxt, symdict)
+
+
+def _blockCallInfo():
+    stack = inspect.stack()
+    callerrec = None
+    funcrec = stack[3]
+    if len(stack) > 4:
+        callerrec = stack[4]
+    if funcrec[3] == '<listcomp>':
+        funcrec = stack[4]
+        callerrec = stack[5] if len(stack) > 5 else None
+    frame = funcrec[0]
+    symdict = dict(frame.f_globals)
+    symdict.update(frame.f_locals)
+    modctxt = False
+    if callerrec is not None:
+        f_locals = callerrec[0].f_locals
+        if 'self' in f_locals:
+            modctxt = isinstance(f_locals['self'], _block._Block)
+    return _block._CallInfo(funcrec[3], modctxt, symdict)
+
+
+@block
+def leaf(a, b, clk, q):
+    s = Signal(intbv(0)[9:])
+
+    @always_comb
+    def add():
+        s.next = a + b
+
+    @always(clk.posedge)
+    def reg():
+        q.next = s[8:]
+
+    return add, reg
+
+
+@block
+def node(a, b, clk, q, depth):
+    if depth == 0:
+        return leaf(a, b, clk, q)
+    qs = [Signal(intbv(0)[8:]) for i in range(WIDTH)]
+    subs = [node(a, qs[i - 1] if i else b, clk, qs[i], depth - 1)
+            for i in range(WIDTH)]
+
+    @always_comb
+    def out():
+        q.next = qs[-1]
+
+    return subs, out
+
+
+def elaborate(depth):
+    sigs = [Signal(intbv(0)[8:]) for i in range(3)]
+    top = node(sigs[0], sigs[1], Signal(bool(0)), sigs[2], depth)
+    names = []
+    todo = [top]
+    while todo:
+        b = todo.pop()
+        names.append((b.callername, b.modctxt, sorted(b.sigdict)))
+        todo.extend(s for s in b.subs if isinstance(s, _block._Block))
+    return names
+
+
+def test_elaborate():
+    depth = DEPTH + SCALE - 1
+    t, res = timed(elaborate, depth)
+    saved = [m._getCallInfo for m in _MODULES], _block._getCallInfo
+    for m in _MODULES:
+        m._getCallInfo = _instanceCallInfo
+    _block._getCallInfo = _blockCallInfo
+    try:
+        tref, ref = timed(elaborate, depth)
+    finally:
+        for m, f in zip(_MODULES, saved[0]):
+            m._getCallInfo = f
+        _block._getCallInfo = saved[1]
+    assert res == ref
+    report("Hierarchy of depth %s and width %s, %s blocks" %
+           (depth, WIDTH, len(res)),
+           ['call info', 'elaborate [s]', 'speedup'],
+           [['inspect.stack', tref, 1.0],
+            ['frames', t, tref / t]])
@@ -0,0 +1,109 @@
+""" Benchmark fixbv arithmetic on a FIR filter """
+from __future__ import absolute_import
+
+from math import cos, floor, pi
+
+from myhdl import (Signal, Simulation, StopSimulation, always, block, delay,
+                   fixbv, instance, intbv)
+
+from .util import SCALE, timed, report
+
+SAMPLES = 200
+SHIFT = -15
+
+
+def coefficients(n):
+    """ Return the coefficients of a low pass filter, on a 2**-16 grid. """
+    coef = [0.54 - 0.46 * cos(2 * pi * i / (n - 1)) for i in range(n)]
+    total = sum(coef)
+    return [floor(c / total * 2**16) / 2**16 for c in coef]
+
+
+@block
+def firfilt(clock, sig_in, sig_out, coef):
+    """ The FIR filter of the fixbv example, with fixbv taps. """
+    taps = [Signal(fixbv(0, shift=sig_in.shift, min=sig_in.min,
+                         max=sig_in.max))
+            for ii in range(len(coef))]
+    coef = tuple(coef)
+    mshift = 2
+
+    @always(clock.posedge)
+    def rtl_sop():
+        sop = 0.0
+        for ii in range(len(coef)):
+            if ii == 0:
+                taps[ii].next = sig_in
+            else:
+                taps[ii].next = taps[ii - 1]
+            c = coef[ii]
+            sop = sop + (taps[ii] * c)
+        sig_out.next = (sop >> mshift)
+
+    return rtl_sop
+
+
+@block
+def firfilt_int(clock, sig_in, sig_out, coef):
+    """ Reference: the same filter on scaled integers. """
+    taps = [Signal(intbv(0, min=sig_in.min, max=sig_in.max))
+            for ii in range(len(coef))]
+    coef = tuple(coef)
+    mshift = 2
+
+    @always(clock.posedge)
+    def rtl_sop():
+        sop = 0
+        for ii in range(len(coef)):
+            if ii == 0:
+                taps[ii].next = sig_in
+            else:
+                taps[ii].next = taps[ii - 1]
+            sop += int(floor(int(taps[ii]) * coef[ii] + 0.5))
+        sig_out.next = (sop + (1 << mshift - 1)) >> mshift
+
+    return rtl_sop
+
+
+@block
+def bench(filt, make, ntaps, result):
+    clock = Signal(bool(0))
+    sig_in = Signal(make())
+    sig_out = Signal(make())
+    samples = [0.9 * cos(0.001 * i * i) for i in range(SAMPLES)]
+
+    @always(delay(5))
+    def clkgen():
+        clock.next = not clock
+
+    @instance
+    def stimulus():
+        for x in samples:
+            sig_in.next = int(floor(x * 2**-SHIFT + 0.5))
+            yield clock.negedge
+            result.append(int(sig_out.val))
+        raise StopSimulation
+
+    return filt(clock, sig_in, sig_out, coefficients(ntaps)), clkgen, \
+        stimulus
+
+
+def simulate(filt, make, ntaps):
+    result = []
+    sim = Simulation(bench(filt, make, ntaps, result))
+    t, r = timed(sim.run, quiet=1)
+    return t, result
+
+
+def test_fir():
+    rows = []
+    for ntaps in (8 * SCALE, 32 * SCALE):
+        t, res = simulate(
+            firfilt, lambda: fixbv(0, SHIFT, min=-1.0, max=1.0), ntaps)
+        tref, ref = simulate(
+            firfilt_int, lambda: intbv(0, min=-2**15, max=2**15), ntaps)
+        assert res == ref
+        rows.append([ntaps, tref, t, t / tref])
+    report("FIR filter, %s samples" % SAMPLES,
+           ['taps', 'intbv [s]', 'fixbv [s]', 'fixbv / intbv'],
+           rows)
@@ -0,0 +1,69 @@
+""" Benchmark the import of myhdl, without and with conversion and tracing """
+from __future__ import absolute_import, division
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import myhdl
+
+from .util import SCALE, report
+
+REPEAT = 5
+
+LAZY = "import myhdl"
+EAGER = "import myhdl, myhdl.conversion, myhdl._traceSignals"
+
+CHECK = ("import sys\n"
+         "%s\n"
+         "print(' '.join(sorted(m for m in sys.modules "
+         "if m.startswith('myhdl'))))\n")
+
+
+def python(code, *options):
+    """ Run code in a new interpreter and return its output and errors. """
+    env = dict(os.environ)
+    path = os.path.dirname(os.path.dirname(os.path.abspath(myhdl.__file__)))
+    env['PYTHONPATH'] = os.pathsep.join([path, env.get('PYTHONPATH', '')])
+    p = subprocess.Popen([sys.executable] + list(options) + ['-c', code],
+                         env=env, stdout=subprocess.PIPE,
+                         stderr=subprocess.PIPE, universal_newlines=True)
+    out, err = p.communicate()
+    assert p.returncode == 0, err
+    return out, err
+
+
+def importtime(code):
+    """ Return the cumulative import time of the myhdl modules in code.
+
+    The time is in microseconds, as reported by python -X importtime for
+    the modules that code imports directly.
+
+    """
+    err = python(code, '-X', 'importtime')[1]
+    total = 0
+    for line in err.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].startswith(' myhdl'):
+            total += int(fields[1])
+    return total
+
+
+# python -X importtime and the lazy import need Python 3.7
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason="myhdl is imported eagerly")
+def test_import():
+    n = REPEAT * SCALE
+    lazy = min(importtime(LAZY) for i in range(n))
+    eager = min(importtime(EAGER) for i in range(n))
+    modules = python(CHECK % LAZY)[0].split()
+    assert 'myhdl.conversion' not in modules
+    assert 'myhdl._traceSignals' not in modules
+    # the star import still imports everything
+    star = python(CHECK % "from myhdl import *")[0]
+    assert star == python(CHECK % EAGER)[0]
+    report("import myhdl, best of %s" % n,
+           ['import', 'time [ms]'],
+           [['eager', eager / 1000], ['lazy', lazy / 1000]])
@@ -0,0 +1,48 @@
+""" Benchmark the startup of a simulation with many generator processes """
+from __future__ import absolute_import
+
+from myhdl import Signal, Simulation, intbv
+from myhdl import _Waiter
+
+from .util import SCALE, timed, report
+
+INSTANCES = 2000
+
+
+class _NoCache(dict):
+    # reference: the source is parsed for each generator
+    def __setitem__(self, key, value):
+        pass
+
+
+def process(a, b, r):
+    while 1:
+        yield a, b
+        r.next = a + b
+
+
+def startup(n):
+    a, b = Signal(intbv(0)[8:]), Signal(intbv(0)[8:])
+    gens = [process(a, b, Signal(intbv(0)[9:])) for i in range(n)]
+    sim = Simulation(gens)
+    kinds = [type(w).__name__ for w in sim._waiters]
+    sim.quit()
+    return kinds
+
+
+def test_infer():
+    n = INSTANCES * SCALE
+    _Waiter._inferCache.clear()
+    t, res = timed(startup, n)
+    cache = _Waiter._inferCache
+    _Waiter._inferCache = _NoCache()
+    try:
+        tref, ref = timed(startup, n)
+    finally:
+        _Waiter._inferCache = cache
+    assert res == ref
+    assert res[0] == '_SignalTupleWaiter'
+    report("Startup of %s generator processes" % n,
+           ['waiter inference', 'startup [s]'],
+           [['parse per generator', tref],
+            ['cache per code object', t]])
@@ -0,0 +1,65 @@
+""" Benchmark the analysis of many instances of the same functions """
+from __future__ import absolute_import
+
+from myhdl import Signal, intbv
+from myhdl import _instance, _util
+from myhdl._always import _Always
+from myhdl._always_comb import _AlwaysComb
+from myhdl._instance import _CallInfo, _Instantiator
+
+from .util import SCALE, timed, report
+
+CELLS = 1000
+
+
+class _NoCache(dict):
+    # reference: the functions are parsed and analyzed for each instance
+    def __setitem__(self, key, value):
+        pass
+
+
+def cell(a, b, clk, q):
+    # the processes of a cell, as the decorators create them; the call
+    # info is given, so that only the analysis of the functions is timed
+    s = Signal(intbv(0)[9:])
+    callinfo = _CallInfo('cell', True, locals())
+
+    def add():
+        s.next = a + b
+
+    def reg():
+        q.next = s[8:]
+
+    def check():
+        while 1:
+            yield q
+            assert q < 256
+
+    return [_AlwaysComb(add, callinfo),
+            _Always(reg, [clk.posedge], callinfo),
+            _Instantiator(check, callinfo)]
+
+
+def elaborate(n):
+    clk = Signal(bool(0))
+    sigs = [Signal(intbv(0)[8:]) for i in range(n + 1)]
+    insts = []
+    for i in range(n):
+        insts.extend(cell(sigs[i], sigs[i + 1], clk, sigs[i]))
+    return [(sorted(g.inputs), sorted(g.outputs)) for g in insts]
+
+
+def test_instances():
+    n = CELLS * SCALE
+    t, res = timed(elaborate, n)
+    usages, sources = _instance._usages, _util._sources
+    _instance._usages, _util._sources = _NoCache(), _NoCache()
+    try:
+        tref, ref = timed(elaborate, n)
+    finally:
+        _instance._usages, _util._sources = usages, sources
+    assert res == ref
+    report("Analysis of %s cells of 3 processes" % n,
+           ['analysis', 'elaborate [s]'],
+           [['per instance', tref],
+            ['per function', t]])
@@ -0,0 +1,58 @@
+""" Benchmark levelized against event-driven always_comb evaluation """
+from __future__ import absolute_import
+
+from myhdl import (Signal, Simulation, StopSimulation, always_comb, block,
+                   delay, instance, modbv)
+
+from .util import SCALE, timed, report
+
+STEPS = 500
+
+
+@block
+def link(a, x, b):
+
+    @always_comb
+    def comb():
+        b.next = a + x
+
+    return comb
+
+
+@block
+def chain(n, result):
+    # every block reads the chain input and its predecessor, so the
+    # event-driven kernel wakes up each block once per upstream delta
+    sigs = [Signal(modbv(0)[16:]) for i in range(n + 1)]
+    x = sigs[0]
+    links = [link(sigs[i], x, sigs[i + 1]) for i in range(n)]
+
+    @instance
+    def stimulus():
+        for i in range(STEPS):
+            x.next = x + 7
+            yield delay(10)
+            result.append(int(sigs[n]))
+        raise StopSimulation
+
+    return links, stimulus
+
+
+def simulate(n, levelize):
+    result = []
+    sim = Simulation(chain(n, result), levelize=levelize)
+    t, r = timed(sim.run, quiet=1)
+    return t, result, sim.levelizer
+
+
+def test_chain():
+    rows = []
+    for n in (5 * SCALE, 20 * SCALE):
+        te, ref, lev = simulate(n, False)
+        tl, res, lev = simulate(n, True)
+        assert res == ref
+        rows.append([n, te, tl, te / tl, lev.evaluations, lev.saved])
+    report("Levelized always_comb evaluation, %s steps" % STEPS,
+           ['blocks', 'event [s]', 'levelized [s]', 'speedup',
+            'evaluations', 'saved'],
+           rows)
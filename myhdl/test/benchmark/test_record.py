@@ -0,0 +1,58 @@
+""" Benchmark a monitor that appends to lists and a recorder """
+from __future__ import absolute_import
+
+from myhdl import (Signal, Simulation, always, delay, instance, intbv,
+                   record)
+
+from .util import SCALE, timed, report
+
+SAMPLES = 100000
+NRSIGS = 4
+
+
+def design(sigs):
+    @instance
+    def stimulus():
+        i = 0
+        while 1:
+            yield delay(1)
+            i += 1
+            for k, sig in enumerate(sigs):
+                sig.next = (i * (k + 3)) % 65536
+    return stimulus
+
+
+def monitor(sigs, n):
+    columns = [[] for sig in sigs]
+
+    @always(delay(1))
+    def mon():
+        for column, sig in zip(columns, sigs):
+            column.append(int(sig))
+
+    return mon, columns
+
+
+def recorder(sigs, n):
+    rec = record(sigs, on=delay(1), depth=n)
+    return rec, rec
+
+
+def simulate(sampler, n):
+    sigs = [Signal(intbv(0)[16:]) for i in range(NRSIGS)]
+    inst, columns = sampler(sigs, n)
+    sim = Simulation(design(sigs), inst)
+    t = timed(sim.run, n, quiet=1)[0]
+    sim.quit()
+    return t, [list(columns[i])[:n - 1] for i in range(NRSIGS)]
+
+
+def test_record():
+    n = SAMPLES * SCALE
+    tref, ref = simulate(monitor, n)
+    t, res = simulate(recorder, n)
+    assert res == ref
+    report("Sampling %s signals %s times" % (NRSIGS, n),
+           ['monitor', 'simulate [s]'],
+           [['append to lists', tref],
+            ['record', t]])
@@ -0,0 +1,77 @@
+""" Benchmark the future event queues with many pending events """
+from __future__ import absolute_import
+
+import random
+from operator import itemgetter
+
+from myhdl import Simulation, delay
+from myhdl._scheduler import _queues
+
+from .util import SCALE, timed, report
+
+DURATION = 1000
+
+
+class _ListQueue(object):
+
+    """ Reference queue: the sorted list that the kernel used to have. """
+
+    def __init__(self):
+        self._events = []
+
+    def __len__(self):
+        return len(self._events)
+
+    def load(self, events):
+        self._events.extend(events)
+
+    def pop(self):
+        _futureEvents = self._events
+        _futureEvents.sort(key=itemgetter(0))
+        t = _futureEvents[0][0]
+        events = []
+        while _futureEvents:
+            newt, event = _futureEvents[0]
+            if newt == t:
+                events.append(event)
+                del _futureEvents[0]
+            else:
+                break
+        return t, events
+
+
+def bench(n, counter):
+
+    def proc(period):
+        while 1:
+            yield delay(period)
+            counter[0] += 1
+
+    random.seed(n)
+    return [proc(random.randrange(10, 200)) for i in range(n)]
+
+
+def simulate(n, scheduler):
+    counter = [0]
+    sim = Simulation(bench(n, counter), scheduler=scheduler)
+    sim.run(DURATION, quiet=1)
+    sim.quit()
+    return counter[0]
+
+
+def test_pending_events(monkeypatch):
+    monkeypatch.setitem(_queues, 'list', _ListQueue)
+    rows = []
+    for n in (100 * SCALE, 1000 * SCALE, 5000 * SCALE):
+        row = [n]
+        results = set()
+        for scheduler in ('list', 'heap', 'calendar'):
+            t, events = timed(simulate, n, scheduler)
+            results.add(events)
+            row.append(t)
+        row.append(events)
+        rows.append(row)
+        assert len(results) == 1
+    report("Future event queues, %s timesteps" % DURATION,
+           ['pending', 'list [s]', 'heap [s]', 'calendar [s]', 'events'],
+           rows)
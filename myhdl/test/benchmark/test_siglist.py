@@ -0,0 +1,77 @@
+""" Benchmark bit-wise register updates through the pending-update list """
+from __future__ import absolute_import
+
+from myhdl import (Signal, Simulation, StopSimulation, always, delay,
+                   instance, intbv)
+from myhdl._Signal import _Signal
+from myhdl._simulator import _local
+
+from .util import SCALE, timed, report
+
+CYCLES = 200
+
+
+def _getNext(self):
+    _local.context.siglist.append(self)
+    return self._next
+
+
+def _setNext(self, val):
+    if isinstance(val, _Signal):
+        val = val._val
+    self._setNextVal(val)
+    _local.context.siglist.append(self)
+
+
+# reference: the append-only siglist that the kernel used to have
+_appendOnly = property(_getNext, _setNext)
+
+
+def bench(width, result, counter):
+    reg = Signal(intbv(0)[width:])
+    clk = Signal(bool(0))
+
+    @always(delay(5))
+    def clkgen():
+        clk.next = not clk
+
+    @always(clk.posedge)
+    def shift():
+        # register updated bit by bit
+        for i in range(width - 1, 0, -1):
+            reg.next[i] = reg[i - 1]
+        reg.next[0] = not reg[width - 1]
+        counter[0] += len(_local.context.siglist)
+
+    @instance
+    def monitor():
+        for i in range(CYCLES):
+            yield clk.negedge
+            result.append(int(reg))
+        raise StopSimulation
+
+    return clkgen, shift, monitor
+
+
+def simulate(width):
+    result = []
+    counter = [0]
+    sim = Simulation(bench(width, result, counter))
+    t, r = timed(sim.run, quiet=1)
+    return t, result, counter[0]
+
+
+def test_bitwise(monkeypatch):
+    rows = []
+    for width in (16 * SCALE, 128 * SCALE):
+        t, res, n = simulate(width)
+        with monkeypatch.context() as m:
+            m.setattr(_Signal, 'next', _appendOnly)
+            tref, ref, nref = simulate(width)
+        assert res == ref
+        assert n == CYCLES
+        rows.append([width, nref, n, tref, t, tref / t])
+    report("Bit-wise register updates, %s clock cycles" % CYCLES,
+           ['width', 'updates (list)', 'updates (set)',
+            'list [s]', 'set [s]', 'speedup'],
+           rows)
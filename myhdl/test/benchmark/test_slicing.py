@@ -0,0 +1,97 @@
+""" Benchmark intbv slicing on the arith_lib example designs """
+from __future__ import absolute_import
+
+import os
+import sys
+
+import pytest
+
+from myhdl import Signal, Simulation, StopSimulation, delay, instance, intbv
+from myhdl._compat import long
+from myhdl._intbv import intbv as _intbv
+from myhdl._modbv import modbv as _modbv
+
+from .util import SCALE, timed, report
+
+ARITH_LIB = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir,
+                         os.pardir, 'example', 'arith_lib')
+
+WIDTH = 8
+REPEAT = 4
+
+
+def _getitem(self, key):
+    # reference: the slicing that constructs and checks each result
+    if isinstance(key, slice):
+        i, j = key.start, key.stop
+        if j is None:  # default
+            j = 0
+        j = int(j)
+        if j < 0:
+            raise ValueError("intbv[i:j] requires j >= 0")
+        if i is None:  # default
+            return self._sliceType(self._val >> j)
+        i = int(i)
+        if i <= j:
+            raise ValueError("intbv[i:j] requires i > j")
+        return self._sliceType((self._val & (long(1) << i) - 1) >> j,
+                               _nrbits=i - j)
+    else:
+        i = int(key)
+        return bool((self._val >> i) & 0x1)
+
+
+@pytest.fixture(scope='module')
+def arith_lib():
+    if not os.path.isdir(ARITH_LIB):
+        pytest.skip("arith_lib example not available")
+    sys.path.insert(0, ARITH_LIB)
+    try:
+        import arith_utils
+        import Dec
+        import LeadZeroDet
+    finally:
+        sys.path.remove(ARITH_LIB)
+    return arith_utils, Dec.Dec, LeadZeroDet.LeadZeroDet
+
+
+def simulate(design, speed, arith_utils, n):
+    A = Signal(intbv(0))
+    Z = Signal(intbv(0))
+    result = []
+    inst = design(WIDTH, speed, A, Z, architecture=arith_utils.STRUCTURE)
+
+    @instance
+    def stimulus():
+        for k in range(n):
+            for i in range(1, 2**WIDTH):
+                A.next = intbv(i)
+                yield delay(10)
+                result.append(int(Z))
+        raise StopSimulation
+
+    t = timed(Simulation(inst, stimulus).run, quiet=1)[0]
+    return t, result
+
+
+def test_slicing(arith_lib):
+    arith_utils = arith_lib[0]
+    n = REPEAT * SCALE
+    rows = []
+    for name, design in [('Dec', arith_lib[1]),
+                         ('LeadZeroDet', arith_lib[2])]:
+        for speed in ('SLOW', 'FAST'):
+            s = getattr(arith_utils, speed)
+            t, res = simulate(design, s, arith_utils, n)
+            getitem = _intbv.__getitem__
+            _intbv.__getitem__ = _getitem
+            try:
+                tref, ref = simulate(design, s, arith_utils, n)
+            finally:
+                _intbv.__getitem__ = getitem
+            assert res == ref
+            rows.append(['%s, %s' % (name, speed), tref, t, tref / t])
+    assert _modbv.__getitem__ is _intbv.__getitem__
+    report("Structural arith_lib designs, %s bits" % WIDTH,
+           ['design', 'constructor [s]', 'descriptors [s]', 'speedup'],
+           rows)
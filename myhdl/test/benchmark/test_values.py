@@ -0,0 +1,68 @@
+""" Benchmark the memory use and speed of slotted intbv values """
+from __future__ import absolute_import, division
+
+import pytest
+
+from myhdl import Signal, intbv, fixbv
+
+from .util import SCALE, timed, report
+
+tracemalloc = pytest.importorskip('tracemalloc')
+
+N = 10000
+
+
+class _dictbv(intbv):
+    # reference: a subclass without __slots__ has a __dict__, like intbv
+    # used to have
+    pass
+
+
+class _dictfixbv(fixbv):
+    pass
+
+
+def allocate(factory, n):
+    """ Return the objects made by factory, and their bytes per object. """
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        objs = [factory() for i in range(n)]
+        size = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    return objs, size / n
+
+
+def count(sigs):
+    for sig in sigs:
+        sig.next = int(sig) + 1
+        sig._update()
+    return [int(sig) for sig in sigs]
+
+
+@pytest.mark.parametrize('name, factory, reference', [
+    ('intbv', lambda: intbv(0)[32:], lambda: _dictbv(0, _nrbits=32)),
+    ('fixbv', lambda: fixbv(0.0, -8, min=-1.0, max=1.0),
+     lambda: _dictfixbv(0.0, -8, min=-1.0, max=1.0)),
+])
+def test_memory(name, factory, reference):
+    n = N * SCALE
+    vals, valsize = allocate(factory, n)
+    refvals, refvalsize = allocate(reference, n)
+    assert valsize < refvalsize
+    del vals, refvals
+    sigs, size = allocate(lambda: Signal(factory()), n)
+    refs, refsize = allocate(lambda: Signal(reference()), n)
+    assert size < refsize
+    t, res = timed(count, sigs)
+    tref, ref = timed(count, refs)
+    assert res == ref
+    del sigs, refs
+    report("Signal(%s) values, %s signals" % (name, n),
+           ['', 'bytes (dict)', 'bytes (slots)', 'saved',
+            'update (dict) [s]', 'update (slots) [s]', 'speedup'],
+           [['value', int(refvalsize), int(valsize),
+             "%d%%" % (100 - 100 * valsize / refvalsize), '', '', ''],
+            ['Signal', int(refsize), int(size),
+             "%d%%" % (100 - 100 * size / refsize), tref, t, tref / t]])
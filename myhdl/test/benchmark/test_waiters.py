@@ -0,0 +1,146 @@
+""" Benchmark static process waiters on the cookbook examples """
+from __future__ import absolute_import
+
+import random
+
+from myhdl import (Signal, Simulation, always, always_comb, delay, instance,
+                   intbv)
+from myhdl._delay import delay as _delay
+from myhdl._Signal import _Signal, _WaiterList
+from myhdl._always import _Always
+from myhdl._always_comb import _AlwaysComb
+from myhdl._Waiter import (_Waiter, _DelayWaiter, _EdgeTupleWaiter,
+                           _EdgeWaiter, _SignalTupleWaiter, _SignalWaiter)
+
+from .util import SCALE, timed, report
+
+DURATION = 20000
+
+
+def _generatorWaiter(self):
+    # reference: the generator based waiters that _Always used to select
+    senslist = self.senslist
+    if all(isinstance(s, _delay) for s in senslist):
+        w = _DelayWaiter
+    elif all(isinstance(s, _Signal) for s in senslist):
+        w = _SignalWaiter if len(senslist) == 1 else _SignalTupleWaiter
+    elif all(isinstance(s, _WaiterList) for s in senslist):
+        w = _EdgeWaiter if len(senslist) == 1 else _EdgeTupleWaiter
+    else:
+        w = _Waiter
+    return w(self.gen)
+
+
+def dff(q, d, clk, count):
+
+    @always(clk.posedge)
+    def logic():
+        count[0] += 1
+        q.next = d
+
+    return logic
+
+
+def dffa(q, d, clk, rst, count):
+
+    @always(clk.posedge, rst.negedge)
+    def logic():
+        count[0] += 1
+        if rst == 0:
+            q.next = 0
+        else:
+            q.next = d
+
+    return logic
+
+
+def latch(q, d, g, count):
+
+    @always_comb
+    def logic():
+        count[0] += 1
+        if g == 1:
+            q.next = d
+
+    return logic
+
+
+def jc(q, clk, count):
+
+    @always(clk.posedge)
+    def logic():
+        count[0] += 1
+        q.next[4:1] = q[3:]
+        q.next[0] = not q[3]
+
+    return logic
+
+
+def bench(n, trace, count):
+    clk, rst, g = [Signal(bool(0)) for i in range(3)]
+    ds = [Signal(bool(0)) for i in range(n)]
+    qs = [Signal(bool(0)) for i in range(3 * n)]
+    jcq = [Signal(intbv(0)[4:]) for i in range(n)]
+    insts = []
+    for i in range(n):
+        insts.append(dff(qs[i], ds[i], clk, count))
+        insts.append(dffa(qs[n + i], ds[i], clk, rst, count))
+        insts.append(latch(qs[2 * n + i], ds[i], g, count))
+        insts.append(jc(jcq[i], clk, count))
+
+    @always(delay(10))
+    def clkgen():
+        clk.next = not clk
+
+    @always(delay(41))
+    def ggen():
+        g.next = not g
+
+    @always(clk.negedge)
+    def stimulus():
+        for d in ds:
+            d.next = random.randrange(2)
+        trace.append((tuple(int(q) for q in qs),
+                      tuple(int(q) for q in jcq)))
+
+    @instance
+    def rstgen():
+        yield delay(5)
+        rst.next = 1
+        while True:
+            yield delay(random.randrange(500, 1000))
+            rst.next = 0
+            yield delay(random.randrange(80, 140))
+            rst.next = 1
+
+    return insts, clkgen, ggen, stimulus, rstgen
+
+
+def simulate(n):
+    trace = []
+    count = [0]
+    random.seed(n)
+    sim = Simulation(bench(n, trace, count))
+    t, r = timed(sim.run, DURATION, quiet=1)
+    sim.quit()
+    return t, trace, count[0]
+
+
+def test_cookbook(monkeypatch):
+    rows = []
+    # warm up
+    simulate(1)
+    for n in (1 * SCALE, 20 * SCALE):
+        t, res, events = simulate(n)
+        with monkeypatch.context() as m:
+            m.setattr(_Always, 'waiter', property(_generatorWaiter))
+            m.setattr(_AlwaysComb, 'waiter', property(_generatorWaiter))
+            tref, ref, nref = simulate(n)
+        assert res == ref
+        assert events == nref
+        rows.append([n, events, nref / tref, events / t, tref / t])
+    report("Cookbook dff, dffa, latch and johnson counter, %s timesteps"
+           % DURATION,
+           ['copies', 'events', 'generator [ev/s]', 'static [ev/s]',
+            'speedup'],
+           rows)
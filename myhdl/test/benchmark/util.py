@@ -0,0 +1,34 @@
+from __future__ import absolute_import
+from __future__ import print_function
+
+import os
+import time
+
+SCALE = int(os.environ.get('MYHDL_BENCH_SCALE', 1))
+
+
+def timed(func, *args, **kwargs):
+    """ Call func and return its wall-clock time and its result. """
+    start = time.time()
+    result = func(*args, **kwargs)
+    return time.time() - start, result
+
+
+def report(title, header, rows):
+    """ Print a benchmark table. """
+    widths = [len(h) for h in header]
+    lines = []
+    for row in rows:
+        cells = []
+        for cell in row:
+            if isinstance(cell, float):
+                cell = "%.4f" % cell
+            cells.append(str(cell))
+        widths = [max(w, len(c)) for w, c in zip(widths, cells)]
+        lines.append(cells)
+    fmt = "  ".join("%%%ds" % w for w in widths)
+    print()
+    print(title)
+    print(fmt % tuple(header))
+    for cells in lines:
+        print(fmt % tuple(cells))
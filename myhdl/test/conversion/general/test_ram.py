@@ -76,6 +76,24 @@ def ram_deco2(dout, din, addr, we, clk, depth=128):
     return write, read
 
 
+@block
+def ram_array(dout, din, addr, we, clk, depth=128):
+    """  Ram model with a SignalArray """
+
+    mem = SignalArray(intbv(0)[8:], depth)
+
+    @always(clk.posedge)
+    def write():
+        if we:
+            mem[addr].next = din
+
+    @always_comb
+    def read():
+        dout.next = mem[addr]
+
+    return write, read
+
+
 @block
 def ram2(dout, din, addr, we, clk, depth=128):
         
@@ -142,6 +160,9 @@ def testram_deco1():
 def testram_deco2():
     assert conversion.verify(RamBench(ram_deco2)) == 0
 
+def testram_array():
+    assert conversion.verify(RamBench(ram_array)) == 0
+
 def testram_clocked():
     assert conversion.verify(RamBench(ram_clocked)) == 0
     
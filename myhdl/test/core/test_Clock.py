@@ -0,0 +1,218 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run unit tests for the Clock signal """
+from __future__ import absolute_import
+
+import pytest
+
+from myhdl import (Clock, Signal, Simulation, StopSimulation, _simulator,
+                   always, always_seq, block, delay, instance, intbv, modbv,
+                   now, traceSignals)
+
+QUIET = 1
+
+
+@block
+def bench(clk, trace):
+    count = Signal(modbv(0)[4:])
+    data = Signal(intbv(0)[8:])
+    cycles = Signal(intbv(0)[8:])
+
+    @always_seq(clk.posedge, reset=None)
+    def seq():
+        count.next = count + data[4:]
+
+    @always(clk.negedge)
+    def fall():
+        cycles.next = cycles + 1
+        if cycles == 20:
+            raise StopSimulation
+
+    @instance
+    def stimulus():
+        # writes at the same time as the rising edges
+        while 1:
+            yield delay(10)
+            data.next = data + 3
+
+    @always(clk.posedge)
+    def monitor():
+        trace.append((now(), int(count), int(data)))
+
+    return seq, fall, stimulus, monitor
+
+
+def test_equivalence():
+    ref = []
+    clk = Signal(bool(0))
+
+    @always(delay(5))
+    def clkgen():
+        clk.next = not clk
+
+    Simulation(bench(clk, ref), clkgen).run(quiet=QUIET)
+    trace = []
+    clk = Clock(10)
+    Simulation(bench(clk, trace)).run(quiet=QUIET)
+    assert len(ref) == 21
+    assert trace == ref
+
+
+def test_cycle():
+    ref = []
+    clk = Signal(bool(0))
+
+    @always(delay(5))
+    def clkgen():
+        clk.next = not clk
+
+    @block
+    def dut(clk, trace):
+        count = Signal(modbv(0)[4:])
+
+        @always_seq(clk.posedge, reset=None)
+        def seq():
+            count.next = count + 1
+
+        @always(clk.negedge)
+        def monitor():
+            trace.append((now(), int(count)))
+
+        return seq, monitor
+
+    sim = Simulation(dut(clk, ref), clkgen, mode='cycle')
+    sim.run(200, quiet=QUIET)
+    sim.quit()
+    trace = []
+    clk = Clock(10)
+    sim = Simulation(dut(clk, trace), mode='cycle')
+    sim.run(200, quiet=QUIET)
+    sim.quit()
+    assert len(ref) == 20
+    assert trace == ref
+
+
+def test_duty_phase():
+    clk = Clock(10, duty=0.3, phase=2)
+    edges = []
+
+    @instance
+    def monitor():
+        while 1:
+            yield clk.posedge, clk.negedge
+            edges.append((now(), bool(clk)))
+
+    sim = Simulation(monitor)
+    sim.run(30, quiet=QUIET)
+    sim.quit()
+    assert edges == [(2, True), (5, False), (12, True), (15, False),
+                     (22, True), (25, False)]
+
+
+def test_arg():
+    clk = Clock(10)
+    edges = []
+
+    def monitor():
+        while 1:
+            yield clk.posedge
+            edges.append(now())
+
+    # a plain generator does not tell which clocks it uses
+    sim = Simulation(monitor(), clk)
+    sim.run(30, quiet=QUIET)
+    sim.quit()
+    assert edges == [5, 15, 25]
+
+
+@pytest.mark.parametrize('args', [(10.5,), (1,), (10, 0.01), (10, 1.0),
+                                  (10, 0.5, -1)])
+def test_args(args):
+    with pytest.raises(ValueError):
+        Clock(*args)
+
+
+@block
+def traced():
+    clk = Clock(4)
+    count = Signal(intbv(0)[8:])
+
+    @always(clk.posedge)
+    def logic():
+        count.next = count + 1
+
+    return logic
+
+
+def test_trace(tmpdir):
+    with tmpdir.as_cwd():
+        sim = Simulation(traceSignals(traced()))
+        sim.run(20, quiet=QUIET)
+        sim.quit()
+        with open('traced.vcd') as f:
+            lines = f.read().splitlines()
+    ctx = _simulator._current()
+    if ctx.tracing:
+        ctx.tf.close()
+        ctx.tracing = 0
+    times = [int(line[1:]) for line in lines if line.startswith('#')]
+    assert times == list(range(2, 21, 2))
+    # the clock changes at each edge, the counter at each rising edge
+    changes = len(lines) - lines.index('#2') - len(times)
+    assert changes == 10 + 5
+
+
+def test_idle():
+    clk = Clock(10)
+    fast = Clock(4, phase=1)
+    samples = []
+
+    def sampler():
+        # reads the clocks without waiting for their edges
+        for t in (3, 14, 2, 100003):
+            yield delay(t)
+            samples.append((now(), bool(clk), bool(fast)))
+
+    sim = Simulation(sampler(), clk, fast)
+    sim.run(quiet=QUIET)
+    assert samples == [(3, False, True), (17, True, False),
+                       (19, True, True), (100022, False, True)]
+    # the edges after the last sample are not simulated
+    assert sim.stats.timesteps == 4
+
+
+def test_idle_observed():
+    clk = Clock(10)
+    slow = Clock(100, phase=57)
+    samples = []
+
+    @instance
+    def sampler():
+        # wakes on the slow clock, and waits for the fast one now and then
+        while 1:
+            yield slow.posedge
+            samples.append((now(), bool(clk)))
+            if now() == 257:
+                yield clk.negedge
+                samples.append((now(), bool(clk)))
+                raise StopSimulation
+
+    Simulation(sampler, clk).run(quiet=QUIET)
+    assert samples == [(57, True), (157, True), (257, True), (260, False)]
@@ -28,9 +28,9 @@ from random import randrange
 
 import pytest
 
-from myhdl import Signal, intbv
+from myhdl import Signal, intbv, modbv
 from myhdl._compat import long
-from myhdl._simulator import _siglist
+from myhdl._simulator import _current
 
 random.seed(1)  # random, but deterministic
 maxint = sys.maxsize
@@ -144,6 +144,40 @@ class TestSig:
                 s.next  # plain read access
             assert s.val is not s.next, repr(s.val)
 
+    def testModifyAfterUpdate(self):
+        """ Modifying mutable next after an update should not change val """
+        for s, n in zip(self.sigs, self.nexts):
+            if type(s.val) not in (list, dict, intbv):
+                continue
+            s.next = n
+            s._update()
+            cur = copy.deepcopy(s.val)
+            if type(s.val) is list:
+                s.next.append(1)
+            elif type(s.val) is dict:
+                s.next[3] = 5
+            else:
+                s.next[0] = not s.val[0]
+            assert s.val == cur
+            s._update()
+            assert s.val == s.next
+            assert s.val != cur
+
+    def testModifyValAfterUpdate(self):
+        """ Modifying mutable val after an update should not change next """
+        for s, n in zip(self.sigs, self.nexts):
+            if type(s.val) not in (list, dict):
+                continue
+            s.next = n
+            s._update()
+            cur = copy.deepcopy(s.val)
+            if type(s.val) is list:
+                s.val.append(1)
+            else:
+                s.val[3] = 5
+            assert s.next == cur
+            assert s.val is not s.next
+
     def testUpdatePosedge(self):
         """ update on posedge should return event and posedge waiters """
         s1 = Signal(1)
@@ -208,8 +242,9 @@ class TestSig:
         assert s1._negedgeWaiters == self.negedgeWaiters
 
     def testNextAccess(self):
-        """ each next attribute access puts a sig in a global siglist """
-        del _siglist[:]
+        """ next attribute access puts a sig in a global siglist once """
+        siglist = _current().siglist
+        del siglist[:]
         s = [None] * 4
         for i in range(len(s)):
             s[i] = Signal(i)
@@ -220,7 +255,24 @@ class TestSig:
         s[3].next = 1
         s[3].next = 3
         for i in range(len(s)):
-            assert _siglist.count(s[i]) == i
+            assert siglist.count(s[i]) == min(i, 1)
+        # after the update, the sig can be put in the siglist again
+        s[3]._update()
+        s[3].next = 2
+        assert siglist.count(s[3]) == 2
+        del siglist[:]
+
+    def testBitwiseNextAccess(self):
+        """ bitwise assignment puts a sig in a global siglist once """
+        siglist = _current().siglist
+        del siglist[:]
+        s = Signal(intbv(0)[8:])
+        for i in range(len(s)):
+            s.next[i] = 1
+        assert siglist == [s]
+        del siglist[:]
+        s._update()
+        assert s == 0xff
 
 
 class TestSignalAsNum:
@@ -580,3 +632,29 @@ class TestSignalIntbvBounds:
         for v in (-1, 2**8, -10, 1000):
             with pytest.raises(ValueError):
                 s.next[:] = v
+
+    def testAssign(self):
+        for val in (intbv(5)[8:], intbv(5, min=-24, max=34),
+                    intbv(-5, min=-128, max=128), intbv(5, min=0)):
+            s = Signal(val)
+            for v in (0, 5, 33, intbv(7), s):
+                s.next = v
+                assert s.next == v
+            for v in (-25, -129, 256, 1000):
+                if val.min is not None and val.min <= v and \
+                        (val.max is None or v < val.max):
+                    continue
+                with pytest.raises(ValueError):
+                    s.next = v
+        s = Signal(intbv(0))
+        for v in (-2**70, -1, 2**70):
+            s.next = v
+            assert s.next == v
+
+    def testWrap(self):
+        for lo, hi in ((0, 16), (-8, 8), (-3, 8), (5, 9), (None, None)):
+            s = Signal(modbv(0, min=lo, max=hi))
+            for v in (-100, -17, -8, -1, 0, 7, 8, 15, 16, 31, 2**70 + 3):
+                s.next = v
+                assert s.next == modbv(v, min=lo, max=hi)
+                assert lo is None or lo <= s.next < hi
@@ -0,0 +1,317 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the SignalArray unit tests. """
+from __future__ import absolute_import
+
+import os
+import sys
+
+import pytest
+
+from myhdl import (Signal, SignalArray, Simulation, StopSimulation, always,
+                   always_comb, always_seq, block, delay, instance, intbv,
+                   modbv, now, ResetSignal)
+from myhdl import _SignalArray
+from myhdl._extractHierarchy import _getMemInfo
+
+
+class TestSignalArrayInit:
+
+    def testStore(self):
+        mem = SignalArray(intbv(0)[32:], 1000)
+        assert len(mem) == 1000
+        assert mem.codes.typecode in ('I', 'L')
+        assert mem.codes.itemsize == 4
+        mem = SignalArray(intbv(0, min=-8, max=8), 4, init=[1, -2, 3, -4])
+        assert list(mem.codes) == [1, -2, 3, -4]
+        assert mem.codes.itemsize == 1
+        # unbounded values are kept in a list
+        mem = SignalArray(intbv(0), 3)
+        assert mem.codes == [0, 0, 0]
+
+    def testStoreTypecodes(self, monkeypatch):
+        # without a wide enough typecode, as without 'q' on Python 2,
+        # the values are kept in a list
+        monkeypatch.setattr(_SignalArray, '_UNSIGNED', ('B', 'H'))
+        mem = SignalArray(intbv(0)[32:], 2, init=[1, 2**32 - 1])
+        assert mem.codes == [1, 2**32 - 1]
+        mem = SignalArray(intbv(0)[16:], 2)
+        assert mem.codes.typecode == 'H'
+
+    def testInitErrors(self):
+        with pytest.raises(ValueError):
+            SignalArray(intbv(0)[4:], 2, init=[1, 16])
+        with pytest.raises(ValueError):
+            SignalArray(intbv(0)[4:], 2, init=[1])
+        with pytest.raises(TypeError):
+            SignalArray(0, 2)
+
+    def testItem(self):
+        mem = SignalArray(intbv(0)[8:], 16, init=list(range(16)))
+        assert mem[3] == 3
+        assert mem[-1] == 15
+        assert len(mem[3]) == 8
+        assert int(mem[5] + 1) == 6
+        assert mem[4].val == intbv(4)[8:]
+        assert mem[intbv(2)] == 2
+        with pytest.raises(IndexError):
+            mem[16]
+        # items do not create signals
+        assert not mem._views
+
+    def testItemPrint(self, capsys):
+        mem = SignalArray(intbv(0)[8:], 4, init=[1, 2, 3, 4])
+        # items print like the element signals
+        print(mem[2])
+        assert capsys.readouterr().out == str(intbv(3)[8:]) + "\n"
+        assert str(mem[1]) == str(Signal(intbv(2)[8:]))
+        assert "%s %d" % (mem[0], mem[3]) == str(intbv(1)[8:]) + " 4"
+        assert repr(mem[2]) == "Signal(intbv(3))"
+        assert not mem._views
+
+
+class TestSignalArraySim:
+
+    def bench(self, mem, dout, result):
+        clk = Signal(bool(0))
+        we = Signal(bool(0))
+        addr = Signal(intbv(0, min=0, max=len(mem)))
+        din = Signal(intbv(0)[8:])
+
+        @always(delay(5))
+        def clkgen():
+            clk.next = not clk
+
+        @always(clk.posedge)
+        def ram():
+            if we:
+                mem[addr].next = din
+            dout.next = mem[addr]
+
+        @instance
+        def stimulus():
+            for i in range(len(mem)):
+                we.next = 1
+                addr.next = i
+                din.next = (7 * i + 3) % 256
+                yield clk.negedge
+            we.next = 0
+            for i in range(len(mem)):
+                addr.next = (5 * i) % len(mem)
+                yield clk.negedge
+                result.append(int(dout))
+            raise StopSimulation
+
+        return clkgen, ram, stimulus
+
+    def testRam(self):
+        depth = 32
+        result, ref = [], []
+        mem = SignalArray(intbv(0)[8:], depth)
+        Simulation(self.bench(mem, Signal(intbv(0)[8:]), result)).run(quiet=1)
+        mem2 = [Signal(intbv(0)[8:]) for i in range(depth)]
+        Simulation(self.bench(mem2, Signal(intbv(0)[8:]), ref)).run(quiet=1)
+        assert result == ref
+        assert not mem._views
+
+    def testBounds(self):
+        mem = SignalArray(intbv(0)[4:], 2)
+        with pytest.raises(ValueError):
+            mem[0].next = 16
+        mem = SignalArray(modbv(0)[4:], 2)
+        mem[0].next = 17
+        mem._update()
+        assert mem[0] == 1
+
+    def testWaitArray(self):
+        mem = SignalArray(intbv(0)[8:], 8)
+        seen = []
+        static_seen = []
+
+        def gen():
+            for i in range(4):
+                yield delay(10)
+                mem[i].next = i + 1
+            yield delay(10)
+            # writes of the current value are not events
+            mem[0].next = 1
+            yield delay(10)
+            raise StopSimulation
+
+        def watch():
+            while 1:
+                yield mem
+                seen.append(list(mem.codes[:4]))
+
+        @always(mem)
+        def static():
+            static_seen.append(now())
+
+        Simulation(gen(), watch(), static).run(quiet=1)
+        assert seen == [[1, 0, 0, 0], [1, 2, 0, 0], [1, 2, 3, 0],
+                        [1, 2, 3, 4]]
+        assert static_seen == [10, 20, 30, 40]
+
+    def testAlwaysComb(self):
+        mem = SignalArray(intbv(0)[8:], 8)
+        addr = Signal(intbv(0)[3:])
+        dout = Signal(intbv(0)[8:])
+        result = []
+
+        @always_comb
+        def read():
+            dout.next = mem[addr]
+
+        def gen():
+            mem[2].next = 7
+            yield delay(10)
+            addr.next = 2
+            yield delay(10)
+            result.append(int(dout))
+            mem[2].next = 9
+            yield delay(10)
+            result.append(int(dout))
+            raise StopSimulation
+
+        Simulation(read, gen()).run(quiet=1)
+        assert result == [7, 9]
+
+    def testElementSignal(self):
+        mem = SignalArray(bool(0), 64)
+        edges = []
+
+        def gen():
+            for i in (3, 4, 3):
+                yield delay(10)
+                mem[i].next = 1
+                yield delay(10)
+                mem[i].next = 0
+            yield delay(10)
+            raise StopSimulation
+
+        def watch():
+            while 1:
+                yield mem[3].posedge
+                edges.append(int(mem[4]))
+
+        Simulation(gen(), watch()).run(quiet=1)
+        assert edges == [0, 0]
+        assert list(mem._views) == [3]
+        assert mem[3] is mem[3]
+
+    def testSliceAssign(self):
+        mem = SignalArray(intbv(0)[8:], 4)
+        view = mem._view(1)
+        result = []
+
+        def gen():
+            mem[1].next[3] = 1
+            yield delay(10)
+            view.next[0] = 1
+            mem[2].next = 5
+            yield delay(10)
+            result.append(list(mem.codes))
+            raise StopSimulation
+
+        Simulation(gen()).run(quiet=1)
+        assert result == [[0, 9, 5, 0]]
+        # the initial values are restored when the simulation ends
+        assert list(mem.codes) == [0, 0, 0, 0]
+        assert view.val == 0
+
+    def testReset(self):
+        clk = Signal(bool(0))
+        reset = ResetSignal(0, active=1, isasync=False)
+        mem = SignalArray(intbv(0)[8:], 4, init=[1, 2, 3, 4])
+        result = []
+
+        @always_seq(clk.posedge, reset=reset)
+        def regs():
+            for i in range(4):
+                mem[i].next = mem[i] + 10
+
+        def gen():
+            for i in range(2):
+                yield delay(10)
+                clk.next = 1
+                yield delay(10)
+                clk.next = 0
+            result.append(list(mem.codes))
+            reset.next = 1
+            yield delay(10)
+            clk.next = 1
+            yield delay(10)
+            result.append(list(mem.codes))
+            raise StopSimulation
+
+        Simulation(regs, gen()).run(quiet=1)
+        assert result == [[21, 22, 23, 24], [1, 2, 3, 4]]
+
+
+@block
+def ram(dout, din, addr, we, clk, depth):
+    mem = SignalArray(intbv(0)[8:], depth)
+
+    @always(clk.posedge)
+    def write():
+        if we:
+            mem[addr].next = din
+
+    @always_comb
+    def read():
+        dout.next = mem[addr]
+
+    return write, read
+
+
+def test_memInfo():
+    dout = Signal(intbv(0)[8:])
+    din = Signal(intbv(0)[8:])
+    addr = Signal(intbv(0)[4:])
+    clk = Signal(bool(0))
+    inst = ram(dout, din, addr, Signal(bool(0)), clk, 16)
+    mem = inst.symdict['mem']
+    m = inst.memdict['mem']
+    assert m is _getMemInfo(mem)
+    assert m.depth == 16
+    assert len(m.elObj) == 8
+    assert m._used
+    # the signals are created for conversion and tracing only
+    assert list(mem._views) == [0]
+    assert m.mem == list(mem)
+    assert len(mem._views) == 16
+
+
+# the conversion of indexed expressions relies on ast.Index
+@pytest.mark.skipif(sys.version_info >= (3, 9),
+                    reason="indexed expressions are not converted")
+@pytest.mark.parametrize('hdl, read', [
+    ('VHDL', "dout <= mem(to_integer(addr));"),
+    ('Verilog', "assign dout = mem[addr];")])
+def test_convert(tmpdir, hdl, read):
+    dout = Signal(intbv(0)[8:])
+    din = Signal(intbv(0)[8:])
+    addr = Signal(intbv(0)[4:])
+    inst = ram(dout, din, addr, Signal(bool(0)), Signal(bool(0)), 16)
+    inst.convert(hdl=hdl, path=str(tmpdir), name='ram')
+    ext = '.vhd' if hdl == 'VHDL' else '.v'
+    with open(os.path.join(str(tmpdir), 'ram' + ext)) as f:
+        code = f.read()
+    assert read in code
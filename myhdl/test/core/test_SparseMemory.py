@@ -0,0 +1,198 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the SparseMemory unit tests. """
+from __future__ import absolute_import
+
+import struct
+from array import array
+
+import pytest
+
+from myhdl import _SparseMemory
+from myhdl import (Signal, SignalArray, SparseMemory, Simulation,
+                   StopSimulation, always, delay, instance, intbv)
+
+
+class TestSparseMemoryAccess:
+
+    def testAccess(self):
+        mem = SparseMemory(2**32, width=32, pagesize=1024, default=7)
+        assert len(mem) == 2**32
+        assert mem[2**32 - 1] == 7
+        # reads do not allocate pages
+        assert not mem._pages
+        mem[0x12345678] = 0xdeadbeef
+        mem[intbv(0x12345679)] = intbv(5)
+        mem[2**31] = 1
+        assert mem[0x12345678] == 0xdeadbeef
+        assert mem[0x12345679] == 5
+        assert mem[0x1234567a] == 7
+        assert mem[0x12345677:0x1234567a] == [7, 0xdeadbeef, 5]
+        assert len(mem._pages) == 2
+        assert mem.dirty == [0x12345678 >> 10, 2**31 >> 10]
+        mem.clean()
+        assert mem.dirty == []
+
+    def testErrors(self):
+        mem = SparseMemory(1000, width=8)
+        with pytest.raises(IndexError):
+            mem[1000]
+        with pytest.raises(IndexError):
+            mem[-1] = 0
+        with pytest.raises(ValueError):
+            mem[0] = 256
+        with pytest.raises(ValueError):
+            SparseMemory(1000, pagesize=100)
+        with pytest.raises(ValueError):
+            mem.load('mem.dat', format='srec')
+
+
+class TestSparseMemoryFiles:
+
+    def testBin(self, tmpdir):
+        f = tmpdir.join('mem.bin')
+        words = [i * 0x01010101 for i in range(100)]
+        f.write_binary(struct.pack('<100I', *words))
+        mem = SparseMemory(2**32, width=32, pagesize=16)
+        mem[1000] = 3
+        assert mem.load(str(f), addr=990) == 100
+        # pages of the file are only read when they are accessed
+        assert sorted(mem._pages) == [62]
+        assert mem[1000] == words[10]
+        assert mem[1089] == words[99]
+        assert mem[1090] == 0
+        assert sorted(mem._pages) == [62, 68]
+        assert mem.dirty == [62]
+        out = tmpdir.join('out.bin')
+        mem.dump(str(out), 990, 1090)
+        assert out.read_binary() == f.read_binary()
+
+    def testHex(self, tmpdir):
+        f = tmpdir.join('mem.hex')
+        f.write("// a comment\n"
+                "01 02\n"
+                "@10 ff // words at 16\n"
+                "1_0\n")
+        mem = SparseMemory(2**20, width=8, pagesize=8)
+        assert mem.load(str(f)) == 4
+        assert mem[0:3] == [1, 2, 0]
+        assert mem[16:18] == [0xff, 0x10]
+        assert mem.dirty == [0, 2]
+        out = tmpdir.join('out.hex')
+        mem.dump(str(out))
+        assert out.read() == ("@0\n01\n02\n00\n00\n00\n00\n00\n00\n"
+                              "@10\nff\n10\n00\n00\n00\n00\n00\n00\n")
+        mem2 = SparseMemory(2**20, width=8, pagesize=8)
+        mem2.load(str(out))
+        assert mem2[0:24] == mem[0:24]
+
+    def testWidth(self, tmpdir):
+        # words that do not fit an array
+        mem = SparseMemory(2**40, width=72, pagesize=4)
+        mem[2**39] = 2**72 - 1
+        mem[2**39 + 1] = 0x123456789
+        f = tmpdir.join('mem.bin')
+        mem.dump(str(f), 2**39, 2**39 + 3, format='bin')
+        assert len(f.read_binary()) == 27
+        mem2 = SparseMemory(8, width=72)
+        mem2.load(str(f), format='bin')
+        assert mem2[0:4] == [2**72 - 1, 0x123456789, 0, 0]
+
+    def testTypecodes(self, tmpdir, monkeypatch):
+        # 64 bit words without a 64 bit typecode, as on Python 2
+        words = [i * 0x0101010101010101 for i in range(8)]
+        f = tmpdir.join('mem.bin')
+        f.write_binary(struct.pack('<8Q', *words))
+        monkeypatch.delitem(_SparseMemory._TYPECODES, 64)
+        mem = SparseMemory(16, width=64, pagesize=4)
+        assert mem.load(str(f), addr=2) == 8
+        assert mem[0:10] == [0, 0] + words
+        out = tmpdir.join('out.bin')
+        mem.dump(str(out), 2, 10)
+        assert out.read_binary() == f.read_binary()
+
+    @pytest.mark.parametrize('width', [12, 24, 36])
+    def testOddWidths(self, tmpdir, width):
+        # words are kept in the smallest array items that hold them
+        assert array(_SparseMemory._typecode(12)).itemsize == 2
+        nb = (width + 7) // 8
+        words = [(0x123456789 * i) % 2**width for i in range(8)]
+        data = b''.join(struct.pack('<Q', w)[:nb] for w in words)
+        f = tmpdir.join('mem.bin')
+        # the unused bits of the top byte of a word are ignored
+        f.write_binary(data[:-1] + b'\xff')
+        words[-1] |= (2**width - 1) >> (8 * nb - 8) << (8 * nb - 8)
+        mem = SparseMemory(16, width=width, pagesize=8)
+        assert mem.load(str(f), addr=4) == 8
+        assert mem[0:12] == [0] * 4 + words
+        code = _SparseMemory._typecode(width)
+        assert getattr(mem._pages[1], 'typecode', None) == code
+        out = tmpdir.join('out.bin')
+        mem.dump(str(out), 4, 12)
+        assert out.read_binary() == b''.join(
+            struct.pack('<Q', w)[:nb] for w in words)
+
+    def testClose(self, tmpdir):
+        f = tmpdir.join('mem.bin')
+        f.write_binary(bytes(bytearray(range(32))))
+        with SparseMemory(32, pagesize=8) as mem:
+            mem.load(str(f))
+            assert mem[3] == 3
+        # the accessed pages are kept
+        assert mem[0:8] == list(range(8))
+        with pytest.raises(ValueError):
+            mem[8]
+        f.remove()
+
+
+def test_bfm():
+    mem = SparseMemory(2**32, width=16)
+    for i in range(8):
+        mem[0x80000000 + i] = 100 + i
+    clk = Signal(bool(0))
+    addr = Signal(intbv(0)[32:])
+    rdata = Signal(intbv(0)[16:])
+    # a RAM block with its initial contents from the memory
+    ram = SignalArray(intbv(0)[16:], 8, init=mem[0x80000000:0x80000008])
+    result = []
+
+    @always(delay(5))
+    def clkgen():
+        clk.next = not clk
+
+    @instance
+    def bfm():
+        while 1:
+            yield clk.posedge
+            rdata.next = mem[addr]
+            mem[addr + 0x100] = int(ram[addr % 8]) + 1
+
+    @instance
+    def stimulus():
+        for i in range(4):
+            addr.next = 0x80000000 + i
+            yield clk.negedge
+            yield clk.negedge
+            result.append(int(rdata))
+        raise StopSimulation
+
+    Simulation(clkgen, bfm, stimulus).run(quiet=1)
+    assert result == [100, 101, 102, 103]
+    assert mem[0x80000100:0x80000104] == [101, 102, 103, 104]
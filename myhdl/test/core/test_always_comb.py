@@ -26,7 +26,7 @@ from random import randrange
 from myhdl import (AlwaysCombError, Signal, Simulation, StopSimulation, delay,
                    instances, intbv, now)
 from myhdl._always_comb import _error, always_comb
-from myhdl._Waiter import _SignalTupleWaiter, _SignalWaiter, _Waiter
+from myhdl._Waiter import _StaticTupleWaiter, _StaticWaiter, _Waiter
 from helpers import raises_kind
 
 # random.seed(3) # random, but deterministic
@@ -397,9 +397,9 @@ class TestInferWaiter:
         return inst_r, _Waiter(inst_s.gen), _Waiter(stimulus()), _Waiter(check())
 
     def testSignal1(self):
-        sim = Simulation(self.bench(SignalGen1, _SignalWaiter))
+        sim = Simulation(self.bench(SignalGen1, _StaticWaiter))
         sim.run()
 
     def testSignalTuple1(self):
-        sim = Simulation(self.bench(SignalTupleGen1, _SignalTupleWaiter))
+        sim = Simulation(self.bench(SignalTupleGen1, _StaticTupleWaiter))
         sim.run()
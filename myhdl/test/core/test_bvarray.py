@@ -0,0 +1,117 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2011 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+""" Run the unit tests for intbvarray and fixbvarray """
+from __future__ import absolute_import
+
+import random
+
+import pytest
+
+from myhdl import Signal, fixbv, fixbvarray, intbv, intbvarray
+
+random.seed(5)
+
+SAMPLES = [random.uniform(-1.2, 1.2) for i in range(200)] + \
+    [-1.0, 1.0, 0.5 / 1024, 1.5 / 1024, -0.5 / 1024, 0.0]
+
+
+def scalar(v, overflow):
+    """ Quantize v with the scalar fixbv. """
+    fmt = fixbv(0, -10, min=-1.0, max=1.0)
+    return fixbv(v, -10).fixto(fmt, overflow=overflow)
+
+
+class TestFixbvArray:
+
+    @pytest.mark.parametrize('overflow', ['saturate', 'wrap'])
+    def testQuantize(self, overflow):
+        a = fixbv.quantize_array(SAMPLES, -10, min=-1.0, max=1.0,
+                                 overflow=overflow)
+        assert (a.shift, a.min, a.max) == (-10, -1024, 1024)
+        assert len(a) == len(SAMPLES)
+        for v, e in zip(SAMPLES, a):
+            ref = scalar(v, overflow)
+            assert (e._val, e.min, e.max) == (ref._val, ref.min, ref.max)
+        assert a.tofloat() == [float(e) for e in a]
+
+    def testFloor(self):
+        a = fixbvarray([0.7 / 1024, -0.7 / 1024], -10, rounding='floor')
+        assert a.tolist() == [0, -1]
+
+    def testError(self):
+        with pytest.raises(ValueError):
+            fixbvarray(SAMPLES, -10, min=-1.0, max=1.0)
+        with pytest.raises(ValueError):
+            fixbvarray(SAMPLES, -10, overflow='ignore')
+
+    def testValues(self):
+        sig = Signal(fixbv(3, -12))
+        a = fixbvarray([fixbv(3, -12), sig, intbv(1), 5], -10)
+        assert a.tolist() == [1, 1, 1024, 5]
+        b = a[1:3]
+        assert isinstance(b, fixbvarray)
+        assert b.tofloat() == [2**-10, 1.0]
+
+
+class TestIntbvArray:
+
+    def testBounds(self):
+        a = intbvarray(range(12), min=0, max=8, overflow='wrap')
+        assert a.tolist() == list(range(8)) + list(range(4))
+        a = intbvarray(range(-3, 3), min=-2, max=2, overflow='saturate')
+        assert a.tolist() == [-2, -2, -1, 0, 1, 1]
+        e = a[2]
+        assert isinstance(e, intbv)
+        assert (int(e), e.min, e.max) == (-1, -2, 2)
+        with pytest.raises(ValueError):
+            intbvarray([0, 8], min=0, max=8)
+
+    def testUnbounded(self):
+        a = intbvarray([2**70, Signal(intbv(3)), intbv(-1)])
+        assert a.tolist() == [2**70, 3, -1]
+
+
+def testNumpy():
+    np = pytest.importorskip('numpy')
+    samples = np.array(SAMPLES)
+    for rounding in ('round', 'floor'):
+        for overflow in ('saturate', 'wrap'):
+            a = fixbv.quantize_array(samples, -10, min=-1.0, max=1.0,
+                                     rounding=rounding, overflow=overflow)
+            b = fixbv.quantize_array(SAMPLES, -10, min=-1.0, max=1.0,
+                                     rounding=rounding, overflow=overflow)
+            assert isinstance(a.codes, np.ndarray)
+            assert a.tolist() == b.tolist()
+            assert list(a.tofloat()) == b.tofloat()
+    with pytest.raises(ValueError):
+        fixbvarray(samples, -10, min=-1.0, max=1.0)
+    a = intbvarray(np.arange(12), min=0, max=8, overflow='wrap')
+    assert a.tolist() == list(range(8)) + list(range(4))
+
+
+@pytest.mark.parametrize('overflow', ['saturate', 'wrap'])
+def testNumpyOutOfRange(overflow):
+    np = pytest.importorskip('numpy')
+    values = [1e30, -1e30, 0.5, 1.5, -3.75, 2.0**63, -2.0**63, 2.0**70 + 3]
+    a = fixbvarray(np.array(values), -15, min=-1.0, max=1.0,
+                   overflow=overflow)
+    b = fixbvarray(values, -15, min=-1.0, max=1.0, overflow=overflow)
+    assert a.tolist() == b.tolist()
+    with pytest.raises(ValueError):
+        fixbvarray(np.array([0.5, 1e30]), -15, min=-1.0, max=1.0)
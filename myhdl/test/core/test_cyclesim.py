@@ -0,0 +1,181 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run unit tests for cycle-based simulation """
+from __future__ import absolute_import
+
+import pytest
+
+from myhdl import (Signal, ResetSignal, Simulation, SimulationError,
+                   StopSimulation, always, always_comb, always_seq, block,
+                   delay, instance, intbv, modbv, now)
+from myhdl._Simulation import _error as _simerror
+from myhdl._cyclesim import _error
+from helpers import raises_kind
+
+QUIET = 1
+
+
+@block
+def counter(clk, reset, count, tc):
+
+    @always_seq(clk.posedge, reset=reset)
+    def seq():
+        count.next = count + 1
+
+    @always_comb
+    def comb():
+        tc.next = count == 7
+
+    return seq, comb
+
+
+@block
+def bench(trace, isasync):
+    clk = Signal(bool(0))
+    reset = ResetSignal(1, active=1, isasync=isasync)
+    count = Signal(modbv(0)[3:])
+    tc = Signal(bool(0))
+    tcd = Signal(bool(0))
+    low = count(2, 0)
+    cycles = Signal(intbv(0, min=0, max=1000))
+
+    dut = counter(clk, reset, count, tc)
+
+    @always(delay(5))
+    def clkgen():
+        clk.next = not clk
+
+    @always(clk.negedge)
+    def stimulus():
+        cycles.next = cycles + 1
+        if cycles == 2 or cycles == 13:
+            reset.next = 1
+        else:
+            reset.next = 0
+
+    @always_comb
+    def delayed():
+        tcd.next = tc and low == 3
+
+    @always(clk.posedge)
+    def monitor():
+        trace.append((now(), int(count), bool(tc), bool(tcd), int(low)))
+        if cycles == 30:
+            raise StopSimulation
+
+    return dut, clkgen, stimulus, delayed, monitor
+
+
+@pytest.mark.parametrize('isasync', [False, True])
+def test_equivalence(isasync):
+    ref = []
+    Simulation(bench(ref, isasync)).run(quiet=QUIET)
+    trace = []
+    Simulation(bench(trace, isasync), mode='cycle').run(quiet=QUIET)
+    assert len(ref) == 31
+    assert trace == ref
+
+
+def test_run_sim():
+    ref = []
+    Simulation(bench(ref, False)).run(quiet=QUIET)
+    trace = []
+    tb = bench(trace, False)
+    tb.run_sim(98, quiet=QUIET, mode='cycle')
+    assert now() == 98
+    tb.run_sim(quiet=QUIET)
+    assert trace == ref
+
+
+def test_mode():
+    def gen():
+        yield delay(10)
+    with raises_kind(SimulationError, _simerror.ModeType):
+        Simulation(gen(), mode='compiled')
+
+
+def test_instance_refused():
+    clk = Signal(bool(0))
+
+    @instance
+    def clkgen():
+        while 1:
+            yield delay(5)
+            clk.next = not clk
+
+    with raises_kind(SimulationError, _error.ArgType):
+        Simulation(clkgen, mode='cycle')
+
+
+def test_comb_loop():
+    a = Signal(bool(0))
+    b = Signal(bool(0))
+
+    @always_comb
+    def inv():
+        b.next = not a
+
+    @always_comb
+    def buf():
+        a.next = b
+
+    with raises_kind(SimulationError, _error.CombLoop):
+        Simulation(inv, buf, mode='cycle').run(quiet=QUIET)
+
+
+@block
+def activations(log):
+    clk = Signal(bool(0))
+    a = Signal(intbv(0)[4:])
+    b = Signal(intbv(0)[4:])
+    cycles = Signal(intbv(0, min=0, max=100))
+
+    @always(delay(5))
+    def clkgen():
+        clk.next = not clk
+
+    @always(clk.posedge)
+    def stimulus():
+        cycles.next = cycles + 1
+        if cycles == 4:
+            a.next = 3
+        if cycles == 8:
+            raise StopSimulation
+
+    @always(a)
+    def plain():
+        log.append(('plain', now()))
+
+    @always_comb
+    def comb():
+        b.next = a + 1
+        log.append(('comb', now()))
+
+    return clkgen, stimulus, plain, comb
+
+
+def test_activations():
+    ref = []
+    Simulation(activations(ref)).run(quiet=QUIET)
+    log = []
+    Simulation(activations(log), mode='cycle').run(quiet=QUIET)
+    # the order of the blocks within a timestep is not defined
+    assert sorted(ref) == [('comb', 0), ('comb', 45), ('plain', 45)]
+    assert sorted(log) == sorted(ref)
@@ -0,0 +1,129 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for drive. """
+from __future__ import absolute_import
+
+import pytest
+
+from myhdl import (Clock, Signal, Simulation, StopSimulation, always, block,
+                   delay, drive, fixbv, fixbvarray, instance, intbv, now)
+
+
+@block
+def bench(values, result, driver=True):
+    clk = Clock(10)
+    sig = Signal(intbv(0)[8:])
+
+    if driver:
+        stim = drive(sig, values, on=clk.posedge)
+    else:
+        @instance
+        def stim():
+            for val in values:
+                sig.next = val
+                yield clk.posedge
+
+    @always(clk.negedge)
+    def monitor():
+        result.append((now(), int(sig)))
+
+    return stim, monitor
+
+
+def run(values, driver):
+    result = []
+    simulate(60, bench(values, result, driver))
+    return result
+
+
+def simulate(duration, *args):
+    sim = Simulation(*args)
+    sim.run(duration, quiet=1)
+    sim.quit()
+
+
+def test_equivalence():
+    values = [3, 5, 7, 9]
+    ref = run(values, driver=False)
+    assert run(values, driver=True) == ref
+    assert ref == [(10, 5), (20, 7), (30, 9), (40, 9), (50, 9), (60, 9)]
+    # iterators are streamed
+    assert run(iter(values), driver=True) == ref
+    assert run((v for v in values), driver=True) == ref
+
+
+def test_delay():
+    sig = Signal(0)
+    result = []
+
+    def monitor():
+        while 1:
+            yield sig
+            result.append((now(), int(sig)))
+
+    simulate(50, drive(sig, [1, 2, 3], on=delay(7)), monitor())
+    assert result == [(0, 1), (7, 2), (14, 3)]
+
+
+def test_signal():
+    trigger = Signal(0)
+    sig = Signal(0)
+    result = []
+
+    def gen():
+        for i in range(4):
+            yield delay(10)
+            trigger.next = i + 1
+        yield delay(10)
+        result.append(int(sig))
+        raise StopSimulation
+
+    driver = drive(sig, [10, 20], on=trigger)
+    Simulation(driver, gen()).run(quiet=1)
+    assert result == [20]
+    # the driver unsubscribes when the values are exhausted
+    assert trigger._statics is None
+
+
+def test_numpy():
+    np = pytest.importorskip('numpy')
+    values = np.arange(100, 104, dtype=np.int64)
+    assert run(values, driver=True) == run(values.tolist(), driver=False)
+
+
+def test_fixbvarray():
+    sig = Signal(fixbv(0, -4, min=-1.0, max=1.0))
+    samples = fixbvarray([0.5, -0.25], -4, min=-1.0, max=1.0)
+    result = []
+
+    def monitor():
+        while 1:
+            yield sig
+            result.append(float(sig))
+
+    simulate(30, drive(sig, samples, on=delay(10)), monitor())
+    assert result == [0.5, -0.25]
+
+
+def test_args():
+    with pytest.raises(TypeError):
+        drive(0, [1], on=delay(1))
+    with pytest.raises(TypeError):
+        drive(Signal(0), [1], on=1)
@@ -0,0 +1,155 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run unit tests for the elaboration profiler """
+from __future__ import absolute_import
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from myhdl import (BlockError, Signal, always, always_comb, block, intbv,
+                   profile_elaboration)
+from myhdl import _block, _elabprofiler
+from myhdl._instance import _Instantiator
+
+CATEGORIES = ['user', 'instances', 'verify', 'namespaces', 'meminfo']
+
+
+@block
+def leaf(clk, a, b):
+    mem = [Signal(intbv(0)[8:]) for i in range(4)]
+
+    @always(clk.posedge)
+    def logic():
+        mem[0].next = a
+        b.next = mem[0]
+
+    return logic
+
+
+@block
+def node(clk, a, b):
+    c, d = [Signal(intbv(0)[8:]) for i in range(2)]
+    u0 = leaf(clk, a, c)
+    u1 = leaf(clk, d, b)
+
+    @always_comb
+    def comb():
+        d.next = c
+
+    return u0, u1, comb
+
+
+@block
+def top():
+    clk = Signal(bool(0))
+    a, b, c = [Signal(intbv(0)[8:]) for i in range(3)]
+    u0 = node(clk, a, b)
+    u1 = node(clk, b, c)
+    return u0, u1
+
+
+@block
+def bad():
+    return 1
+
+
+def _profile():
+    with profile_elaboration() as profiler:
+        top()
+    return profiler
+
+
+def test_counts():
+    profiler = _profile()
+    counts = dict((r['name'], r['count']) for r in profiler.results())
+    assert counts == {'top': 1, 'node': 2, 'leaf': 4}
+    counts = dict((r['name'], r['count']) for r in profiler.results('path'))
+    assert counts == {'top': 1, 'top/node': 2, 'top/node/leaf': 4}
+
+
+def test_times():
+    profiler = _profile()
+    results = dict((r['name'], r) for r in profiler.results())
+    for r in results.values():
+        assert r['time'] == pytest.approx(sum(r[c] for c in CATEGORIES))
+        assert min(r[c] for c in CATEGORIES) >= 0
+    assert results['leaf']['instances'] > 0
+    assert results['leaf']['meminfo'] > 0
+    assert results['top']['meminfo'] == 0
+    paths = profiler.results('path')
+    assert sum(r['time'] for r in paths) == \
+        pytest.approx(sum(r['time'] for r in results.values()))
+
+
+def test_off():
+    originals = (_block._Block.__dict__['_verifySubs'],
+                 _block._Block.__dict__['_updateNamespaces'],
+                 _block._makeMemInfo, _Instantiator.__dict__['__init__'])
+    profiler = _profile()
+    assert (_block._Block.__dict__['_verifySubs'],
+            _block._Block.__dict__['_updateNamespaces'],
+            _block._makeMemInfo,
+            _Instantiator.__dict__['__init__']) == originals
+    assert _elabprofiler._profiler is None
+    results = profiler.results()
+    top()
+    assert profiler.results() == results
+
+
+def test_error():
+    with profile_elaboration() as profiler:
+        with pytest.raises(BlockError):
+            bad()
+        top()
+    assert profiler._stack == []
+    counts = dict((r['name'], r['count']) for r in profiler.results())
+    assert counts['bad'] == 1
+    assert counts['leaf'] == 4
+
+
+def test_export():
+    profiler = _profile()
+    for by in ('func', 'path'):
+        results = profiler.results(by)
+        times = [r['time'] for r in results]
+        assert times == sorted(times, reverse=True)
+        assert json.loads(profiler.json(by)) == results
+        lines = profiler.table(by).splitlines()
+        assert lines[0].split() == [by, 'count', 'time', '[s]'] + CATEGORIES
+        assert len(lines) == len(results) + 1
+    with pytest.raises(ValueError):
+        profiler.results('name')
+
+
+def test_environment():
+    code = ("from myhdl.test.core.test_elabprofiler import top\n"
+            "top()\n")
+    env = dict(os.environ, MYHDL_PROFILE_ELABORATION='1')
+    p = subprocess.Popen([sys.executable, '-c', code], env=env,
+                         stderr=subprocess.PIPE, universal_newlines=True)
+    err = p.communicate()[1]
+    assert p.returncode == 0
+    lines = err.splitlines()
+    assert lines[0].split()[:2] == ['func', 'count']
+    assert 'top/node/leaf' in err
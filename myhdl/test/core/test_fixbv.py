@@ -0,0 +1,116 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2011 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the fixbv unit tests. """
+from __future__ import absolute_import
+
+import pytest
+
+from myhdl import Signal, fixbv, intbv
+
+
+class TestFixbvArith:
+
+    def testInit(self):
+        a = fixbv(0.328125, -6, min=0.0, max=0.65625)
+        assert (a._val, a.min, a.max) == (21, 0, 42)
+        assert float(a) == 0.328125
+        # floats are rounded to the nearest grid point
+        assert fixbv(0.3, -2)._val == 1
+        assert fixbv(0.375, -2)._val == 2
+        with pytest.raises(ValueError):
+            fixbv(1.0, -3, min=-1.0, max=1.0)
+
+    def testAdd(self):
+        a = fixbv(6, -3)
+        b = fixbv(2, -5)
+        c = a + b
+        assert (c._val, c.shift) == (26, -5)
+        assert float(b + a) == 0.8125
+        assert float(a + 1) == 1.75
+        assert float(a + 0.25) == 1.0
+        assert float(a - b) == 0.6875
+        assert float(1 - a) == 0.25
+
+    def testMul(self):
+        a = fixbv(6, -3)
+        b = fixbv(2, -5)
+        c = a * b
+        assert (c._val, c.shift) == (12, -8)
+        assert float(c) == 0.046875
+        assert float(a * 3) == 2.25
+        assert float(a * 0.5) == 0.375
+        assert float(a * intbv(2)) == 1.5
+
+    def testShift(self):
+        a = fixbv(6, -3)
+        assert float(a >> 2) == 0.1875
+        assert float(a << 1) == 1.5
+
+    def testCompare(self):
+        a = fixbv(6, -3)
+        assert a == fixbv(3, -2)
+        assert a != fixbv(5, -3)
+        assert a < 1
+        assert a > 0.5
+        assert a <= fixbv(24, -5)
+        assert fixbv(8, -3) == 1
+        assert Signal(a) == fixbv(12, -4)
+
+
+class TestFixbvFormat:
+
+    def testAlign(self):
+        a = fixbv(0, -5)
+        assert a.align(0.5) == 16
+        assert a.align(1) == 32
+        assert a.align(fixbv(3, -6)) == 2
+        assert a.align(fixbv(3, -6), rounding='floor') == 1
+        assert a.align(fixbv(-3, -6), rounding='floor') == -2
+        assert a.align(Signal(fixbv(1, -3))) == 4
+
+    def testFixto(self):
+        b = fixbv(2, -5, min=-32, max=32)
+        c = fixbv(12, -8)
+        d = c.fixto(b)
+        assert (d._val, d.shift, d.min, d.max) == (1, -5, -32, 32)
+        assert c.fixto(b, rounding='round')._val == 2
+        assert c.fixto(Signal(b))._val == 1
+
+    def testOverflow(self):
+        b = fixbv(0, -2, min=-8, max=8)
+        c = fixbv(9, -2)
+        with pytest.raises(ValueError):
+            c.fixto(b)
+        assert c.fixto(b, overflow='saturate')._val == 7
+        assert c.fixto(b, overflow='wrap')._val == -7
+        assert fixbv(-9, -2).fixto(b, overflow='saturate')._val == -8
+        with pytest.raises(ValueError):
+            c.fixto(b, overflow='ignore')
+        with pytest.raises(ValueError):
+            c.fixto(b, rounding='ceil')
+
+    def testSignal(self):
+        s = Signal(fixbv(0, -4, min=-1.0, max=1.0))
+        s.next = 0.25
+        assert s.next._val == 4
+        s.next = fixbv(3, -5)
+        assert s.next._val == 2
+        with pytest.raises(ValueError):
+            s.next = 1.0
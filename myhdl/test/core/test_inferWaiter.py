@@ -208,3 +208,20 @@ class TestInferWaiter:
     def testGeneral(self):
         sim = Simulation(self.bench(GeneralFunc, _Waiter))
         sim.run()
+
+
+def BoundFunc(trigger, r):
+    def logic():
+        while 1:
+            yield trigger
+            r.next = r + 1
+    return logic()
+
+
+def test_bindings():
+    # the same code, with different objects bound to the yielded name
+    a, r = Signal(intbv(0)), Signal(intbv(0))
+    for i in range(2):
+        assert type(_inferWaiter(BoundFunc(a, r))) == _SignalWaiter
+        assert type(_inferWaiter(BoundFunc(a.posedge, r))) == _Waiter
+        assert type(_inferWaiter(BoundFunc(delay(3), r))) == _Waiter
@@ -55,3 +55,63 @@ class TestInstanceCompilation:
             @instance
             def h(n):
                 yield n
+
+
+class Intf(object):
+
+    def __init__(self):
+        self.a = Signal(intbv(0)[8:])
+        self.b = Signal(intbv(0)[8:])
+
+
+def adder(intf, c, d):
+    @instance
+    def logic():
+        while 1:
+            yield intf.a, intf.b, c
+            d.next = intf.a + intf.b + c
+            intf.b.next[0] = c
+    return logic
+
+
+def test_usage():
+    # the usage analysis is shared by the instances of a function, and
+    # the names are bound per instance
+    intf = Intf()
+    inst = adder(intf, Signal(0), Signal(0))
+    assert inst.inputs == set(['intf_a', 'intf_b', 'c'])
+    assert inst.outputs == set(['d', 'intf_b'])
+    assert inst.objlist == ['intf_a', 'intf_b', 'intf_a', 'intf_b', 'intf_b']
+    assert inst.symdict['intf_a'] is intf.a
+    # an integer is not a signal
+    inst = adder(intf, 0, Signal(0))
+    assert inst.inputs == set(['intf_a', 'intf_b'])
+    other = Intf()
+    inst = adder(other, Signal(0), Signal(0))
+    assert inst.symdict['intf_b'] is other.b
+    assert inst.sigdict['intf_b'] is other.b
+
+
+def counter(q):
+    @instance
+    def logic():
+        x = 0
+        while 1:
+            yield delay(10)
+            x += 1
+            q.next = x
+    return logic
+
+
+def test_callinfo():
+    q = Signal(0)
+    inst = counter(q)
+    symdict = inst.symdict
+    assert symdict['q'] is q
+    # globals are looked up, not copied
+    assert symdict['g'] is g
+    assert 'g' in dict(symdict.items())
+    assert 'g' not in dict.keys(symdict)
+    # the global x is hidden by the local x of the generator function
+    assert 'x' not in symdict
+    assert 'x' not in dict(symdict.items())
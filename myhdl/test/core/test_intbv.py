@@ -153,6 +153,24 @@ class TestIntBvIndexing:
                 assert resi+ref == -1
                 assert type(res) == intbv
 
+    def testGetSliceBounds(self):
+        bv = intbv(0xABCD)[16:]
+        for i, j in ((8, 4), (intbv(8), 4), (8.0, 4), (True, 0)):
+            # repeated to use the cached slice descriptor
+            for k in range(2):
+                res = bv[i:j]
+                assert type(res) == intbv
+                assert res == (0xABCD >> int(j)) % 2**(int(i) - int(j))
+                assert len(res) == int(i) - int(j)
+                assert res.min == 0
+                assert res.max == 2**(int(i) - int(j))
+        for k in range(2):
+            with pytest.raises(ValueError):
+                bv[4:8]
+            with pytest.raises(ValueError):
+                bv[4:-1]
+        assert bv[intbv(3)] is True
+
     def testSetItem(self):
         self.seqsSetup()
         for s in self.seqs:
@@ -0,0 +1,112 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run unit tests for levelized always_comb evaluation """
+from __future__ import absolute_import
+
+import random
+
+from myhdl import (Signal, Simulation, StopSimulation, always_comb, delay,
+                   instance, intbv, now)
+from myhdl._levelize import _levelize, _CombNode
+
+random.seed(1)  # random, but deterministic
+
+QUIET = 1
+
+
+def test_levelize():
+    a, b, c, d, e = [Signal(bool(0)) for i in range(5)]
+    nodes = [_CombNode(None, [c, a], [d], 'n0'),
+             _CombNode(None, [a], [b], 'n1'),
+             _CombNode(None, [b, a], [c], 'n2'),
+             _CombNode(None, [d, e], [e], 'n3')]
+    result = _levelize(nodes)
+    assert result == [([1], 0, False), ([2], 1, False),
+                      ([0], 2, False), ([3], 3, True)]
+
+
+def bench(trace, combs):
+    x = Signal(intbv(0)[8:])
+    y = Signal(intbv(0)[8:])
+    s1 = Signal(intbv(0)[9:])
+    s2 = Signal(intbv(0)[10:])
+    s3 = Signal(intbv(0)[11:])
+    p = Signal(bool(0))
+    q = Signal(bool(0))
+
+    # reconvergent chain: s3 depends on x, s1 and s2
+    @always_comb
+    def c3():
+        s3.next = s2 + s1 + x
+
+    @always_comb
+    def c2():
+        s2.next = s1 + y
+
+    @always_comb
+    def c1():
+        s1.next = x + y
+
+    # structural combinational loop that settles
+    @always_comb
+    def l1():
+        if y[0]:
+            p.next = q
+        else:
+            p.next = x[0]
+
+    @always_comb
+    def l2():
+        if y[0]:
+            q.next = y[1]
+        else:
+            q.next = p
+
+    @instance
+    def stimulus():
+        for i in range(100):
+            x.next = random.randrange(256)
+            if i % 3:
+                y.next = random.randrange(256)
+            yield delay(10)
+            trace.append((now(), int(s1), int(s2), int(s3), bool(p), bool(q)))
+        raise StopSimulation
+
+    combs.extend([c3, c2, c1, l1, l2])
+    return stimulus, c3, c2, c1, l1, l2
+
+
+def test_equivalence():
+    ref = []
+    random.seed(2)
+    Simulation(bench(ref, [])).run(quiet=QUIET)
+    trace = []
+    combs = []
+    random.seed(2)
+    sim = Simulation(bench(trace, combs), levelize=True)
+    sim.run(quiet=QUIET)
+    assert trace == ref
+    lev = sim.levelizer
+    # in topological order
+    assert lev.levelized == combs[2::-1]
+    assert lev.fallback == combs[3:]
+    assert lev.evaluations <= 3 * 101
+    assert lev.saved > 0
+    assert lev.wakeups == lev.evaluations + lev.saved
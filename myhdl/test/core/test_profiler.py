@@ -0,0 +1,167 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run unit tests for the simulation profiler """
+from __future__ import absolute_import
+
+import json
+
+import pytest
+
+from myhdl import (Clock, Signal, Simulation, StopSimulation, always,
+                   always_comb, block, delay, drive, instance, intbv, record)
+
+QUIET = 1
+
+
+@block
+def sub(clk, a, b):
+
+    @always(clk.posedge)
+    def logic():
+        a.next = a + 1
+
+    @always_comb
+    def comb():
+        b.next = a + 1
+
+    return logic, comb
+
+
+@block
+def top(n):
+    clk = Signal(bool(0))
+    a = Signal(intbv(0)[8:])
+    b = Signal(intbv(0)[9:])
+
+    inst = sub(clk, a, b)
+
+    @always(delay(5))
+    def clkgen():
+        clk.next = not clk
+
+    @instance
+    def stop():
+        yield delay(10 * n)
+        raise StopSimulation
+
+    return inst, clkgen, stop
+
+
+def _profile(levelize=False):
+    tb = top(10)
+    sim = Simulation(tb, levelize=levelize, profile=True)
+    sim.run(quiet=QUIET)
+    return sim.profiler, "top_%s" % tb.subs[0].name
+
+
+def test_off():
+    sim = Simulation(top(10))
+    assert sim.profiler is None
+    sim.run(quiet=QUIET)
+
+
+@pytest.mark.parametrize('levelize', [False, True])
+def test_counts(levelize):
+    profiler, prefix = _profile(levelize)
+    counts = dict((r['name'], r['count']) for r in profiler.results())
+    assert counts[prefix + '_logic'] == 10
+    assert counts['top_clkgen'] == 20
+    assert counts[prefix + '_comb'] == 11
+    assert counts['top_stop'] == 2
+
+
+def test_cycle():
+    clk = Signal(bool(0))
+    a = Signal(intbv(0)[8:])
+    b = Signal(intbv(0)[9:])
+
+    @always(delay(5))
+    def clkgen():
+        clk.next = not clk
+
+    dut = sub(clk, a, b)
+    sim = Simulation(dut, clkgen, mode='cycle', profile=True)
+    sim.run(100, quiet=QUIET)
+    assert int(a) == 10
+    sim.quit()
+    counts = dict((r['name'], r['count']) for r in sim.profiler.results())
+    assert counts['%s_logic' % dut.func.__name__] == 10
+    assert counts['clkgen'] == 20
+    assert counts['%s_comb' % dut.func.__name__] == 11
+
+
+def test_nested():
+    clk = Signal(bool(0))
+    a = Signal(intbv(0)[8:])
+    b = Signal(intbv(0)[9:])
+
+    @always(delay(5))
+    def clkgen():
+        clk.next = not clk
+
+    # blocks and instances in lists are named as at the top level
+    dut = sub(clk, a, b)
+    sim = Simulation([(dut,)], [clkgen], profile=True)
+    sim.run(100, quiet=QUIET)
+    sim.quit()
+    counts = dict((r['name'], r['count']) for r in sim.profiler.results())
+    assert counts['%s_logic' % dut.func.__name__] == 10
+    assert counts['clkgen'] == 20
+    assert counts['%s_comb' % dut.func.__name__] == 11
+
+
+def test_export():
+    profiler, prefix = _profile()
+    results = profiler.results()
+    times = [r['time'] for r in results]
+    assert times == sorted(times, reverse=True)
+    assert json.loads(profiler.json()) == results
+    lines = profiler.table().splitlines()
+    assert lines[0].split() == ['process', 'count', 'time', '[s]', '%',
+                                'per', 'call']
+    assert len(lines) == len(results) + 1
+
+
+@block
+def kernel(n):
+    clk = Clock(10)
+    a = Signal(intbv(0)[8:])
+    b = Signal(intbv(0)[8:])
+    stim = drive(a, range(n), clk.posedge)
+    rec = record(b, clk.negedge, depth=n)
+
+    @always(clk.posedge)
+    def logic():
+        b.next = a
+
+    return stim, rec, logic
+
+
+@pytest.mark.parametrize('levelize', [False, True])
+def test_kernel(levelize):
+    tb = kernel(5)
+    sim = Simulation(tb, levelize=levelize, profile=True)
+    sim.run(100, quiet=QUIET)
+    sim.quit()
+    # drivers and recorders run, but are not profiled
+    assert list(tb.subs[1][0]) == [0, 1, 2, 3, 4]
+    counts = dict((r['name'], r['count']) for r in sim.profiler.results())
+    assert [n for n in counts if n.startswith('kernel')] == ['kernel_logic']
+    assert counts['kernel_logic'] == 10
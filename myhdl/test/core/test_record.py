@@ -0,0 +1,172 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for record. """
+from __future__ import absolute_import
+
+import pytest
+
+from myhdl import _record, _SignalArray
+from myhdl import (Clock, Signal, Simulation, always, block, delay, fixbv,
+                   instance, intbv, record)
+
+
+@block
+def counter(clk, count, flag):
+
+    @always(clk.posedge)
+    def logic():
+        count.next = count + 1
+        flag.next = not flag
+
+    return logic
+
+
+def simulate(duration, *args):
+    sim = Simulation(*args)
+    sim.run(duration, quiet=1)
+    sim.quit()
+
+
+def test_record():
+    clk = Clock(10)
+    count = Signal(intbv(0)[8:])
+    flag = Signal(bool(0))
+    rec = record([count, flag], on=clk.negedge, depth=8)
+    assert rec.buffers[0].typecode == 'B'
+    simulate(45, counter(clk, count, flag), rec)
+    assert rec.count == 4
+    assert list(rec[count]) == [1, 2, 3, 4]
+    assert list(rec[1]) == [1, 0, 1, 0]
+    assert list(rec.times) == [10, 20, 30, 40]
+    assert [list(c) for c in rec.columns] == [[1, 2, 3, 4], [1, 0, 1, 0]]
+    with pytest.raises(KeyError):
+        rec[clk]
+
+
+def test_full():
+    clk = Clock(10)
+    count = Signal(intbv(0)[8:])
+    rec = record(count, on=clk.negedge, depth=3)
+    statics = []
+
+    @instance
+    def check():
+        yield delay(95)
+        statics.append(list(clk._statics[2]))
+
+    simulate(100, counter(clk, count, Signal(bool(0))), rec, check)
+    assert list(rec[count]) == [1, 2, 3]
+    assert rec.count == 3
+    # the recorder unsubscribes when the buffers are full
+    assert statics == [[]]
+
+
+def test_ring():
+    clk = Clock(10)
+    count = Signal(intbv(0)[8:])
+    rec = record(count, on=clk.negedge, depth=3, ring=True)
+    simulate(55, counter(clk, count, Signal(bool(0))), rec)
+    assert rec.count == 5
+    assert len(rec) == 3
+    assert list(rec[0]) == [3, 4, 5]
+    assert list(rec.times) == [30, 40, 50]
+
+
+def test_lists(monkeypatch):
+    # without 64 bit typecodes, as on Python 2, times are kept in a list
+    monkeypatch.setattr(_record, '_TIMECODE', None)
+    monkeypatch.setattr(_SignalArray, '_UNSIGNED', ('B',))
+    clk = Clock(10)
+    count = Signal(intbv(0)[16:])
+    rec = record(count, on=clk.negedge, depth=3, ring=True)
+    assert rec._times == [0, 0, 0]
+    assert rec.buffers[0] == [0, 0, 0]
+    simulate(55, counter(clk, count, Signal(bool(0))), rec)
+    assert rec[0] == [3, 4, 5]
+    assert rec.times == [30, 40, 50]
+
+
+def test_decimate():
+    count = Signal(intbv(0)[8:])
+    rec = record(count, on=delay(10), depth=10, decimate=3)
+
+    @instance
+    def stim():
+        while 1:
+            yield delay(10)
+            count.next = count + 1
+
+    simulate(100, stim, rec)
+    assert list(rec.times) == [30, 60, 90]
+    assert list(rec[0]) == [2, 5, 8]
+
+
+def test_during():
+    clk = Clock(10)
+    count = Signal(intbv(0)[8:])
+    rec = record(count, on=clk.negedge, depth=8)
+    seen = []
+
+    @instance
+    def check():
+        yield delay(35)
+        seen.append(list(rec[count]))
+
+    simulate(50, counter(clk, count, Signal(bool(0))), rec, check)
+    assert seen == [[1, 2, 3]]
+
+
+def test_fixbv():
+    val = fixbv(0, -4, min=-1.0, max=1.0)
+    sig = Signal(val)
+    rec = record(sig, on=sig, depth=4)
+
+    @instance
+    def stim():
+        for v in (0.5, -0.25):
+            yield delay(10)
+            sig.next = fixbv(v, -4, min=-1.0, max=1.0)
+
+    simulate(50, stim, rec)
+    assert list(rec[sig]) == [8, -4]
+
+
+def test_numpy():
+    np = pytest.importorskip('numpy')
+    clk = Clock(10)
+    count = Signal(intbv(0)[8:])
+    into = [np.zeros(3, dtype=np.int64)]
+    rec = record([count], on=clk.negedge, into=into, ring=True)
+    simulate(55, counter(clk, count, Signal(bool(0))), rec)
+    assert rec[0].tolist() == [3, 4, 5]
+
+
+def test_args():
+    sig = Signal(0)
+    with pytest.raises(TypeError):
+        record([0], on=delay(1), depth=1)
+    with pytest.raises(TypeError):
+        record(sig, on=1, depth=1)
+    with pytest.raises(TypeError):
+        record(sig, on=delay(1))
+    with pytest.raises(ValueError):
+        record(sig, on=delay(1), into=[[0], [0]])
+    with pytest.raises(ValueError):
+        record(sig, on=delay(1), depth=1, decimate=0)
@@ -0,0 +1,110 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run unit tests for the future event queues """
+from __future__ import absolute_import
+
+import random
+
+import pytest
+
+from myhdl import Signal, Simulation, SimulationError, delay, now
+from myhdl._Simulation import _error
+from myhdl._scheduler import _HeapQueue, _CalendarQueue
+from helpers import raises_kind
+
+random.seed(1)  # random, but deterministic
+
+QUIET = 1
+
+
+def drain(queue):
+    result = []
+    while queue:
+        t = queue.peek()
+        result.append(queue.pop())
+        assert result[-1][0] == t
+    return result
+
+
+@pytest.mark.parametrize('queue', [_HeapQueue(), _CalendarQueue(size=16)])
+def test_order(queue):
+    events = [(random.randrange(100), i) for i in range(500)]
+    queue.load(events)
+    expected = {}
+    for t, i in events:
+        expected.setdefault(t, []).append(i)
+    assert drain(queue) == sorted(expected.items())
+
+
+def test_calendar_overflow():
+    # same time scheduled both in the overflow heap and in the wheel
+    q = _CalendarQueue(size=4)
+    q.load([(10, 'a'), (2, 'b')])
+    assert q.pop() == (2, ['b'])
+    q.load([(10, 'c'), (7, 'd'), (3, 'e')])
+    assert q.pop() == (3, ['e'])
+    q.load([(3, 'f')])
+    assert q.pop() == (3, ['f'])
+    assert drain(q) == [(7, ['d']), (10, ['a', 'c'])]
+
+
+def test_unknown_scheduler():
+    def gen():
+        yield delay(10)
+    with raises_kind(SimulationError, _error.SchedulerType):
+        Simulation(gen(), scheduler='splay')
+
+
+def bench(trace):
+    clk = Signal(bool(0))
+
+    def clkgen():
+        while 1:
+            yield delay(5)
+            clk.next = not clk
+
+    def stim(i):
+        for j in range(20):
+            yield delay(random.randrange(1, 50))
+            trace.append((now(), i, j))
+
+    def mon():
+        while 1:
+            yield clk.posedge
+            trace.append((now(), 'clk'))
+
+    return [clkgen(), mon()] + [stim(i) for i in range(50)]
+
+
+@pytest.mark.parametrize('scheduler', ['heap', 'calendar'])
+def test_scheduler_equivalence(scheduler):
+    ref = []
+    random.seed(2)
+    sim = Simulation(bench(ref))
+    sim.run(2000, quiet=QUIET)
+    sim.quit()
+    trace = []
+    random.seed(2)
+    sim = Simulation(bench(trace), scheduler=scheduler)
+    # run in pieces to check suspend and resume
+    sim.run(333, quiet=QUIET)
+    sim.run(1667, quiet=QUIET)
+    sim.quit()
+    assert trace == ref
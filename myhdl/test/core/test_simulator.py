@@ -0,0 +1,145 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run unit tests for the per-thread simulator contexts """
+from __future__ import absolute_import
+
+import random
+import threading
+
+from myhdl import (Signal, Simulation, SimulationError, always, always_seq,
+                   block, delay, instance, intbv, modbv, now, ResetSignal)
+from myhdl import _simulator
+from myhdl._Simulation import _error
+from helpers import raises_kind
+
+QUIET = 1
+
+
+def bench(seed, trace):
+    rng = random.Random(seed)
+    clk = Signal(bool(0))
+    reset = ResetSignal(0, active=1, isasync=False)
+    din = Signal(intbv(0)[8:])
+    acc = Signal(modbv(0)[16:])
+    dly = Signal(intbv(0)[8:], delay=3)
+
+    @always(delay(5))
+    def clkgen():
+        clk.next = not clk
+
+    @always_seq(clk.posedge, reset=reset)
+    def accumulate():
+        acc.next = acc + din
+        dly.next = din
+
+    @instance
+    def stimulus():
+        for i in range(200):
+            din.next = rng.randrange(256)
+            yield clk.negedge
+            trace.append((now(), int(acc), int(dly)))
+
+    return clkgen, accumulate, stimulus
+
+
+def simulate(seed, trace):
+    sim = Simulation(bench(seed, trace))
+    sim.run(2000, quiet=QUIET)
+    sim.quit()
+
+
+def test_threads():
+    seeds = range(8)
+    refs = []
+    for seed in seeds:
+        ref = []
+        simulate(seed, ref)
+        refs.append(ref)
+    traces = [[] for seed in seeds]
+    threads = [threading.Thread(target=simulate, args=(seed, trace))
+               for seed, trace in zip(seeds, traces)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert traces == refs
+    assert len(refs[0]) == 200
+
+
+def test_multiple_sim():
+    # one simulation per thread at a time
+    ref = []
+    sim = Simulation(bench(1, ref))
+    sim.run(1000, quiet=QUIET)
+    with raises_kind(SimulationError, _error.MultipleSim):
+        Simulation(bench(2, []))
+    trace = []
+    other = threading.Thread(target=simulate, args=(1, trace))
+    other.start()
+    other.join()
+    assert now() == 1000
+    sim.run(1000, quiet=QUIET)
+    sim.quit()
+    assert trace == ref
+
+
+def test_run_in_other_thread():
+    # a simulation runs in the context of the thread that constructed it
+    trace = []
+    sim = Simulation(bench(3, trace))
+    context = _simulator._current()
+    times = []
+
+    def run():
+        sim.run(500, quiet=QUIET)
+        times.append(now())
+
+    other = threading.Thread(target=run)
+    other.start()
+    other.join()
+    assert times == [0]
+    assert now() == 500
+    assert _simulator._current() is context
+    sim.run(1500, quiet=QUIET)
+    sim.quit()
+    ref = []
+    simulate(3, ref)
+    assert trace == ref
+
+
+@block
+def inverter(a, b):
+
+    @always(a)
+    def logic():
+        b.next = not a
+
+    return logic
+
+
+def test_blocks_in_other_thread():
+    # blocks are registered for the process, so that a conversion in
+    # another thread resets the blocks that were decorated at import
+    inst = inverter(Signal(bool(0)), Signal(bool(0)))
+    assert inverter.calls > 0
+    other = threading.Thread(target=inst._clear)
+    other.start()
+    other.join()
+    assert inverter.calls == 0
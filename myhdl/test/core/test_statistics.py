@@ -0,0 +1,100 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run unit tests for the kernel statistics of a simulation """
+from __future__ import absolute_import
+
+from myhdl import (Signal, Simulation, always, always_comb, delay, intbv)
+
+QUIET = 1
+
+
+def bench(sigdelay):
+    clk = Signal(bool(0))
+    count = Signal(intbv(0)[8:])
+    double = Signal(intbv(0)[9:])
+    d = Signal(0, delay=sigdelay)
+
+    @always(delay(5))
+    def clkgen():
+        clk.next = not clk
+
+    @always(clk.posedge)
+    def counter():
+        count.next = count + 1
+        d.next = count
+
+    @always_comb
+    def comb():
+        double.next = 2 * count
+
+    return clkgen, counter, comb
+
+
+def test_event():
+    sim = Simulation(bench(3))
+    assert sim.stats.timesteps == 0
+    assert sim.run(100, quiet=QUIET) == 1
+    stats = sim.stats
+    # clock edges at 5, 10, ..., 100, and d updates at 8, 18, ..., 98
+    assert stats.timesteps == 20 + 10
+    # count, double and d change after each rising edge, except d
+    # after the first one
+    assert stats.updates == 20 + 3 * 10 - 1
+    assert stats.simTime == 100
+    assert stats.deltas > stats.timesteps
+    assert stats.resumed > 0
+    assert stats.scheduled >= stats.timesteps
+    assert stats.peakEvents >= 2
+    assert stats.wallTime > 0
+    assert stats.rate > 0
+    timesteps = stats.timesteps
+    sim.run(100, quiet=QUIET)
+    assert stats.timesteps == 2 * timesteps
+    assert stats.simTime == 200
+    d = stats.asdict()
+    assert d['timesteps'] == stats.timesteps
+    assert d['rate'] == stats.rate
+    sim.quit()
+
+
+def test_levelize():
+    results = []
+    for levelize in (False, True):
+        sim = Simulation(bench(3), levelize=levelize)
+        sim.run(50, quiet=QUIET)
+        sim.run(50, quiet=QUIET)
+        sim.quit()
+        results.append(sim.stats.asdict())
+    ref, stats = results
+    # the levelized evaluations of comb are counted as resumes
+    assert sim.levelizer.evaluations == 11
+    for name in ('timesteps', 'deltas', 'updates', 'resumed'):
+        assert stats[name] == ref[name]
+
+
+def test_cycle():
+    sim = Simulation(bench(None), mode='cycle')
+    assert sim.run(100, quiet=QUIET) == 1
+    stats = sim.stats
+    assert stats.timesteps == 20
+    assert stats.simTime == 100
+    assert stats.resumed >= 20 + 10 + 10
+    assert stats.peakEvents == 1
+    sim.quit()
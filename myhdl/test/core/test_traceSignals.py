@@ -120,9 +120,10 @@ def topTristate():
 def vcd_dir(tmpdir):
     with tmpdir.as_cwd():
         yield tmpdir
-    if _simulator._tracing:
-        _simulator._tf.close()
-        _simulator._tracing = 0
+    ctx = _simulator._current()
+    if ctx.tracing:
+        ctx.tf.close()
+        ctx.tracing = 0
 
 
 class TestTraceSigs:
@@ -170,14 +171,16 @@ class TestTraceSigs:
         sim.run(1000, quiet=QUIET)
         sim.quit()
 
-        _simulator._tf.close()
-        _simulator._tracing = 0
+        ctx = _simulator._current()
+        ctx.tf.close()
+        ctx.tracing = 0
         size = path.getsize(p)
         pbak = p[:-4] + '.' + str(path.getmtime(p)) + '.vcd'
         assert not path.exists(pbak)
         dut = traceSignals(fun())
-        _simulator._tf.close()
-        _simulator._tracing = 0
+        ctx = _simulator._current()
+        ctx.tf.close()
+        ctx.tracing = 0
         assert path.exists(p)
         assert path.exists(pbak)
         assert path.getsize(pbak) == size
@@ -191,8 +194,9 @@ class TestTraceSigs:
         pdutd = path.join(traceSignals.directory, "%s.vcd" % top.__name__)
         psubd = path.join(traceSignals.directory, "%s.vcd" % fun.__name__)
         dut = traceSignals(top())
-        _simulator._tf.close()
-        _simulator._tracing = 0
+        ctx = _simulator._current()
+        ctx.tf.close()
+        ctx.tracing = 0
         traceSignals.directory = None
         assert not path.exists(pdut)
         assert not path.exists(psub)